@@ -19,7 +19,7 @@ def run():
     else:
         program_name = os.path.abspath(sys.argv[0] if sys.argv else __file__)
     
-    sys.argv = [program_name]
+    sys.argv = [program_name] + sys.argv[1:]
     
     # If URL is provided as argument, append it
     if len(sys.argv) > 1:
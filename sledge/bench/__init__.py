@@ -0,0 +1 @@
+"""Offline benchmarks that run without a display"""
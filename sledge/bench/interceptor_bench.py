@@ -0,0 +1,401 @@
+"""Offline benchmark for the request interceptors
+
+Replays recorded URLs (HAR files or plain URL lists) through an interceptor
+using a fake QWebEngineUrlRequestInfo, so the cost of the matcher, rule engine
+and filter lists can be measured and compared without starting the browser:
+
+    python -m sledge.bench.interceptor_bench corpus.har urls.txt --json bench.json
+    python -m sledge.bench.interceptor_bench corpus.har --baseline bench.json
+
+URL list lines are ``url [resource_type [first_party_url]]``; blank lines and
+lines starting with ``#`` are skipped. Results are grouped by resource type.
+"""
+
+import argparse
+import gc
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter, namedtuple
+
+from PyQt6.QtCore import QUrl
+
+CorpusEntry = namedtuple('CorpusEntry', 'url first_party resource_type')
+
+TARGETS = ('security', 'webview')
+
+# Chrome's HAR _resourceType -> the names used by the rules and filter lists
+HAR_TYPES = {
+    'document': 'mainframe',
+    'stylesheet': 'stylesheet',
+    'script': 'script',
+    'image': 'image',
+    'font': 'fontresource',
+    'media': 'media',
+    'texttrack': 'media',
+    'xhr': 'xhr',
+    'fetch': 'xhr',
+    'eventsource': 'xhr',
+    'websocket': 'websocket',
+    'ping': 'ping',
+    'csp_violation_report': 'cspreport',
+    'manifest': 'subresource',
+    'other': 'subresource',
+}
+
+EXTENSION_TYPES = {
+    'js': 'script', 'mjs': 'script',
+    'css': 'stylesheet',
+    'png': 'image', 'jpg': 'image', 'jpeg': 'image', 'gif': 'image', 'webp': 'image',
+    'svg': 'image', 'avif': 'image',
+    'ico': 'favicon',
+    'woff': 'fontresource', 'woff2': 'fontresource', 'ttf': 'fontresource', 'otf': 'fontresource',
+    'mp4': 'media', 'webm': 'media', 'm4s': 'media', 'ts': 'media', 'mp3': 'media',
+    'm3u8': 'xhr', 'mpd': 'xhr', 'json': 'xhr',
+    'html': 'subframe', 'htm': 'subframe',
+}
+
+
+class FakeRequestInfo:
+    """Stands in for QWebEngineUrlRequestInfo and records what was done to it"""
+
+    __slots__ = ('url', 'first_party', 'resource_type', 'headers', 'redirected_to', 'blocked')
+
+    def __init__(self, url, first_party='', resource_type='subresource'):
+        self.url = QUrl(url)
+        self.first_party = QUrl(first_party)
+        self.resource_type = resource_type
+        self.reset()
+
+    def reset(self):
+        """Forget the recorded calls so the request can be replayed"""
+        self.headers = []
+        self.redirected_to = None
+        self.blocked = False
+
+    def requestUrl(self):
+        return self.url
+
+    def firstPartyUrl(self):
+        return self.first_party
+
+    def resourceType(self):
+        return self.resource_type
+
+    def setHttpHeader(self, name, value):
+        self.headers.append((name, value))
+
+    def redirect(self, url):
+        self.redirected_to = url
+
+    def block(self, blocked):
+        self.blocked = blocked
+
+    def outcome(self):
+        """Summarize what the interceptor did with the request"""
+        if self.blocked:
+            return 'blocked'
+        if self.redirected_to is not None:
+            return 'redirected'
+        if self.headers:
+            return 'headers'
+        return 'untouched'
+
+
+class BenchSettings:
+    """Settings stand-in holding the browser defaults the interceptor reads"""
+
+    def __init__(self, values=None):
+        self.revision = 0
+        self.values = {
+            ('privacy', 'do_not_track'): True,
+            ('security', 'block_dangerous_ports'): True,
+            ('security', 'block_dangerous_schemes'): True,
+        }
+        self.values.update(values or {})
+
+    def get(self, section, key):
+        return self.values.get((section, key))
+
+
+class BenchTheme:
+    """The parts of BrowserTheme the security interceptor reads"""
+
+    def __init__(self, hide_ads=True):
+        self.hide_ads = hide_ads
+
+
+class BenchBrowser:
+    """The parts of SledgeBrowser the security interceptor touches"""
+
+    def __init__(self, settings=None):
+        self.settings = settings or BenchSettings()
+        self.theme = BenchTheme()
+
+
+def guess_resource_type(url):
+    """Guess a resource type from the URL's file extension"""
+    name = url.partition('#')[0].partition('?')[0].rpartition('/')[2]
+    extension = name.rpartition('.')[2].lower() if '.' in name else ''
+    return EXTENSION_TYPES.get(extension, 'subresource')
+
+
+def load_har(path):
+    """Read the requests recorded in a HAR file"""
+    with open(path, encoding='utf-8') as f:
+        log = json.load(f).get('log', {})
+    # Chrome stores the page URL as the page title
+    pages = {page.get('id'): page.get('title', '') for page in log.get('pages', [])}
+
+    entries = []
+    for entry in log.get('entries', []):
+        request = entry.get('request', {})
+        url = request.get('url', '')
+        if not url or url.startswith(('data:', 'blob:')):
+            continue
+        first_party = pages.get(entry.get('pageref'), '')
+        if '://' not in first_party:
+            first_party = next((header.get('value', '') for header in request.get('headers', [])
+                                if header.get('name', '').lower() == 'referer'), url)
+        har_type = entry.get('_resourceType')
+        resource_type = HAR_TYPES.get(har_type, 'subresource') if har_type else guess_resource_type(url)
+        if resource_type == 'mainframe' and url.partition('#')[0] != first_party.partition('#')[0]:
+            resource_type = 'subframe'
+        entries.append(CorpusEntry(url, first_party, resource_type))
+    return entries
+
+
+def load_url_list(path):
+    """Read a plain URL list, one ``url [resource_type [first_party_url]]`` per line"""
+    entries = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            fields = line.split()
+            if not fields or fields[0].startswith('#'):
+                continue
+            url = fields[0]
+            resource_type = fields[1] if len(fields) > 1 and fields[1] != '-' else guess_resource_type(url)
+            first_party = fields[2] if len(fields) > 2 else url
+            entries.append(CorpusEntry(url, first_party, resource_type))
+    return entries
+
+
+def load_corpus(paths):
+    """Load every HAR file and URL list into one request corpus"""
+    entries = []
+    for path in paths:
+        if path.endswith(('.har', '.json')):
+            entries.extend(load_har(path))
+        else:
+            entries.extend(load_url_list(path))
+    return entries
+
+
+def make_interceptor(target='security', rules_dir=None, filters_dir=None):
+    """Build an interceptor with reproducible rules and filter lists
+
+    Only the bundled rules are used unless ``rules_dir`` is given, and nothing
+    is blocked by filter lists unless ``filters_dir`` is given.
+    """
+    from sledge.browser.security.rules import RuleEngine
+    rules = RuleEngine.load(directory=rules_dir)
+
+    if target == 'webview':
+        from sledge.browser.webview import RequestInterceptor
+        return RequestInterceptor(rules)
+
+    from sledge.browser.security import RequestInterceptor
+    # Nothing from ~/.sledge: the rules loaded above, no rule watcher, no filter cache
+    interceptor = RequestInterceptor(BenchBrowser(), rules_dir=None, filters_dir=filters_dir,
+                                     filter_cache=None)
+    interceptor.wait_for_filters()
+    interceptor.set_rules(rules)
+    return interceptor
+
+
+def run_benchmark(interceptor, corpus, iterations=5, warmup=1, allocations=True):
+    """Replay the corpus through interceptor.interceptRequest and summarize it"""
+    intercept = interceptor.interceptRequest
+    infos = [FakeRequestInfo(entry.url, entry.first_party, entry.resource_type) for entry in corpus]
+    classes = [info.resource_type for info in infos]
+    latencies = {name: [] for name in classes}
+
+    for _ in range(warmup):
+        for info in infos:
+            info.reset()
+            intercept(info)
+
+    clock = time.perf_counter_ns
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            for info, name in zip(infos, classes):
+                info.reset()
+                start = clock()
+                intercept(info)
+                latencies[name].append(clock() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    outcomes = {name: Counter() for name in latencies}
+    for info, name in zip(infos, classes):
+        outcomes[name][info.outcome()] += 1
+
+    allocated = measure_allocations(intercept, infos, classes) if allocations else {}
+    return summarize(latencies, outcomes, allocated)
+
+
+def measure_allocations(intercept, infos, classes):
+    """Bytes allocated (peak) and blocks left behind per request, by class
+
+    This runs as a separate pass because tracing slows every allocation down.
+    """
+    totals = {}
+    reset_peak = getattr(tracemalloc, 'reset_peak', None)
+    tracemalloc.start()
+    try:
+        for info, name in zip(infos, classes):
+            info.reset()
+            base = tracemalloc.get_traced_memory()[0]
+            if reset_peak:
+                reset_peak()
+            blocks = sys.getallocatedblocks()
+            intercept(info)
+            blocks = sys.getallocatedblocks() - blocks
+            current, peak = tracemalloc.get_traced_memory()
+            total = totals.setdefault(name, [0, 0, 0])
+            total[0] += (peak if reset_peak else current) - base
+            total[1] += blocks
+            total[2] += 1
+    finally:
+        tracemalloc.stop()
+    return totals
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile of sorted samples"""
+    if not samples:
+        return 0
+    rank = max(1, math.ceil(percent / 100 * len(samples)))
+    return samples[min(rank, len(samples)) - 1]
+
+
+def summarize(latencies, outcomes, allocated):
+    """Build the report dict: one entry per URL class plus the overall total"""
+    report = {'classes': {}}
+    everything = []
+    all_outcomes = Counter()
+    all_allocated = [0, 0, 0]
+    for name in sorted(latencies):
+        samples = latencies[name]
+        everything.extend(samples)
+        all_outcomes.update(outcomes[name])
+        for i, value in enumerate(allocated.get(name, ())):
+            all_allocated[i] += value
+        report['classes'][name] = _class_stats(samples, outcomes[name], allocated.get(name))
+    report['total'] = _class_stats(everything, all_outcomes, all_allocated if allocated else None)
+    return report
+
+
+def _class_stats(samples, outcomes, allocated):
+    samples.sort()
+    elapsed = sum(samples)
+    stats = {
+        'requests': len(samples),
+        'req_per_sec': round(len(samples) / (elapsed / 1e9), 1) if elapsed else 0.0,
+        'mean_us': round(elapsed / len(samples) / 1000, 2) if samples else 0.0,
+        'p50_us': round(percentile(samples, 50) / 1000, 2),
+        'p99_us': round(percentile(samples, 99) / 1000, 2),
+        'outcomes': dict(outcomes),
+    }
+    if allocated and allocated[2]:
+        stats['alloc_bytes'] = round(allocated[0] / allocated[2], 1)
+        stats['alloc_blocks'] = round(allocated[1] / allocated[2], 2)
+    return stats
+
+
+def find_regressions(report, baseline, max_regression):
+    """List the classes whose p50 grew by more than max_regression percent"""
+    regressions = []
+    rows = dict(report['classes'], total=report['total'])
+    old_rows = dict(baseline.get('classes', {}), total=baseline.get('total', {}))
+    for name, stats in rows.items():
+        old = old_rows.get(name, {}).get('p50_us')
+        if not old:
+            continue
+        change = (stats['p50_us'] - old) / old * 100
+        if change > max_regression:
+            regressions.append((name, old, stats['p50_us'], change))
+    return regressions
+
+
+def format_report(report):
+    """Render the report as a fixed-width table"""
+    lines = [f"{'class':<14}{'requests':>10}{'req/s':>12}{'p50 us':>10}{'p99 us':>10}"
+             f"{'alloc B':>10}{'blocks':>8}  outcomes"]
+    rows = list(report['classes'].items()) + [('total', report['total'])]
+    for name, stats in rows:
+        outcomes = ' '.join(f"{key}={value}" for key, value in sorted(stats['outcomes'].items()))
+        lines.append(
+            f"{name:<14}{stats['requests']:>10}{stats['req_per_sec']:>12.0f}"
+            f"{stats['p50_us']:>10.2f}{stats['p99_us']:>10.2f}"
+            f"{stats.get('alloc_bytes', 0):>10.0f}{stats.get('alloc_blocks', 0):>8.1f}  {outcomes}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m sledge.bench.interceptor_bench',
+        description='Replay recorded requests through a request interceptor and time it',
+    )
+    parser.add_argument('corpus', nargs='+', help='HAR files or URL lists')
+    parser.add_argument('--target', choices=TARGETS, default='security',
+                        help='security: the browser interceptor, webview: the WebView interceptor')
+    parser.add_argument('--iterations', type=int, default=5, help='timed passes over the corpus')
+    parser.add_argument('--warmup', type=int, default=1, help='untimed passes to fill the caches')
+    parser.add_argument('--rules', help='directory of extra *.json rules (default: bundled rules only)')
+    parser.add_argument('--filters', help='directory of *.txt filter lists to block with')
+    parser.add_argument('--no-alloc', action='store_true', help='skip the allocation pass')
+    parser.add_argument('--json', help='write the report to this file')
+    parser.add_argument('--baseline', help='compare against a report written with --json')
+    parser.add_argument('--max-regression', type=float, default=10.0,
+                        help='with --baseline, fail if a p50 grows by more than this percent')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print("❌ [BENCH] No requests found in the corpus")
+        return 2
+
+    interceptor = make_interceptor(args.target, args.rules, args.filters)
+    try:
+        report = run_benchmark(interceptor, corpus, args.iterations, args.warmup, not args.no_alloc)
+    finally:
+        if hasattr(interceptor, 'shutdown'):
+            interceptor.shutdown()
+    report.update(target=args.target, urls=len(corpus), iterations=args.iterations)
+    print(format_report(report))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = find_regressions(report, json.load(f), args.max_regression)
+        for name, old, new, change in regressions:
+            print(f"⚠️ [BENCH] {name}: p50 {old:.2f}us -> {new:.2f}us (+{change:.0f}%)")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -199,7 +199,7 @@ class VideoTab(QWidget):
             # First try getting video URL from interceptor
             interceptor = getattr(self.browser, 'request_interceptor', None)
             if interceptor:
-                video_url = interceptor.get_video_url()
+                video_url = interceptor.get_video_url(self.web_view.url().toString())
                 if video_url:
                     print(f"🎥 [VIDEO TAB] Found video URL from interceptor: {video_url}")
                     self.direct_video_url = video_url
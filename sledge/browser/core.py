@@ -13,8 +13,12 @@ from PyQt6.QtWebEngineCore import (
 )
 from PyQt6.QtGui import QAction, QIcon, QColor
 import json
+import base64
+from datetime import datetime
 
 from .tabs.widgets import TabWidget
+from .tabs.snapshots import TabSnapshot, encode_image, ICON_SIZE
+from .tabs.model import tab_matches
 from .ui.widgets import HTMLViewerWidget, BookmarkWidget, DownloadWidget
 from .ui.style_panel import StyleAdjusterPanel
 from .ui.styles import BrowserTheme, apply_dark_mode_js
@@ -57,6 +61,7 @@ class ExtensionManager:
 class Settings:
     def __init__(self):
         self.settings = QSettings('Sledge', 'Browser')
+        self.revision = 0  # Bumped on every change so caches can tell they are stale
         self.load_defaults()
 
     def load_defaults(self):
@@ -85,6 +90,7 @@ class Settings:
             },
             'startup': {
                 'restore_session': True,
+                'restore_eager': 3,
                 'home_page': 'https://duckduckgo.com',
             }
         }
@@ -103,9 +109,10 @@ class Settings:
         settings_dict[key] = value
         self.settings.setValue(section, settings_dict)
         self.settings.sync()
+        self.revision += 1
 
 class SledgeBrowser(QMainWindow):
-    def __init__(self):
+    def __init__(self, restore_eager=None):
         print("\n" + "="*50)
         print("🔍 [SLEDGE INIT] Starting SledgeBrowser initialization...")
         
@@ -116,6 +123,11 @@ class SledgeBrowser(QMainWindow):
             self.settings = Settings()
             self.settings.load_defaults()
             
+            # Saved tabs loaded right away on restore besides the current one
+            if restore_eager is None:
+                restore_eager = self.settings.get('startup', 'restore_eager')
+            self.restore_eager = 3 if restore_eager is None else int(restore_eager)
+            
             # Initialize codec support
             self._initialize_codec_support()
             
@@ -259,9 +271,9 @@ class SledgeBrowser(QMainWindow):
         settings.setAttribute(QWebEngineSettings.WebAttribute.ErrorPageEnabled, False)
         settings.setAttribute(QWebEngineSettings.WebAttribute.ScrollAnimatorEnabled, False)
         
-        # Add request interceptor
-        interceptor = self.create_request_interceptor()
-        profile.setUrlRequestInterceptor(interceptor)
+        # Add request interceptor (kept on the browser so tabs can query it)
+        self.request_interceptor = self.create_request_interceptor()
+        profile.setUrlRequestInterceptor(self.request_interceptor)
         
         print("🔧 [PROFILE] Browser profile configured with video support")
         return profile
@@ -459,9 +471,8 @@ class SledgeBrowser(QMainWindow):
         settings.setAttribute(QWebEngineSettings.WebAttribute.WebGLEnabled, True)
         settings.setAttribute(QWebEngineSettings.WebAttribute.Accelerated2dCanvasEnabled, True)
         
-        # Set up request interceptor
-        interceptor = self.create_request_interceptor()
-        profile.setUrlRequestInterceptor(interceptor)
+        # Share the browser's interceptor; each one owns a filter loader, event pipeline and rule watcher
+        profile.setUrlRequestInterceptor(self.request_interceptor)
         
         # Inject error handling script
         self.inject_media_error_handler(profile)
@@ -636,9 +647,7 @@ class SledgeBrowser(QMainWindow):
         # Create ImprovedTabWidget
         print("🎨 [SLEDGE UI] Creating tab widget...")
         self.tabs = TabWidget()
-        # Initialize tab groups explicitly
         self.tabs._tab_bar = self.tabs.tabBar()
-        self.tabs._tab_bar.tab_groups = {}  # Initialize tab groups dict
         self.setCentralWidget(self.tabs)
         print("🎨 [SLEDGE UI] Created TabWidget")
 
@@ -828,6 +837,17 @@ class SledgeBrowser(QMainWindow):
             self.tabs.setCurrentIndex(i)
             return tab
             
+        browser = self.create_web_view(qurl)
+        i = self.tabs.addTab(browser, label)
+        self.tabs.setCurrentIndex(i)
+        return i
+
+    def create_web_view(self, qurl=None):
+        """Web view set up like any other tab's, loading qurl when one is given
+        
+        The view isn't added to the tab widget, so it can also replace the
+        placeholder of a hibernated or unloaded tab.
+        """
         # Create browser with dark background and process isolation
         browser = QWebEngineView()
         browser.setStyleSheet("""
@@ -920,11 +940,9 @@ class SledgeBrowser(QMainWindow):
         browser.page_ref = page
         
         # Load URL after all setup is done
-        browser.setUrl(qurl)
-        
-        i = self.tabs.addTab(browser, label)
-        self.tabs.setCurrentIndex(i)
-        return i
+        if qurl is not None:
+            browser.setUrl(qurl)
+        return browser
 
     def setup_resource_hints(self, page):
         """Set up resource hints for performance"""
@@ -1266,20 +1284,11 @@ class SledgeBrowser(QMainWindow):
     def save_session(self):
         """Save current session"""
         session = {
-            'tabs': [],
+            'tabs': self.tab_records(),
             'current_tab': self.tabs.currentIndex(),
             'groups': {}
         }
         
-        for i in range(self.tabs.count()):
-            tab = self.tabs.widget(i)
-            if hasattr(tab, 'url'):
-                session['tabs'].append({
-                    'url': tab.url().toString(),
-                    'title': self.tabs.tabText(i),
-                    'group': self.tabs.tab_groups.get(i)
-                })
-        
         session_file = os.path.expanduser('~/.sledge/session.json')
         os.makedirs(os.path.dirname(session_file), exist_ok=True)
         with open(session_file, 'w') as f:
@@ -1296,16 +1305,63 @@ class SledgeBrowser(QMainWindow):
             while self.tabs.count() > 0:
                 self.tabs.removeTab(0)
             
-            # Restore tabs
-            for tab in session['tabs']:
-                index = self.add_new_tab(QUrl(tab['url']))
-                self.tabs.setTabText(index, tab['title'])
-                if tab['group']:
-                    self.tabs.addTabToGroup(index, tab['group'])
-            
-            # Restore current tab
-            if session['current_tab'] < self.tabs.count():
-                self.tabs.setCurrentIndex(session['current_tab'])
+            self.restore_tabs(session['tabs'], session['current_tab'])
+
+    def tab_records(self):
+        """Saved form of the open tabs: URL, title, group, last use, favicon and thumbnail"""
+        records = []
+        for i in range(self.tabs.count()):
+            tab = self.tabs.widget(i)
+            if not hasattr(tab, 'url'):
+                continue
+            entry = self.tabs.registry.entry_at(i)
+            record = {
+                'url': tab.url().toString(),
+                'title': self.tabs.tabText(i),
+                'group': self.tabs.group_of(i),
+                'last_accessed': entry.last_accessed.timestamp(),
+            }
+            icon = self.tabs.tabIcon(i)
+            if not icon.isNull():
+                png = encode_image(icon.pixmap(ICON_SIZE, ICON_SIZE).toImage(), 'PNG')
+                record['icon'] = base64.b64encode(png).decode('ascii')
+            thumbnail = self.tabs.thumbnail_data(entry.id)
+            if thumbnail:
+                record['thumbnail'] = base64.b64encode(thumbnail).decode('ascii')
+            records.append(record)
+        return records
+
+    def restore_tabs(self, records, current=0):
+        """Reopen saved tabs, loading only the current one and the most recently used few
+        
+        Every other tab gets a placeholder with its title, favicon and
+        thumbnail and loads on first activation. How many recent tabs load
+        up front is restore_eager (--restore-eager=N or the startup setting).
+        """
+        if not records:
+            return
+        memory_manager = self.tabs.memory_manager
+        registry = self.tabs.registry
+        tab_ids = memory_manager.add_unloaded_tabs([
+            TabSnapshot(
+                record['url'], record.get('title', ''),
+                thumbnail=base64.b64decode(record.get('thumbnail', '')),
+                icon=base64.b64decode(record.get('icon', '')),
+            )
+            for record in records
+        ])
+        for tab_id, record in zip(tab_ids, records):
+            if record.get('last_accessed'):
+                registry.touch(tab_id, datetime.fromtimestamp(record['last_accessed']))
+            if record.get('group'):
+                self.tabs.addTabToGroup(registry.index_of(tab_id), record['group'])
+        
+        current = min(max(current, 0), len(tab_ids) - 1)
+        recent = sorted((i for i in range(len(records)) if i != current),
+                        key=lambda i: records[i].get('last_accessed', 0), reverse=True)
+        memory_manager.wake_tabs([registry.index_of(tab_ids[current])])
+        self.tabs.setCurrentIndex(registry.index_of(tab_ids[current]))
+        memory_manager.queue_wake([registry.index_of(tab_ids[i]) for i in recent[:self.restore_eager]])
 
     def handle_download(self, download):
         """Handle file download"""
@@ -1351,6 +1407,9 @@ class SledgeBrowser(QMainWindow):
                 page.deleteLater()
                 del tab.page_ref
             tab.deleteLater()
+        self.tabs.memory_manager.shutdown()
+        self.tabs.thumbnails.stop()
+        self.request_interceptor.shutdown()
         
         # Clear any temporary data if needed
         if self.settings.get('privacy', 'clear_on_exit'):
@@ -1545,20 +1604,13 @@ class SledgeBrowser(QMainWindow):
     def search_tabs(self, text):
         """Search through open tabs"""
         results = []
-        for i in range(self.tabs.count()):
-            tab = self.tabs.widget(i)
-            title = self.tabs.tabText(i)
-            url = tab.url().toString() if hasattr(tab, 'url') else ""
-            
-            # Check if text matches title or URL
-            if (text.lower() in title.lower() or 
-                text.lower() in url.lower()):
-                # Use the tab widget's groups instead of tabBar directly
-                group = getattr(self.tabs, 'tab_groups', {}).get(i, "")
+        for entry in self.tabs.registry.entries():
+            if tab_matches(entry, text):
+                title = entry.title
                 display_text = f"Tab: {title}"
-                if group:
-                    display_text = f"Tab [{group}]: {title}"
-                results.append(("tab", title, f"tab:{i}", display_text))
+                if entry.group:
+                    display_text = f"Tab [{entry.group}]: {title}"
+                results.append(("tab", title, f"tab:{entry.index}", display_text))
         
         return results
 
@@ -1959,18 +2011,8 @@ class SledgeBrowser(QMainWindow):
     def save_workspace_state(self, name):
         """Save current tab state to workspace"""
         workspace = self.workspaces[name]
-        workspace['tabs'] = []
         workspace['groups'] = self.tabs.groups.copy()
-        
-        for i in range(self.tabs.count()):
-            tab = self.tabs.widget(i)
-            if hasattr(tab, 'url'):
-                workspace['tabs'].append({
-                    'url': tab.url().toString(),
-                    'title': self.tabs.tabText(i),
-                    'group': self.tabs.tab_groups.get(i)
-                })
-        
+        workspace['tabs'] = self.tab_records()
         workspace['active_tab'] = self.tabs.currentIndex()
 
     def restore_workspace_state(self, name):
@@ -1981,17 +2023,15 @@ class SledgeBrowser(QMainWindow):
         while self.tabs.count() > 0:
             self.tabs.removeTab(0)
             
-        # Restore groups
+        # Restore groups; membership is rebuilt from the tabs below
         self.tabs.groups = workspace['groups'].copy()
+        self.tabs.group_representatives.clear()
+        for group in self.tabs.groups.values():
+            group.tabs.clear()
         
-        # Restore tabs
-        for tab_state in workspace['tabs']:
-            idx = self.add_new_tab(QUrl(tab_state['url']), tab_state['title'])
-            if tab_state['group']:
-                self.tabs.addTabToGroup(idx, tab_state['group'])
-                
-        if workspace['tabs']:
-            self.tabs.setCurrentIndex(workspace['active_tab'])
+        # Restore tabs, loading only the active and most recently used ones
+        self.restore_tabs(workspace['tabs'], workspace.get('active_tab', 0))
+
     def setup_workspace_toolbar(self):
         """Setup workspace selection toolbar"""
         workspace_toolbar = QToolBar("Workspaces")
@@ -2311,12 +2351,23 @@ def main(argv=None):
     web_log = open(web_log_path, 'w')
     sys.stderr = web_log  # Redirect stderr (where most web errors go) to file
     
+    # Structured logging is off unless SLEDGE_LOG names categories (e.g. "CDN,VIDEO")
+    from sledge.utils.logger import Logger
+    Logger.configure_from_env()
+    
     print("\n" + "="*50)
     print("🚀 [SLEDGE DEBUG] 1. Entering main()")
     
     try:
+        # Our own options; everything else is left for Qt
+        import argparse
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument('--restore-eager', type=int, metavar='N',
+                            help="load only the current tab and the N most recently used ones on restore")
+        options, argv = parser.parse_known_args(argv if argv is not None else sys.argv)
+        
         # Initialize Qt Application
-        app = QApplication(argv if argv is not None else [])
+        app = QApplication(argv)
         print("🚀 [SLEDGE DEBUG] 2. Created QApplication")
         
         # Initialize QtWebEngine
@@ -2329,7 +2380,7 @@ def main(argv=None):
             
         # Create and show browser
         try:
-            browser = SledgeBrowser()
+            browser = SledgeBrowser(restore_eager=options.restore_eager)
             print("🚀 [SLEDGE DEBUG] 4. Created SledgeBrowser")
             browser.show()
             print("🚀 [SLEDGE DEBUG] 5. Called browser.show()")
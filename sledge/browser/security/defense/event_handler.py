@@ -1,6 +1,6 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 import asyncio
-from .fonce_client import FonceClient
+from ..security.fonce_client import FonceClient
 
 class DefenseEventHandler:
     def __init__(self, fonce_client: FonceClient):
@@ -21,6 +21,14 @@ class DefenseEventHandler:
             "data": data
         })
 
+    async def handle_events(self, events: List[Tuple[str, Dict[str, Any]]]):
+        """Queue a batch of (event_type, data) pairs"""
+        for event_type, data in events:
+            self.event_queue.put_nowait({
+                "type": event_type,
+                "data": data
+            })
+
     async def process_events(self):
         while self.running:
             try:
@@ -0,0 +1,221 @@
+import asyncio
+import os
+import threading
+import time
+from collections import namedtuple
+
+from sledge.utils.logger import Logger, LogCategory, LogLevel
+
+# Request patterns worth reporting, one flag bit per kind of attack. They are
+# matched against the lowercased path and query of every request.
+SUSPICIOUS_KINDS = ('command_injection', 'path_traversal', 'xss', 'sql_injection')
+COMMAND_INJECTION, PATH_TRAVERSAL, XSS, SQL_INJECTION = (1 << i for i in range(len(SUSPICIOUS_KINDS)))
+SUSPICIOUS_PATTERNS = (
+    ('eval=', COMMAND_INJECTION), ('exec=', COMMAND_INJECTION), ('system=', COMMAND_INJECTION),
+    ('../', PATH_TRAVERSAL), ('..%2f', PATH_TRAVERSAL),
+    ('<script', XSS), ('%3cscript', XSS),
+    ('union+select', SQL_INJECTION), ('union%20select', SQL_INJECTION),
+)
+
+# One flagged request, kept small so recording it is cheap on the IO thread
+SecurityEvent = namedtuple('SecurityEvent', 'kind time url first_party_host resource_type flags')
+
+
+def suspicious_kinds(flags):
+    """Names of the attack kinds set in a flags value"""
+    return [name for bit, name in enumerate(SUSPICIOUS_KINDS) if flags & (1 << bit)]
+
+
+def fonce_handler_from_env():
+    """DefenseEventHandler for the Fonce server in SLEDGE_FONCE_URL, or None when unset"""
+    url = os.environ.get('SLEDGE_FONCE_URL')
+    if not url:
+        return None
+    from .defense.event_handler import DefenseEventHandler
+    from .security.fonce_client import FonceClient
+    return DefenseEventHandler(FonceClient(url))
+
+
+class EventRing:
+    """Bounded single-producer/single-consumer ring buffer
+
+    The producer only moves ``tail`` and the consumer only moves ``head``, so
+    neither side takes a lock. When the ring is full new items are dropped and
+    counted instead of making the producer wait.
+    """
+
+    def __init__(self, capacity=1024):
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self.capacity = size
+        self._mask = size - 1
+        self._slots = [None] * size
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+
+    def push(self, item):
+        """Add an item, returns False (and counts a drop) when full"""
+        tail = self.tail
+        if tail - self.head > self._mask:
+            self.dropped += 1
+            return False
+        self._slots[tail & self._mask] = item
+        self.tail = tail + 1
+        return True
+
+    def pop_many(self, limit):
+        """Remove and return up to limit items, oldest first"""
+        head = self.head
+        end = min(self.tail, head + limit)
+        slots = self._slots
+        mask = self._mask
+        items = []
+        while head < end:
+            index = head & mask
+            items.append(slots[index])
+            slots[index] = None
+            head += 1
+        self.head = head
+        return items
+
+    def __len__(self):
+        return self.tail - self.head
+
+
+class SecurityEventPipeline:
+    """Carries flagged requests from the interceptor to the defense handler
+
+    submit() is called from the interceptor's thread and only pushes a record
+    onto an EventRing, waking the worker once per burst. A daemon thread runs
+    an asyncio loop that collects events into batches and passes them to
+    DefenseEventHandler.handle_events, or logs them when no handler is set up.
+    """
+
+    def __init__(self, handler_factory=None, capacity=1024, batch_size=64, batch_delay=0.05):
+        self.ring = EventRing(capacity)
+        self.handler_factory = handler_factory
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.handler = None
+        self.submitted = 0
+        self.delivered = 0
+        self.failed = 0
+        self._loop = None
+        self._wakeup = None
+        self._notified = False
+        self._stopping = False
+        self._thread = None
+
+    @property
+    def dropped(self):
+        return self.ring.dropped
+
+    def start(self):
+        """Start the worker thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='sledge-security-events', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Deliver what is queued and stop the worker"""
+        self._stopping = True
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._request_stop)
+            except RuntimeError:
+                pass  # Loop already finished
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def submit(self, kind, request, flags=0):
+        """Queue an event for a ParsedRequest without blocking; False if it was dropped"""
+        self.submitted += 1
+        event = SecurityEvent(kind, time.time(), request.url, request.first_party_host,
+                              request.resource_type, flags)
+        if not self.ring.push(event):
+            return False
+        if not self._notified:
+            self._notified = True
+            loop = self._loop
+            if loop is not None:
+                loop.call_soon_threadsafe(self._wakeup.set)
+        return True
+
+    def stats(self):
+        return {
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'delivered': self.delivered,
+            'failed': self.failed,
+            'queued': len(self.ring),
+        }
+
+    def _request_stop(self):
+        self._stopping = True
+        self._wakeup.set()
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._worker())
+        finally:
+            loop.close()
+
+    async def _worker(self):
+        self._wakeup = asyncio.Event()
+        handler = self.handler = self._create_handler()
+        handler_task = asyncio.ensure_future(handler.start()) if handler is not None else None
+        self._loop = asyncio.get_running_loop()
+
+        while True:
+            # Clear the flag before draining so a push after the drain wakes us again
+            self._notified = False
+            while len(self.ring):
+                await self._deliver(handler, self.ring.pop_many(self.batch_size))
+            if self._stopping:
+                break
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._stopping:
+                await asyncio.sleep(self.batch_delay)  # Let a burst collect into one batch
+
+        if handler is not None:
+            await handler.stop()
+            handler_task.cancel()
+
+    def _create_handler(self):
+        if self.handler_factory is None:
+            return None
+        try:
+            return self.handler_factory()
+        except Exception as e:
+            print(f"⚠️ [SECURITY] Defense handler unavailable, logging events instead: {e}")
+            return None
+
+    async def _deliver(self, handler, batch):
+        if handler is None:
+            for event in batch:
+                Logger.log(LogCategory.SECURITY, LogLevel.WARNING, "[SUSPICIOUS] %s (%s)",
+                           event.url, ', '.join(suspicious_kinds(event.flags)))
+            self.delivered += len(batch)
+            return
+        try:
+            await handler.handle_events([(event.kind, self._event_data(event)) for event in batch])
+            self.delivered += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"❌ [SECURITY] Could not deliver {len(batch)} events: {e}")
+
+    @staticmethod
+    def _event_data(event):
+        return {
+            'url': event.url,
+            'time': event.time,
+            'first_party_host': event.first_party_host,
+            'resource_type': event.resource_type,
+            'patterns': suspicious_kinds(event.flags),
+        }
@@ -0,0 +1,511 @@
+import os
+import re
+import json
+import time
+import pickle
+from collections import Counter
+
+FILTERS_DIR = os.path.expanduser('~/.sledge/filters')
+CACHE_PATH = os.path.expanduser('~/.sledge/cache/filters.bin')
+
+# Resource type names as produced by rules.resource_type_name
+RESOURCE_TYPES = (
+    'mainframe', 'subframe', 'stylesheet', 'script', 'image', 'fontresource',
+    'subresource', 'object', 'media', 'worker', 'sharedworker', 'prefetch',
+    'favicon', 'xhr', 'ping', 'serviceworker', 'cspreport', 'pluginresource',
+    'navigationpreloadmainframe', 'navigationpreloadsubframe', 'websocket', 'unknown',
+)
+TYPE_BITS = {name: 1 << i for i, name in enumerate(RESOURCE_TYPES)}
+ALL_TYPES = (1 << len(RESOURCE_TYPES)) - 1
+
+# Adblock Plus type options and the request types they cover
+FILTER_TYPES = {
+    'script': ('script',),
+    'image': ('image', 'favicon'),
+    'stylesheet': ('stylesheet',),
+    'object': ('object', 'pluginresource'),
+    'xmlhttprequest': ('xhr',),
+    'xhr': ('xhr',),
+    'subdocument': ('subframe', 'navigationpreloadsubframe'),
+    'frame': ('subframe', 'navigationpreloadsubframe'),
+    'media': ('media',),
+    'font': ('fontresource',),
+    'websocket': ('websocket',),
+    'ping': ('ping', 'cspreport'),
+    'other': ('subresource', 'prefetch', 'worker', 'sharedworker', 'serviceworker', 'unknown'),
+}
+# Like ABP, filters without type options never block top-level documents
+DEFAULT_TYPES = ALL_TYPES & ~(TYPE_BITS['mainframe'] | TYPE_BITS['navigationpreloadmainframe'])
+
+# Filter kinds
+HOST = 0       # ||example.com^ : matched through the host index
+SUBSTRING = 1  # plain text anywhere in the URL
+PATTERN = 2    # wildcards/anchors/separators, compiled to a regex on first use
+REGEX = 3      # /regular expression/
+
+# Filter flags
+THIRD_PARTY = 1
+FIRST_PARTY = 2
+IMPORTANT = 4
+MATCH_CASE = 8
+
+TOKEN = re.compile(r'[a-z0-9%]{2,}')
+SEPARATOR = r'(?:[^\w.%-]|$)'
+
+
+class NetworkFilter:
+    """A parsed Adblock Plus network filter"""
+
+    __slots__ = ('text', 'kind', 'pattern', 'flags', 'types', 'domains',
+                 'excluded_domains', 'list_index', 'exception')
+
+    def __init__(self, text, kind, pattern, flags=0, types=DEFAULT_TYPES, domains=(),
+                 excluded_domains=(), list_index=0, exception=False):
+        self.text = text
+        self.kind = kind
+        self.pattern = pattern
+        self.flags = flags
+        self.types = types
+        self.domains = domains
+        self.excluded_domains = excluded_domains
+        self.list_index = list_index
+        self.exception = exception
+
+    def __reduce__(self):
+        return (NetworkFilter, (self.text, self.kind, self.pattern, self.flags, self.types,
+                                self.domains, self.excluded_domains, self.list_index,
+                                self.exception))
+
+    @classmethod
+    def parse(cls, line, list_index=0):
+        """Parse one filter line; returns None for comments, cosmetic and unsupported filters"""
+        line = line.strip()
+        if not line or line[0] in '![':
+            return None
+        if '##' in line or '#@#' in line or '#?#' in line or '#$#' in line:
+            return None
+
+        text = line
+        exception = line.startswith('@@')
+        if exception:
+            line = line[2:]
+
+        options = ''
+        dollar = line.rfind('$')
+        if dollar >= 0 and not (line.startswith('/') and line.endswith('/')):
+            line, options = line[:dollar], line[dollar + 1:]
+
+        flags = 0
+        positive_types = 0
+        negative_types = 0
+        domains = []
+        excluded = []
+        for option in options.split(',') if options else ():
+            option = option.strip().lower()
+            negated = option.startswith('~')
+            name, _, value = option.lstrip('~').partition('=')
+            if name in ('third-party', '3p'):
+                flags |= FIRST_PARTY if negated else THIRD_PARTY
+            elif name in ('first-party', '1p'):
+                flags |= THIRD_PARTY if negated else FIRST_PARTY
+            elif name == 'domain':
+                for domain in value.split('|'):
+                    if domain.startswith('~'):
+                        excluded.append(domain[1:])
+                    elif domain:
+                        domains.append(domain)
+            elif name == 'match-case':
+                flags |= MATCH_CASE
+            elif name == 'important':
+                flags |= IMPORTANT
+            elif name in FILTER_TYPES:
+                bits = 0
+                for type_name in FILTER_TYPES[name]:
+                    bits |= TYPE_BITS[type_name]
+                if negated:
+                    negative_types |= bits
+                else:
+                    positive_types |= bits
+            else:
+                # Options like csp/redirect/removeparam/document change what a
+                # match does; skipping them is safer than over-blocking
+                return None
+        types = (positive_types or DEFAULT_TYPES) & ~negative_types
+        if not types:
+            return None
+
+        if not flags & MATCH_CASE:
+            line = line.lower()
+        if len(line) > 2 and line.startswith('/') and line.endswith('/'):
+            kind, pattern = REGEX, line[1:-1]
+        elif line.startswith('||') and line.endswith('^') and _is_plain_host(line[2:-1]):
+            kind, pattern = HOST, line[2:-1]
+        elif not any(c in line for c in '*^|'):
+            kind, pattern = SUBSTRING, line
+        else:
+            kind, pattern = PATTERN, line.strip('*') or '*'
+        if not pattern:
+            return None
+        return cls(text, kind, pattern, flags, types, tuple(domains), tuple(excluded),
+                   list_index, exception)
+
+    def tokens(self):
+        """Tokens that any URL matching this filter must contain as whole tokens"""
+        if self.kind == REGEX or self.flags & MATCH_CASE:
+            return []
+        if self.kind == HOST:
+            return []
+        pattern = self.pattern
+        left_anchored = pattern.startswith('|')
+        right_anchored = pattern.endswith('|')
+        body = pattern.lstrip('|').rstrip('|')
+        tokens = []
+        for match in TOKEN.finditer(body):
+            start, end = match.span()
+            before = body[start - 1] if start else None
+            after = body[end] if end < len(body) else None
+            # The token must be delimited in the pattern, not cut off by a wildcard or the pattern edge
+            if before == '*' or after == '*':
+                continue
+            if before is None and (self.kind == SUBSTRING or not left_anchored):
+                continue
+            if after is None and (self.kind == SUBSTRING or not right_anchored):
+                continue
+            tokens.append(match.group())
+        return tokens
+
+    def compile(self):
+        """Build the regex for PATTERN and REGEX filters"""
+        flags = 0 if self.flags & MATCH_CASE else re.IGNORECASE
+        if self.kind == REGEX:
+            return re.compile(self.pattern, flags)
+        pattern = self.pattern
+        prefix = ''
+        if pattern.startswith('||'):
+            prefix = r'^[a-z][a-z0-9+.-]*:/+(?:[^/?#]*\.)?'
+            pattern = pattern[2:]
+        elif pattern.startswith('|'):
+            prefix = '^'
+            pattern = pattern[1:]
+        suffix = ''
+        if pattern.endswith('|'):
+            suffix = '$'
+            pattern = pattern[:-1]
+        parts = []
+        for char in pattern:
+            if char == '*':
+                parts.append('.*')
+            elif char == '^':
+                parts.append(SEPARATOR)
+            else:
+                parts.append(re.escape(char))
+        return re.compile(prefix + ''.join(parts) + suffix, flags)
+
+    def options_match(self, resource_bit, host, first_party_host, third_party):
+        if not self.types & resource_bit:
+            return False
+        if self.flags & THIRD_PARTY and not third_party:
+            return False
+        if self.flags & FIRST_PARTY and third_party:
+            return False
+        if self.domains and not any(_host_matches(first_party_host, d) for d in self.domains):
+            return False
+        if self.excluded_domains and any(_host_matches(first_party_host, d) for d in self.excluded_domains):
+            return False
+        return True
+
+
+class FilterList:
+    """Hit counters for one filter list file"""
+
+    def __init__(self, name, path='', filter_count=0):
+        self.name = name
+        self.path = path
+        self.filter_count = filter_count
+        self.hits = 0
+        self.hits_by_type = Counter()
+
+    def __getstate__(self):
+        return {'name': self.name, 'path': self.path, 'filter_count': self.filter_count}
+
+    def __setstate__(self, state):
+        self.__init__(state['name'], state['path'], state['filter_count'])
+
+
+class _FilterIndex:
+    """Filters bucketed by host or by their rarest token"""
+
+    def __init__(self):
+        self.hosts = {}    # domain -> [filters]
+        self.tokens = {}   # token -> [filters]
+        self.untokened = []
+
+    def add(self, f, token):
+        if f.kind == HOST:
+            self.hosts.setdefault(f.pattern, []).append(f)
+        elif token:
+            self.tokens.setdefault(token, []).append(f)
+        else:
+            self.untokened.append(f)
+
+    def __len__(self):
+        return (sum(map(len, self.hosts.values())) + sum(map(len, self.tokens.values())) +
+                len(self.untokened))
+
+
+class NetworkFilterEngine:
+    """Adblock Plus / EasyList network filter matcher
+
+    Host-anchored domain filters (the bulk of EasyList) are looked up by walking
+    the request host's suffixes. Every other filter is stored under the rarest
+    of its tokens, so a URL is only tested against filters sharing one of its
+    tokens. Pattern regexes are compiled the first time they are needed.
+    $important filters have their own index, checked before the others since
+    no exception can override them.
+    """
+
+    FORMAT = 2
+
+    def __init__(self, lists=()):
+        self.lists = list(lists)
+        self.important = _FilterIndex()
+        self.blocking = _FilterIndex()
+        self.exceptions = _FilterIndex()
+        self._regexes = {}
+        self.checked = 0
+        self.blocked = 0
+        self.match_time = 0.0
+
+    @classmethod
+    def from_lines(cls, sources):
+        """Build an engine from (name, lines) or (name, lines, path) tuples"""
+        lists = []
+        parsed = []
+        for index, (name, lines, path) in enumerate(_with_paths(sources)):
+            count = 0
+            for line in lines:
+                f = NetworkFilter.parse(line, index)
+                if f is not None:
+                    parsed.append(f)
+                    count += 1
+            lists.append(FilterList(name, path, count))
+
+        # Pick each filter's least common token across all lists
+        token_lists = [f.tokens() for f in parsed]
+        frequency = Counter()
+        for tokens in token_lists:
+            frequency.update(set(tokens))
+
+        engine = cls(lists)
+        for f, tokens in zip(parsed, token_lists):
+            token = min(tokens, key=lambda t: (frequency[t], -len(t))) if tokens else None
+            if f.exception:
+                engine.exceptions.add(f, token)
+            elif f.flags & IMPORTANT:
+                engine.important.add(f, token)
+            else:
+                engine.blocking.add(f, token)
+        return engine
+
+    @classmethod
+    def load(cls, directory=FILTERS_DIR, cache_path=CACHE_PATH):
+        """Load every *.txt list in directory, reusing the binary cache when fresh"""
+        if not os.path.isdir(directory):
+            return cls()
+        paths = [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+                 if name.endswith('.txt')]
+        signature = (cls.FORMAT,) + tuple(
+            (path, os.path.getsize(path), os.path.getmtime(path)) for path in paths
+        )
+
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    cached_signature, engine = pickle.load(f)
+                if cached_signature == signature:
+                    return engine
+            except Exception as e:
+                print(f"⚠️ [FILTERS] Ignoring unreadable filter cache: {e}")
+
+        sources = []
+        for path in paths:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                sources.append((os.path.splitext(os.path.basename(path))[0], f.read().splitlines(), path))
+        engine = cls.from_lines(sources)
+
+        if cache_path:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                tmp_path = cache_path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump((signature, engine), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                print(f"⚠️ [FILTERS] Could not write filter cache: {e}")
+        return engine
+
+    def __getstate__(self):
+        return {'lists': self.lists, 'important': self.important, 'blocking': self.blocking,
+                'exceptions': self.exceptions}
+
+    def __setstate__(self, state):
+        self.__init__(state['lists'])
+        self.important = state['important']
+        self.blocking = state['blocking']
+        self.exceptions = state['exceptions']
+
+    def __len__(self):
+        return len(self.important) + len(self.blocking) + len(self.exceptions)
+
+    def match(self, url, host, resource_type='other', first_party_host=''):
+        """Return the filter that blocks a request, or None"""
+        lower = url.lower()
+        resource_bit = TYPE_BITS.get(resource_type, TYPE_BITS['unknown'])
+        third_party = bool(first_party_host) and _site(host) != _site(first_party_host)
+        context = (url, lower, resource_bit, host, first_party_host, third_party)
+        url_tokens = None
+
+        # $important filters win over exceptions, whichever index a match comes from
+        important = self.important
+        hit = self._match_hosts(important, context)
+        if hit is not None:
+            return hit
+        if important.tokens or important.untokened:
+            url_tokens = set(TOKEN.findall(lower))
+            hit = self._match_tokens(important, url_tokens, context)
+            if hit is not None:
+                return hit
+
+        blocking = self.blocking
+        hit = self._match_hosts(blocking, context)
+        if hit is None:
+            if url_tokens is None:
+                url_tokens = set(TOKEN.findall(lower))
+            hit = self._match_tokens(blocking, url_tokens, context)
+        if hit is None:
+            return None
+
+        exceptions = self.exceptions
+        if self._match_hosts(exceptions, context) is not None:
+            return None
+        if exceptions.tokens or exceptions.untokened:
+            if url_tokens is None:
+                url_tokens = set(TOKEN.findall(lower))
+            if self._match_tokens(exceptions, url_tokens, context) is not None:
+                return None
+        return hit
+
+    def should_block(self, url, host, resource_type='other', first_party_host=''):
+        """Match a request and record the hit against its filter list"""
+        start = time.perf_counter()
+        hit = self.match(url, host, resource_type, first_party_host)
+        self.match_time += time.perf_counter() - start
+        self.checked += 1
+        if hit is None:
+            return False
+        self.blocked += 1
+        filter_list = self.lists[hit.list_index]
+        filter_list.hits += 1
+        filter_list.hits_by_type[resource_type] += 1
+        return True
+
+    def stats(self):
+        """Per-list counters for the debug panel"""
+        return {
+            'checked': self.checked,
+            'blocked': self.blocked,
+            'match_time_ms': round(self.match_time * 1000, 3),
+            'lists': [
+                {
+                    'name': l.name,
+                    'filters': l.filter_count,
+                    'hits': l.hits,
+                    'hits_by_type': dict(l.hits_by_type),
+                }
+                for l in self.lists
+            ],
+        }
+
+    def to_json(self, path=None):
+        """Serialize stats(), writing them to path when one is given"""
+        data = json.dumps(self.stats(), indent=2)
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(data)
+        return data
+
+    def summary(self):
+        """Short human-readable lines for debug views
+
+        Only requests are counted: blocking happens before any response, so
+        the bytes a blocked request would have cost are never known.
+        """
+        stats = self.stats()
+        lines = [f"Filters: {len(self)} in {len(self.lists)} lists, checked {stats['checked']}, "
+                 f"blocked {stats['blocked']} ({stats['match_time_ms']} ms matching)"]
+        for l in stats['lists']:
+            by_type = ', '.join(f"{name}: {count}" for name, count in
+                                sorted(l['hits_by_type'].items(), key=lambda item: -item[1]))
+            lines.append(f"  {l['name']}: {l['hits']} blocked" + (f" ({by_type})" if by_type else ""))
+        return lines
+
+    def _match_hosts(self, index, context):
+        hosts = index.hosts
+        if not hosts:
+            return None
+        host = context[3]
+        while host:
+            for f in hosts.get(host, ()):
+                if f.options_match(*context[2:]):
+                    return f
+            host = host.partition('.')[2]
+        return None
+
+    def _match_tokens(self, index, url_tokens, context):
+        buckets = index.tokens
+        for token in url_tokens:
+            for f in buckets.get(token, ()):
+                if self._filter_matches(f, context):
+                    return f
+        for f in index.untokened:
+            if self._filter_matches(f, context):
+                return f
+        return None
+
+    def _filter_matches(self, f, context):
+        url, lower, resource_bit, host, first_party_host, third_party = context
+        if f.kind == SUBSTRING:
+            if f.pattern not in (url if f.flags & MATCH_CASE else lower):
+                return False
+        else:
+            regex = self._regexes.get(f)
+            if regex is None:
+                try:
+                    regex = self._regexes[f] = f.compile()
+                except re.error:
+                    regex = self._regexes[f] = re.compile(r'(?!)')
+            if regex.search(url) is None:
+                return False
+        return f.options_match(resource_bit, host, first_party_host, third_party)
+
+
+def _with_paths(sources):
+    for source in sources:
+        if len(source) == 3:
+            yield source
+        else:
+            yield source[0], source[1], ''
+
+
+def _is_plain_host(text):
+    return bool(text) and all(c.isalnum() or c in '.-' for c in text)
+
+
+def _host_matches(host, domain):
+    return host == domain or host.endswith('.' + domain)
+
+
+def _site(host):
+    """Approximate registrable domain (last two labels) for third-party checks"""
+    parts = host.rsplit('.', 2)
+    return '.'.join(parts[-2:])
@@ -0,0 +1,51 @@
+from collections import OrderedDict
+
+
+class HeaderPlanCache:
+    """Bounded LRU of precomputed request header plans
+
+    A plan is an immutable object (a tuple of ``(name, value)`` byte pairs or
+    a RulePlan) that the interceptor replays with ``setHttpHeader``. Plans can
+    depend on browser settings, so the whole cache is dropped whenever the
+    settings revision changes.
+    """
+
+    def __init__(self, settings=None, capacity=1024):
+        self.settings = settings
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._plans = OrderedDict()
+        self._revision = self._settings_revision()
+
+    def get(self, key):
+        """Get a cached plan, or None if it has to be built"""
+        revision = self._settings_revision()
+        if revision != self._revision:
+            self._plans.clear()
+            self._revision = revision
+        plan = self._plans.get(key)
+        if plan is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._plans.move_to_end(key)
+        return plan
+
+    def put(self, key, plan):
+        """Cache a plan and return it"""
+        self._plans[key] = plan
+        self._plans.move_to_end(key)
+        if len(self._plans) > self.capacity:
+            self._plans.popitem(last=False)
+        return plan
+
+    def invalidate(self):
+        """Drop every cached plan"""
+        self._plans.clear()
+
+    def __len__(self):
+        return len(self._plans)
+
+    def _settings_revision(self):
+        return getattr(self.settings, 'revision', 0)
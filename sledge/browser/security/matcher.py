@@ -0,0 +1,73 @@
+import re
+
+
+class HostTrie:
+    """Reverse-label trie mapping domain suffixes to flag bits
+
+    Domains match themselves and any subdomain. A leading ``*`` label for the
+    top-level domain (``wcofun.*``) matches the name under any TLD.
+    """
+
+    _TERMINAL = None
+
+    def __init__(self):
+        self._root = {}
+
+    def add(self, domain, flags):
+        """Register a domain suffix with the given flags"""
+        node = self._root
+        for label in reversed(domain.lower().strip('.').split('.')):
+            node = node.setdefault(label, {})
+        node[self._TERMINAL] = node.get(self._TERMINAL, 0) | flags
+
+    def match(self, host):
+        """Return the combined flags of every registered suffix of host"""
+        labels = host.split('.')
+        labels.reverse()
+        flags = 0
+        for start in (self._root.get(labels[0]), self._root.get('*')):
+            node = start
+            for label in labels[1:]:
+                if node is None:
+                    break
+                flags |= node.get(self._TERMINAL, 0)
+                node = node.get(label)
+            if node is not None:
+                flags |= node.get(self._TERMINAL, 0)
+        return flags
+
+
+class TokenMatcher:
+    """Single-pass multi-pattern matcher over lowercased text
+
+    All tokens are compiled into one alternation, longest first, inside a
+    lookahead, so the regex engine reports the longest token starting at each
+    position in a single scan, overlapping matches included. Each token also
+    carries the flags of every shorter token it contains, which keeps the
+    result identical to testing every token separately.
+    """
+
+    def __init__(self, tokens):
+        table = {}
+        for token, flags in tokens:
+            token = token.lower()
+            table[token] = table.get(token, 0) | flags
+        for token in table:
+            for other, flags in table.items():
+                if other != token and other in token:
+                    table[token] |= flags
+        self._flags = table
+        ordered = sorted(table, key=len, reverse=True)
+        # A zero-width match never consumes text, so 'watch' doesn't hide 'chunk' in 'watchunk'
+        self._pattern = re.compile(
+            '(?=(%s))' % '|'.join(re.escape(t) for t in ordered)) if ordered else None
+
+    def match(self, text):
+        """Return the combined flags of every token found in text"""
+        if self._pattern is None:
+            return 0
+        flags = 0
+        table = self._flags
+        for token in self._pattern.findall(text):
+            flags |= table[token]
+        return flags
@@ -0,0 +1,169 @@
+import json
+import threading
+import time
+
+# Log-linear (HDR-style) buckets: values below 2**SUB_BITS get one bucket each,
+# every power of two above that is split into 2**(SUB_BITS - 1) buckets, so a
+# recorded latency is off by at most 1/8 of its value.
+SUB_BITS = 4
+HALF = 1 << (SUB_BITS - 1)
+MAX_NS = (1 << 36) - 1  # ~68s; anything slower is clamped
+BUCKETS = (MAX_NS.bit_length() - SUB_BITS + 1) * HALF + HALF
+
+
+def bucket_index(value):
+    """Histogram bucket for a value in nanoseconds"""
+    if value < (1 << SUB_BITS):
+        return max(value, 0)
+    if value > MAX_NS:
+        value = MAX_NS
+    shift = value.bit_length() - SUB_BITS
+    return shift * HALF + (value >> shift)
+
+
+def bucket_bounds(index):
+    """Smallest and largest value (in nanoseconds) that land in a bucket"""
+    if index < (1 << SUB_BITS):
+        return index, index
+    shift = index // HALF - 1
+    mantissa = index - shift * HALF
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+
+class _Shard:
+    """Counters owned by one recording thread"""
+
+    __slots__ = ('branches', 'redirects', 'histogram', 'total_ns', 'max_ns')
+
+    def __init__(self, branch_count):
+        self.branches = [0] * branch_count
+        self.redirects = 0
+        self.histogram = [0] * BUCKETS
+        self.total_ns = 0
+        self.max_ns = 0
+
+
+class InterceptorMetrics:
+    """Request counters and a latency histogram for the request interceptor
+
+    Every thread records into its own shard, so recording never takes a lock
+    and stays cheap on the IO thread; readers sum the shards. A snapshot taken
+    while requests are in flight can be off by the requests being recorded.
+    """
+
+    BRANCHES = ('default', 'cdn', 'wco', 'video', 'blocked')
+    DEFAULT, CDN, WCO, VIDEO, BLOCKED = range(len(BRANCHES))
+
+    PERCENTILES = (50, 90, 99, 99.9)
+
+    def __init__(self):
+        self.started = time.time()
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()  # Only guards the shard list
+
+    def record(self, branch, elapsed_ns, redirected=False):
+        """Count one intercepted request and the time spent on it"""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard.branches[branch] += 1
+        if redirected:
+            shard.redirects += 1
+        shard.histogram[bucket_index(elapsed_ns)] += 1
+        shard.total_ns += elapsed_ns
+        if elapsed_ns > shard.max_ns:
+            shard.max_ns = elapsed_ns
+
+    def _new_shard(self):
+        shard = self._local.shard = _Shard(len(self.BRANCHES))
+        with self._lock:
+            self._shards.append(shard)
+        return shard
+
+    def reset(self):
+        """Start counting from zero; threads pick up fresh shards lazily"""
+        with self._lock:
+            self._shards = []
+            self._local = threading.local()
+        self.started = time.time()
+
+    def histogram(self):
+        """Merged histogram as a list of counts per bucket"""
+        merged = [0] * BUCKETS
+        for shard in list(self._shards):
+            for index, count in enumerate(shard.histogram):
+                if count:
+                    merged[index] += count
+        return merged
+
+    def snapshot(self):
+        """All counters and latency percentiles as a JSON-friendly dict"""
+        shards = list(self._shards)
+        branches = [0] * len(self.BRANCHES)
+        redirects = total_ns = max_ns = 0
+        for shard in shards:
+            for index, count in enumerate(shard.branches):
+                branches[index] += count
+            redirects += shard.redirects
+            total_ns += shard.total_ns
+            max_ns = max(max_ns, shard.max_ns)
+        requests = sum(branches)
+        histogram = self.histogram()
+
+        latency = {'mean': round(total_ns / requests / 1000, 2) if requests else 0.0,
+                   'max': round(max_ns / 1000, 2)}
+        for percent in self.PERCENTILES:
+            value = min(self._percentile(histogram, requests, percent), max_ns)
+            latency[f"p{percent:g}"] = round(value / 1000, 2)
+
+        return {
+            'since': self.started,
+            'requests': requests,
+            'branches': dict(zip(self.BRANCHES, branches)),
+            'redirects': redirects,
+            'latency_us': latency,
+            'histogram_us': [
+                [round(bucket_bounds(index)[0] / 1000, 3), count]
+                for index, count in enumerate(histogram) if count
+            ],
+        }
+
+    def percentile(self, percent):
+        """Latency percentile in microseconds"""
+        histogram = self.histogram()
+        return self._percentile(histogram, sum(histogram), percent) / 1000
+
+    @staticmethod
+    def _percentile(histogram, count, percent):
+        """Upper bound of the bucket holding the given percentile, in nanoseconds"""
+        if not count:
+            return 0
+        rank = max(1, int(count * percent / 100 + 0.5))
+        seen = 0
+        for index, bucket_count in enumerate(histogram):
+            seen += bucket_count
+            if seen >= rank:
+                return bucket_bounds(index)[1]
+        return MAX_NS
+
+    def to_json(self, path=None):
+        """Serialize a snapshot, writing it to path when one is given"""
+        data = json.dumps(self.snapshot(), indent=2)
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(data)
+        return data
+
+    def summary(self):
+        """Short human-readable lines for debug views"""
+        snap = self.snapshot()
+        latency = snap['latency_us']
+        branches = ', '.join(f"{name}: {count}" for name, count in snap['branches'].items())
+        return [
+            f"Requests: {snap['requests']} (redirects: {snap['redirects']})",
+            f"Branches: {branches}",
+            f"Latency (us): mean {latency['mean']}, p50 {latency['p50']}, "
+            f"p99 {latency['p99']}, p99.9 {latency['p99.9']}, max {latency['max']}",
+        ]
@@ -13,6 +13,7 @@ import sys
 import traceback
 from sledge.client.fonce import FonceClient
 from sledge.utils.logger import Logger
+from sledge.utils.sampler import shared_sampler
 
 class LightweightAgent:
     """Minimal monitoring agent with low overhead"""
@@ -23,6 +24,7 @@ class LightweightAgent:
         self.running = False
         self._metrics_buffer = []
         self._compromise_attempts = []
+        self._sampler = shared_sampler()
         
     async def start(self):
         self.running = True
@@ -57,9 +59,11 @@ class LightweightAgent:
                 
     def _collect_basic_metrics(self) -> Dict:
         """Collect only essential metrics"""
+        # Read from the shared sampler's last snapshot, no syscalls here
+        snapshot = self._sampler.latest()
         return {
-            "cpu": psutil.cpu_percent(interval=None),  # Non-blocking
-            "memory": psutil.virtual_memory().percent,
+            "cpu": snapshot.system_cpu if snapshot else 0.0,
+            "memory": snapshot.memory_percent if snapshot else 0.0,
             "timestamp": int(time.time())
         }
         
@@ -0,0 +1,116 @@
+_TYPE_NAMES = {}
+
+
+def resource_type_name(resource_type):
+    """Map a ResourceType enum to the short lowercase name used in rules ("media", "xhr", ...)"""
+    name = _TYPE_NAMES.get(resource_type)
+    if name is None:
+        name = getattr(resource_type, 'name', str(resource_type))
+        if name.startswith('ResourceType'):
+            name = name[len('ResourceType'):]
+        name = _TYPE_NAMES[resource_type] = name.lower()
+    return name
+
+
+def path_of(url):
+    """Lowercased path and query of a URL, the text pathContains matches"""
+    start = url.find('://')
+    start = url.find('/', start + 3 if start >= 0 else 0)
+    return url[start:].lower() if start >= 0 else ''
+
+
+class QueryParams:
+    """Query string multidict, split on first use
+
+    Values are kept raw (still percent-encoded) so they can be copied into
+    redirects and signatures exactly as the server sent them.
+    """
+
+    __slots__ = ('text', '_pairs')
+
+    def __init__(self, text):
+        self.text = text
+        self._pairs = None
+
+    @classmethod
+    def from_url(cls, url):
+        return cls(url.partition('#')[0].partition('?')[2])
+
+    def pairs(self):
+        """All (name, value) pairs in order"""
+        if self._pairs is None:
+            self._pairs = [
+                (name, value)
+                for name, _, value in (param.partition('=') for param in self.text.split('&') if param)
+            ]
+        return self._pairs
+
+    def get(self, name, default=None):
+        """First value of a parameter"""
+        for key, value in self.pairs():
+            if key == name:
+                return value
+        return default
+
+    def getall(self, name):
+        """Every value of a parameter"""
+        return [value for key, value in self.pairs() if key == name]
+
+    def to_dict(self):
+        """Plain dict of first values"""
+        params = {}
+        for name, value in self.pairs():
+            params.setdefault(name, value)
+        return params
+
+    def __contains__(self, name):
+        return any(key == name for key, _ in self.pairs())
+
+    def __len__(self):
+        return len(self.pairs())
+
+    def __bool__(self):
+        return bool(self.text)
+
+
+class ParsedRequest:
+    """An intercepted request, parsed once and shared by every interceptor stage"""
+
+    __slots__ = ('url', 'scheme', 'host', 'path', 'resource_type',
+                 'request_url', 'first_party', '_first_party_host', '_query')
+
+    def __init__(self, request_url, first_party, resource_type):
+        self.request_url = request_url
+        self.first_party = first_party
+        self.url = request_url.toString()
+        self.scheme = request_url.scheme()
+        self.host = request_url.host()
+        self.path = path_of(self.url)
+        self.resource_type = resource_type
+        self._first_party_host = None
+        self._query = None
+
+    @classmethod
+    def from_info(cls, info):
+        """Parse a QWebEngineUrlRequestInfo"""
+        return cls(info.requestUrl(), info.firstPartyUrl(), resource_type_name(info.resourceType()))
+
+    @property
+    def port(self):
+        return self.request_url.port()
+
+    @property
+    def first_party_host(self):
+        if self._first_party_host is None:
+            self._first_party_host = self.first_party.host()
+        return self._first_party_host
+
+    @property
+    def first_party_url(self):
+        return self.first_party.toString()
+
+    @property
+    def query(self):
+        if self._query is None:
+            self._query = QueryParams.from_url(self.url)
+        return self._query
@@ -0,0 +1,456 @@
+import os
+import re
+import json
+import time
+import hashlib
+from collections import namedtuple
+
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, QUrl, pyqtSignal
+
+from .matcher import HostTrie, TokenMatcher
+from .request import ParsedRequest
+from sledge.utils.logger import Logger, LogCategory, LogLevel
+
+RULES_DIR = os.path.expanduser('~/.sledge/rules')
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), 'default_rules.json')
+
+# Result of applying the rules to one request
+RuleOutcome = namedtuple('RuleOutcome', 'plan redirect_url blocked media_url')
+
+
+class RuleError(ValueError):
+    """Raised for malformed rule files"""
+
+
+class Template:
+    """Precompiled string template with {now}, {url} and {query.name|default} fields"""
+
+    FIELD = re.compile(r'\{([^{}]+)\}')
+
+    def __init__(self, text):
+        self.text = text
+        self.parts = []  # Literal strings and (field, default) pairs
+        pos = 0
+        for match in self.FIELD.finditer(text):
+            if match.start() > pos:
+                self.parts.append(text[pos:match.start()])
+            field, _, default = match.group(1).partition('|')
+            if field not in ('now', 'url') and not field.startswith('query.'):
+                raise RuleError(f"Unknown template field '{field}' in '{text}'")
+            self.parts.append((field, default))
+            pos = match.end()
+        if pos < len(text):
+            self.parts.append(text[pos:])
+
+    def render(self, context):
+        out = []
+        for part in self.parts:
+            if isinstance(part, str):
+                out.append(part)
+                continue
+            field, default = part
+            if field.startswith('query.'):
+                value = context['query'].get(field[6:])
+            else:
+                value = context[field]
+            out.append(str(value) if value else default)
+        return ''.join(out)
+
+
+class Rule:
+    """A single compiled network rule"""
+
+    __slots__ = ('id', 'priority', 'order', 'hosts', 'excluded_hosts', 'tokens',
+                 'resource_types', 'first_party_hosts', 'query_params',
+                 'set_headers', 'remove_headers', 'redirect_url', 'redirect_query',
+                 'sign', 'block', 'tag_media', 'log')
+
+    def __init__(self, data, order):
+        if not isinstance(data, dict) or not data.get('id'):
+            raise RuleError(f"Rule #{order} needs an 'id'")
+        self.id = str(data['id'])
+        self.priority = data.get('priority', 1)
+        if not isinstance(self.priority, int) or isinstance(self.priority, bool):
+            raise RuleError(f"Rule '{self.id}' has a non-integer priority {self.priority!r}")
+        self.order = order
+
+        condition = self._mapping(data, 'condition')
+        self.hosts = [h.lower() for h in self._strings(condition, 'hostSuffix')]
+        self.excluded_hosts = [h.lower() for h in self._strings(condition, 'excludedHostSuffix')]
+        self.tokens = [t.lower() for t in self._strings(condition, 'pathContains')]
+        self.resource_types = [t.lower() for t in self._strings(condition, 'resourceTypes')]
+        self.first_party_hosts = [h.lower() for h in self._strings(condition, 'firstPartyHost')]
+        self.query_params = self._string_map(condition, 'queryParams')
+
+        action = self._mapping(data, 'action')
+        self.set_headers = tuple(
+            (name.encode(), value.encode())
+            for name, value in self._string_map(action, 'setHeaders').items()
+        )
+        self.remove_headers = tuple(name.encode() for name in self._strings(action, 'removeHeaders'))
+        redirect = self._mapping(action, 'redirect')
+        self.redirect_url = Template(self._string(redirect, 'url')) if 'url' in redirect else None
+        self.redirect_query = tuple(
+            (name, Template(value)) for name, value in self._string_map(redirect, 'query').items()
+        )
+        sign = self._mapping(redirect, 'sign')
+        if sign:
+            algorithm = self._string(sign, 'algorithm', 'md5')
+            if algorithm not in hashlib.algorithms_available:
+                raise RuleError(f"Rule '{self.id}' uses unknown hash '{algorithm}'")
+            when = sign.get('when')
+            if when is not None and not isinstance(when, str):
+                raise RuleError(f"Rule '{self.id}': 'when' must be a string")
+            self.sign = (self._string(sign, 'param'), algorithm,
+                         Template(self._string(sign, 'template')), when)
+        else:
+            self.sign = None
+        self.block = bool(action.get('block'))
+        self.tag_media = bool(action.get('tagMedia'))
+        self.log = LogCategory.NAMES.get(str(data.get('log', '')).upper(), 0)
+
+    # Schema checks; JSON hands us whatever the user wrote
+    def _mapping(self, data, key):
+        value = data.get(key)
+        if value is None:
+            return {}
+        if not isinstance(value, dict):
+            raise RuleError(f"Rule '{self.id}': '{key}' must be an object")
+        return value
+
+    def _strings(self, data, key):
+        value = data.get(key, [])
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            raise RuleError(f"Rule '{self.id}': '{key}' must be a list of strings")
+        return value
+
+    def _string_map(self, data, key):
+        value = self._mapping(data, key)
+        if not all(isinstance(item, str) for item in value.values()):
+            raise RuleError(f"Rule '{self.id}': values of '{key}' must be strings")
+        return dict(value)
+
+    def _string(self, data, key, default=None):
+        value = data.get(key, default)
+        if not isinstance(value, str):
+            raise RuleError(f"Rule '{self.id}': '{key}' must be a string")
+        return value
+
+    @property
+    def redirects(self):
+        return self.redirect_url is not None or bool(self.redirect_query) or self.sign is not None
+
+    @property
+    def is_dynamic(self):
+        """Rules that depend on the query string or rewrite the URL run per request"""
+        return bool(self.query_params) or self.redirects
+
+    def query_matches(self, query):
+        for name, needle in self.query_params.items():
+            value = query.get(name)
+            if value is None or needle not in value:
+                return False
+        return True
+
+
+class RulePlan:
+    """Everything the static conditions decide for one kind of request"""
+
+    __slots__ = ('headers', 'dynamic', 'block', 'tag_media', 'log', 'rule_ids')
+
+    def __init__(self, rules, extra_headers=()):
+        headers = {}
+        dynamic = []
+        for rule in rules:
+            if rule.is_dynamic:
+                dynamic.append(rule)
+                continue
+            for name, value in rule.set_headers:
+                headers[name] = value
+            for name in rule.remove_headers:
+                headers[name] = b""
+        for name, value in extra_headers:
+            headers[name] = value
+        static = [rule for rule in rules if not rule.is_dynamic]
+        self.headers = tuple(headers.items())
+        # Highest priority first, so the first passing redirect wins
+        self.dynamic = tuple(reversed(dynamic))
+        self.block = any(rule.block for rule in static)
+        self.tag_media = any(rule.tag_media for rule in static)
+        self.log = 0
+        for rule in rules:
+            self.log |= rule.log
+        self.rule_ids = tuple(rule.id for rule in rules)
+
+
+class RuleEngine:
+    """Compiled set of network rules indexed by host
+
+    Every condition is turned into a bitmask over the rules, so matching a
+    request is a few trie lookups and integer ANDs. The result for a given
+    host, resource type, first-party host and set of path tokens is a
+    RulePlan; plans are cached by the caller-supplied HeaderPlanCache.
+    """
+
+    generation = 0
+
+    def __init__(self, rules=()):
+        RuleEngine.generation += 1
+        self.generation = RuleEngine.generation
+        self.rules = sorted(rules, key=lambda r: (r.priority, r.order))
+
+        self._hosts = HostTrie()
+        self._excluded = HostTrie()
+        self._first_party = HostTrie()
+        self._any_host = 0
+        self._needs_first_party = 0
+        self._types = {}
+        self._any_type = 0
+        self._token_rules = {}
+        self._any_token = 0
+
+        tokens = {}
+        for index, rule in enumerate(self.rules):
+            bit = 1 << index
+            if rule.hosts:
+                for host in rule.hosts:
+                    self._hosts.add(host, bit)
+            else:
+                self._any_host |= bit
+            for host in rule.excluded_hosts:
+                self._excluded.add(host, bit)
+            if rule.first_party_hosts:
+                self._needs_first_party |= bit
+                for host in rule.first_party_hosts:
+                    self._first_party.add(host, bit)
+            if rule.resource_types:
+                for name in rule.resource_types:
+                    self._types[name] = self._types.get(name, 0) | bit
+            else:
+                self._any_type |= bit
+            if rule.tokens:
+                for token in rule.tokens:
+                    tokens.setdefault(token, len(tokens))
+                    token_bit = 1 << tokens[token]
+                    self._token_rules[token_bit] = self._token_rules.get(token_bit, 0) | bit
+            else:
+                self._any_token |= bit
+
+        self._tokens = TokenMatcher((token, 1 << index) for token, index in tokens.items())
+
+    @classmethod
+    def from_data(cls, entries, sources=None):
+        """Build an engine from parsed rule dicts; later entries replace earlier ids
+
+        ``sources`` optionally names where each entry came from, for errors.
+        """
+        by_id = {}
+        for order, data in enumerate(entries):
+            try:
+                rule = Rule(data, order)
+            except RuleError as e:
+                if sources is None:
+                    raise
+                raise RuleError(f"{sources[order]}: {e}") from None
+            if data.get('enabled', True):
+                by_id[rule.id] = rule
+            else:
+                by_id.pop(rule.id, None)
+        return cls(by_id.values())
+
+    @classmethod
+    def load(cls, directory=RULES_DIR, defaults=DEFAULT_RULES_PATH):
+        """Load the bundled rules followed by every *.json file in directory"""
+        entries = []
+        sources = []
+        paths = [defaults] if defaults else []
+        if directory and os.path.isdir(directory):
+            try:
+                names = sorted(os.listdir(directory))
+            except OSError as e:
+                raise RuleError(f"Could not list rules in {directory}: {e}")
+            paths.extend(os.path.join(directory, name) for name in names if name.endswith('.json'))
+        for path in paths:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                raise RuleError(f"Could not read rules from {path}: {e}")
+            rules = data.get('rules', []) if isinstance(data, dict) else data
+            if not isinstance(rules, list):
+                raise RuleError(f"{path}: expected a list of rules")
+            entries.extend(rules)
+            sources.extend(f"{path}, rule #{index}" for index in range(len(rules)))
+        return cls.from_data(entries, sources)
+
+    def match(self, host, resource_type='', first_party_host='', path=''):
+        """Get the rules whose static conditions match, lowest priority first"""
+        candidates = (self._hosts.match(host) | self._any_host) & ~self._excluded.match(host)
+        candidates &= self._types.get(resource_type, 0) | self._any_type
+        if candidates & self._needs_first_party:
+            allowed = self._first_party.match(first_party_host) if first_party_host else 0
+            candidates &= allowed | ~self._needs_first_party
+        if candidates & ~self._any_token:
+            candidates &= self._token_mask(self._tokens.match(path))
+        rules = []
+        index = 0
+        while candidates:
+            if candidates & 1:
+                rules.append(self.rules[index])
+            candidates >>= 1
+            index += 1
+        return rules
+
+    def plan(self, host, resource_type='', first_party_host='', path='', extra_headers=()):
+        return RulePlan(self.match(host, resource_type, first_party_host, path), extra_headers)
+
+    def apply(self, info, plans=None, extra_headers=None, request=None):
+        """Apply the rules to a QWebEngineUrlRequestInfo
+
+        ``plans`` is an optional HeaderPlanCache, ``extra_headers`` an optional
+        callable returning headers appended to every new plan, and ``request``
+        the ParsedRequest for info when the caller already has one.
+        """
+        if request is None:
+            request = ParsedRequest.from_info(info)
+        url = request.url
+        host = request.host
+        resource_type = request.resource_type
+        first_party_host = request.first_party_host if self._needs_first_party else ''
+        path = request.path
+
+        token_bits = self._tokens.match(path)
+        key = (self.generation, host, resource_type, first_party_host, token_bits)
+        plan = plans.get(key) if plans is not None else None
+        if plan is None:
+            plan = self.plan(host, resource_type, first_party_host, path,
+                             extra_headers() if extra_headers else ())
+            if plans is not None:
+                plans.put(key, plan)
+
+        for name, value in plan.headers:
+            info.setHttpHeader(name, value)
+
+        blocked = plan.block
+        redirect_url = None
+        media = plan.tag_media
+        if plan.dynamic:
+            context = {'now': int(time.time()), 'url': url, 'query': request.query}
+            for rule in plan.dynamic:
+                if not rule.query_matches(context['query']):
+                    continue
+                for name, value in rule.set_headers:
+                    info.setHttpHeader(name, value)
+                for name in rule.remove_headers:
+                    info.setHttpHeader(name, b"")
+                blocked = blocked or rule.block
+                media = media or rule.tag_media
+                if redirect_url is None and rule.redirects:
+                    redirect_url = self._render_redirect(rule, url, context)
+
+        if plan.log and Logger.enabled(plan.log, LogLevel.INFO):
+            for rule_id in plan.rule_ids:
+                Logger.info(plan.log, "[RULE] %s matched: %s", rule_id, url)
+
+        if blocked:
+            info.block(True)
+            return RuleOutcome(plan, None, True, None)
+        if redirect_url is not None and redirect_url != url:
+            if plan.log:
+                Logger.info(plan.log, "[RULE] Redirecting to: %s", redirect_url)
+            info.redirect(QUrl(redirect_url))
+        else:
+            redirect_url = None
+        media_url = (redirect_url or url) if media else None
+        return RuleOutcome(plan, redirect_url, False, media_url)
+
+    def _token_mask(self, token_bits):
+        """Rules allowed by the path tokens that were found"""
+        mask = self._any_token
+        token_rules = self._token_rules
+        while token_bits:
+            bit = token_bits & -token_bits
+            mask |= token_rules.get(bit, 0)
+            token_bits ^= bit
+        return mask
+
+    @staticmethod
+    def _render_redirect(rule, url, context):
+        """Build the redirect target for a rule"""
+        if rule.redirect_url is not None:
+            target = rule.redirect_url.render(context)
+        else:
+            target = url.partition('#')[0]
+        base, _, query = target.partition('?')
+        params = [p.partition('=') for p in query.split('&') if p]
+        params = [(name, value) for name, _, value in params]
+
+        updates = [(name, template.render(context)) for name, template in rule.redirect_query]
+        if rule.sign:
+            param, algorithm, template, when = rule.sign
+            if not when or context['query'].get(when):
+                query = context['query'].to_dict()
+                query.update(updates)
+                context = dict(context, query=query)
+                digest = hashlib.new(algorithm, template.render(context).encode('utf-8'))
+                updates.append((param, digest.hexdigest()))
+
+        for name, value in updates:
+            for i, (existing, _) in enumerate(params):
+                if existing == name:
+                    params[i] = (name, value)
+                    break
+            else:
+                params.append((name, value))
+        if not params:
+            return base
+        return base + '?' + '&'.join(f"{name}={value}" for name, value in params)
+
+
+class RuleWatcher(QObject):
+    """Watches the rule directory and publishes a freshly compiled engine on change"""
+
+    rulesChanged = pyqtSignal(object)
+
+    def __init__(self, directory=RULES_DIR, parent=None):
+        super().__init__(parent)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._schedule_reload)
+        self.watcher.fileChanged.connect(self._schedule_reload)
+
+        # Editors save in several steps; wait for the burst to settle
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(250)
+        self.reload_timer.timeout.connect(self.reload)
+
+        self._watch_files()
+
+    def _watch_files(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return   # Gone for now; load() reports it
+        paths = [self.directory]
+        paths.extend(os.path.join(self.directory, name) for name in names if name.endswith('.json'))
+        watched = set(self.watcher.files()) | set(self.watcher.directories())
+        new_paths = [p for p in paths if p not in watched]
+        if new_paths:
+            self.watcher.addPaths(new_paths)
+
+    def _schedule_reload(self, path=None):
+        self.reload_timer.start()
+
+    def reload(self):
+        """Recompile the rules; a broken file keeps the previous rules active"""
+        try:
+            self._watch_files()
+            engine = RuleEngine.load(self.directory)
+        except RuleError as e:
+            print(f"❌ [RULES] Keeping previous rules: {e}")
+            return
+        print(f"🔄 [RULES] Reloaded {len(engine.rules)} rules")
+        self.rulesChanged.emit(engine)
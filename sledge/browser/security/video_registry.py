@@ -0,0 +1,147 @@
+import time
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+
+class VideoUrlRegistry:
+    """Bounded, recency-ordered store of intercepted video URLs
+
+    URLs are grouped by the first-party site (scheme and host) that requested
+    them, since that is all a request's first-party URL carries; lookups by a
+    full page URL are reduced to its site the same way. They're deduplicated
+    on a normalized form, so the per-request timestamp/hash parameters don't
+    create a new entry for every refresh. Inserts, lookups of the latest URL
+    and evictions are all O(1). Entries older than ``ttl`` seconds are
+    treated as gone.
+    """
+
+    # Query parameters that change on every request for the same video
+    VOLATILE_PARAMS = ('t', 'h')
+
+    def __init__(self, capacity=512, per_page=64, ttl=1800):
+        self.capacity = capacity
+        self.per_page = per_page
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (page, key) -> (url, timestamp), oldest first
+        self._pages = OrderedDict()    # page -> OrderedDict of keys, oldest first
+
+    def add(self, url, page=''):
+        """Record a video URL for a page, making it the most recent"""
+        page = self.normalize_page(page)
+        entry = (page, self.normalize(url))
+        now = time.monotonic()
+        with self._lock:
+            self._entries[entry] = (url, now)
+            self._entries.move_to_end(entry)
+
+            keys = self._pages.get(page)
+            if keys is None:
+                keys = self._pages[page] = OrderedDict()
+            else:
+                self._pages.move_to_end(page)
+            keys[entry[1]] = None
+            keys.move_to_end(entry[1])
+
+            # Keep one busy page from pushing everything else out
+            if len(keys) > self.per_page:
+                old_key, _ = keys.popitem(last=False)
+                del self._entries[(page, old_key)]
+
+            while len(self._entries) > self.capacity:
+                (old_page, old_key), _ = self._entries.popitem(last=False)
+                self._discard_key(old_page, old_key)
+
+    def latest(self, page=None):
+        """Get the most recent unexpired URL, for one page or overall"""
+        with self._lock:
+            if page is None:
+                if not self._entries:
+                    return None
+                entry = next(reversed(self._entries))
+            else:
+                page = self.normalize_page(page)
+                keys = self._pages.get(page)
+                if not keys:
+                    return None
+                entry = (page, next(reversed(keys)))
+
+            url, added = self._entries[entry]
+            if time.monotonic() - added > self.ttl:
+                # Newest entry is stale, so everything before it is too
+                if page is None:
+                    self._entries.clear()
+                    self._pages.clear()
+                else:
+                    self._drop_page(page)
+                return None
+            return url
+
+    def urls(self, page):
+        """Get the unexpired URLs recorded for a page, newest first"""
+        page = self.normalize_page(page)
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            keys = self._pages.get(page, ())
+            result = []
+            for key in reversed(keys):
+                url, added = self._entries[(page, key)]
+                if added < cutoff:
+                    break
+                result.append(url)
+            return result
+
+    def clear_page(self, page):
+        """Forget every URL recorded for a page"""
+        with self._lock:
+            self._drop_page(self.normalize_page(page))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pages.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def _discard_key(self, page, key):
+        """Remove a key from its page index, dropping empty pages"""
+        keys = self._pages.get(page)
+        if keys is not None:
+            keys.pop(key, None)
+            if not keys:
+                del self._pages[page]
+
+    def _drop_page(self, page):
+        """Remove a page and all of its entries"""
+        keys = self._pages.pop(page, None)
+        if keys:
+            for key in keys:
+                self._entries.pop((page, key), None)
+
+    @staticmethod
+    def normalize_page(page):
+        """Pages are keyed by their site, scheme://host[:port]/"""
+        if not page:
+            return ''
+        parts = urlsplit(page)
+        if not parts.netloc:
+            return page.partition('#')[0]
+        return f"{parts.scheme.lower()}://{parts.netloc.rpartition('@')[2].lower()}/"
+
+    @classmethod
+    def normalize(cls, url):
+        """Strip the fragment and per-request parameters from a URL"""
+        url = url.partition('#')[0]
+        base, sep, query = url.partition('?')
+        if not sep:
+            return base
+        params = [
+            param for param in query.split('&')
+            if param and param.partition('=')[0] not in cls.VOLATILE_PARAMS
+        ]
+        return f"{base}?{'&'.join(params)}" if params else base
@@ -1,6 +1,8 @@
 from .widgets import TabWidget
 from .groups import TabGroup
 from .states import TabState
+from .registry import TabRegistry
+from .model import TabListModel, TabFilterModel
 from .memory import TabMemoryManager, TabMemoryIndicator
 from .ring_menu import RingMenu
 from .dialogs import TabListDialog, TabSpreadDialog
@@ -9,6 +11,9 @@ __all__ = [
     'TabWidget',
     'TabGroup',
     'TabState',
+    'TabRegistry',
+    'TabListModel',
+    'TabFilterModel',
     'TabMemoryManager',
     'TabMemoryIndicator',
     'RingMenu',
@@ -0,0 +1,86 @@
+from collections import namedtuple
+
+from PyQt6.QtCore import QRectF, Qt
+from PyQt6.QtGui import QColor, QFont, QPen
+
+from .states import TabState
+
+# Everything the tab bar draws on top of a tab. Two equal looks paint the
+# same pixels, so comparing looks tells which tab rects need a repaint.
+TabLook = namedtuple('TabLook', 'color representative collapsed count state cursor highlight')
+
+PLAIN_LOOK = TabLook(None, False, False, 0, TabState.ACTIVE, False, False)
+
+STRIP_WIDTH = 4
+DIM_COLOR = QColor(46, 52, 64, 150)
+CURSOR_COLOR = QColor('#ebcb8b')
+HIGHLIGHT_COLOR = QColor(255, 153, 51, 110)
+STATE_COLORS = {
+    TabState.SNOOZED: QColor('#81a1c1'),
+    TabState.FROZEN: QColor('#5e81ac'),
+    TabState.HIBERNATED: QColor('#4c566a'),
+}
+
+
+def tab_look(entry, groups, representatives, collapsed_groups, cursor=False, highlight=False):
+    """The look of a tab from its registry entry and the tab widget's group state"""
+    state = entry.state
+    group = groups.get(entry.group) if entry.group is not None else None
+    if group is None:
+        return TabLook(None, False, False, 0, state, cursor, highlight)
+    representative = representatives.get(entry.group) == entry.id
+    return TabLook(group.color.name(), representative, entry.group in collapsed_groups,
+                   len(group.tabs) if representative else 0, state, cursor, highlight)
+
+
+def paint_tab_look(painter, rect, look, close_width=0):
+    """Draw a look over a tab the style has already painted
+
+    ``close_width`` keeps the count badge clear of the close button.
+    """
+    rect = QRectF(rect)
+    painter.save()
+    painter.setPen(Qt.PenStyle.NoPen)
+
+    if look.state == TabState.HIBERNATED:
+        painter.fillRect(rect, DIM_COLOR)
+
+    if look.color is not None:
+        color = QColor(look.color)
+        if look.representative:
+            tint = QColor(color)
+            tint.setAlpha(70)
+            painter.fillRect(rect, tint)
+            painter.fillRect(QRectF(rect.left(), rect.bottom() - 2, rect.width(), 3), color)
+        else:
+            painter.fillRect(QRectF(rect.left(), rect.top(), STRIP_WIDTH, rect.height()), color)
+
+    if look.representative and look.collapsed and look.count:
+        font = QFont(painter.font())
+        font.setPointSizeF(max(6.0, font.pointSizeF() * 0.75))
+        font.setBold(True)
+        painter.setFont(font)
+        text = str(look.count)
+        width = painter.fontMetrics().horizontalAdvance(text) + 8
+        height = painter.fontMetrics().height()
+        badge = QRectF(rect.right() - close_width - width - 4, rect.top() + 3, width, height)
+        painter.setBrush(QColor(look.color))
+        painter.drawRoundedRect(badge, height / 2, height / 2)
+        painter.setPen(QColor('black'))
+        painter.drawText(badge, Qt.AlignmentFlag.AlignCenter, text)
+        painter.setPen(Qt.PenStyle.NoPen)
+
+    state_color = STATE_COLORS.get(look.state)
+    if state_color is not None:
+        painter.setBrush(state_color)
+        painter.drawEllipse(QRectF(rect.left() + STRIP_WIDTH + 3, rect.bottom() - 8, 5, 5))
+
+    if look.highlight:
+        painter.fillRect(rect, HIGHLIGHT_COLOR)
+
+    if look.cursor:
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.setPen(QPen(CURSOR_COLOR, 2))
+        painter.drawRoundedRect(rect.adjusted(1, 1, -1, -1), 3, 3)
+
+    painter.restore()
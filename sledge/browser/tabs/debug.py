@@ -4,6 +4,8 @@ from PyQt6.QtWidgets import (
     QTextEdit, QScrollArea
 )
 from PyQt6.QtCore import Qt, pyqtSignal
+import os
+import time
 
 class TabDebugPanel(QWidget):
     """Debug panel for testing tab functionality"""
@@ -74,6 +76,19 @@ class TabDebugPanel(QWidget):
         
         layout.addWidget(group_ops)
         
+        # Request Interception Metrics
+        metrics_ops = QGroupBox("Request Interception")
+        metrics_layout = QHBoxLayout(metrics_ops)
+        
+        dump_metrics_btn = QPushButton("Dump Metrics")
+        dump_metrics_btn.clicked.connect(self._dump_metrics)
+        reset_metrics_btn = QPushButton("Reset Metrics")
+        reset_metrics_btn.clicked.connect(self._reset_metrics)
+        
+        metrics_layout.addWidget(dump_metrics_btn)
+        metrics_layout.addWidget(reset_metrics_btn)
+        layout.addWidget(metrics_ops)
+        
         # State Display
         state_group = QGroupBox("Current State")
         state_layout = QVBoxLayout(state_group)
@@ -94,6 +109,10 @@ class TabDebugPanel(QWidget):
         self.tab_widget.currentChanged.connect(self._update_tab_range)
         self._update_tab_range()
         
+        # CPU governor decisions show up as they happen
+        self.tab_widget.memory_manager.governor.decision.connect(
+            lambda line: self.state_display.append(f"[governor] {line}"))
+        
         # Initial state refresh
         self.refresh_state()
     
@@ -109,19 +128,87 @@ class TabDebugPanel(QWidget):
         except ValueError:
             self.state_display.append("Error: Invalid tab indices format")
     
+    def _interceptor_metrics(self):
+        """Metrics of the browser's request interceptor, if there is one"""
+        browser = self.tab_widget.window()
+        interceptor = getattr(browser, 'request_interceptor', None)
+        return getattr(interceptor, 'metrics', None)
+    
+    def _interceptor_filters(self):
+        """Network filter engine of the browser's request interceptor, if there is one"""
+        browser = self.tab_widget.window()
+        interceptor = getattr(browser, 'request_interceptor', None)
+        return getattr(interceptor, 'filters', None)
+    
+    def _dump_metrics(self):
+        """Write the interceptor metrics to ~/.sledge/metrics as JSON"""
+        metrics = self._interceptor_metrics()
+        if metrics is None:
+            self.state_display.append("Error: No request interceptor metrics available")
+            return
+        try:
+            directory = os.path.expanduser('~/.sledge/metrics')
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, time.strftime('interceptor-%Y%m%d-%H%M%S.json'))
+            metrics.to_json(path)
+            self.state_display.append(f"Metrics written to {path}")
+            filters = self._interceptor_filters()
+            if filters is not None:
+                path = os.path.join(directory, time.strftime('filters-%Y%m%d-%H%M%S.json'))
+                filters.to_json(path)
+                self.state_display.append(f"Filter stats written to {path}")
+        except OSError as e:
+            self.state_display.append(f"Error: Could not write metrics: {e}")
+    
+    def _reset_metrics(self):
+        """Clear the interceptor metrics"""
+        metrics = self._interceptor_metrics()
+        if metrics is not None:
+            metrics.reset()
+        self.refresh_state()
+    
     def refresh_state(self):
         """Update the state display"""
         state = []
         state.append("=== Tab Widget State ===")
         state.append(f"Total Tabs: {self.tab_widget.count()}")
         state.append(f"Current Index: {self.tab_widget.currentIndex()}")
-        state.append(f"Hibernated Tabs: {list(self.tab_widget.hibernated_tabs.keys())}")
+        registry = self.tab_widget.registry
+        state.append(f"Hibernated Tabs: {[registry.index_of(tab_id) for tab_id in self.tab_widget.hibernated_tabs]}")
         state.append(f"Hibernation Pending: {list(self.tab_widget.hibernation_pending)}")
-        state.append(f"Restoration Pending: {list(self.tab_widget.restoration_pending)}")
+        state.append(f"Restoration Pending: {[registry.index_of(tab_id) for tab_id in self.tab_widget.restoration_pending]}")
         state.append("\n=== Groups ===")
         for group, tabs in self.tab_widget.groups.items():
-            state.append(f"Group '{group}': {[i for i in range(self.tab_widget.count()) if self.tab_widget.tab_groups.get(i) == group]}")
+            state.append(f"Group '{group}': {self.tab_widget.group_indexes(group)}")
             if group in self.tab_widget.group_representatives:
-                state.append(f"  Representative: {self.tab_widget.group_representatives[group]}")
+                state.append(f"  Representative: {self.tab_widget.representative_index(group)}")
+        
+        memory_manager = self.tab_widget.memory_manager
+        scheduler = memory_manager.scheduler
+        state.append("\n=== Memory ===")
+        state.append(f"Eviction Policy: {scheduler.policy.name} ({len(scheduler.heap)} candidates)")
+        state.append(f"Threshold: {memory_manager.memory_threshold}% -> target {memory_manager.memory_target}%")
+        state.append(f"Pressure: level {memory_manager.pressure.level} via {memory_manager.pressure.source}")
+        loads = memory_manager.loads
+        state.append(f"Loads: {len(loads.in_flight)} in flight, {len(loads)} queued (limit {loads.limit})")
+        store = memory_manager.store
+        state.append(f"Hibernated Store: {len(store)} tabs, {store.resident_bytes() / 1024:.1f}KB resident, "
+                     f"{store.disk_bytes() / 1024:.1f}KB on disk")
+        
+        governor = memory_manager.governor
+        state.append("\n=== CPU Governor ===")
+        state.append(f"Budget: {governor.budget:.0f}% of a core for {governor.strikes} samples, "
+                     f"frozen: {[registry.index_of(tab_id) for tab_id in governor.frozen]}")
+        state.extend(list(governor.log)[-10:])
+        
+        metrics = self._interceptor_metrics()
+        if metrics is not None:
+            state.append("\n=== Request Interception ===")
+            state.extend(metrics.summary())
+        
+        filters = self._interceptor_filters()
+        if filters is not None:
+            state.append("\n=== Network Filters ===")
+            state.extend(filters.summary())
         
         self.state_display.setPlainText('\n'.join(state)) 
\ No newline at end of file
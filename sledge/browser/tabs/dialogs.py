@@ -1,8 +1,9 @@
-from PyQt6.QtWidgets import QSplitter,QDialog, QColorDialog,QDialogButtonBox, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QComboBox, QLabel, QTreeWidget, QTreeWidgetItem, QScrollArea, QFrame, QWidget, QGridLayout, QFileDialog, QMenu, QMainWindow, QSizePolicy
+from PyQt6.QtWidgets import QSplitter,QDialog, QTreeView, QAbstractItemView, QColorDialog,QDialogButtonBox, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QComboBox, QLabel, QTreeWidget, QTreeWidgetItem, QScrollArea, QFrame, QWidget, QGridLayout, QFileDialog, QMenu, QMainWindow, QSizePolicy
 from PyQt6.QtGui import QColor, QEventPoint
 from PyQt6.QtCore import Qt, QPoint, QPropertyAnimation, QSize, QEvent, QRect 
-import psutil
 from .states import TabState
+from .model import UNGROUPED, TabFilterModel, TabListModel, TabRoles
+from .spread_view import TabSpreadView
 from PyQt6.QtCore import pyqtSignal
 
 class PopoutWindow(QMainWindow):
@@ -288,10 +289,16 @@ class TabListDialog(QDialog):
         self.group_tree.itemSelectionChanged.connect(self.on_group_selected)
         splitter.addWidget(self.group_tree)
 
-        # Tab list
-        self.tab_list = QTreeWidget()
-        self.tab_list.setHeaderLabels(["Title", "URL", "Status"])
-        self.tab_list.setColumnWidth(0, 300)
+        # Tab list, a filtered view of the tab widget's model
+        self.tab_filter = TabFilterModel(self.tab_widget.tab_model, self)
+        self.tab_list = QTreeView()
+        self.tab_list.setModel(self.tab_filter)
+        self.tab_list.setRootIsDecorated(False)
+        self.tab_list.setUniformRowHeights(True)
+        self.tab_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.tab_list.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tab_list.setColumnHidden(TabListModel.GROUP, True)
+        self.tab_list.setColumnWidth(TabListModel.TITLE, 300)
         splitter.addWidget(self.tab_list)
 
         # Buttons
@@ -346,6 +353,7 @@ class TabListDialog(QDialog):
         
         # Add "Ungrouped" item
         ungrouped = QTreeWidgetItem(["Ungrouped"])
+        ungrouped.setData(0, Qt.ItemDataRole.UserRole, UNGROUPED)
         self.group_tree.addTopLevelItem(ungrouped)
         
         def add_group_item(group, parent_item=None):
@@ -370,32 +378,16 @@ class TabListDialog(QDialog):
                 add_group_item(group)
 
     def populate_tabs(self, group=None, search_text=None):
-        """Populate tab list based on selected group and search"""
-        self.tab_list.clear()
-        
-        for i in range(self.tab_widget.count()):
-            tab = self.tab_widget.widget(i)
-            title = self.tab_widget.tabText(i)
-            url = tab.url().toString() if hasattr(tab, 'url') else ""
-            
-            # Check if tab belongs to selected group - Fixed reference
-            tab_group = self.tab_widget.tab_groups.get(i)
-            
-            if ((group is None or tab_group == group.name) and
-                (not search_text or 
-                 search_text.lower() in title.lower() or 
-                 search_text.lower() in url.lower())):
-                
-                item = QTreeWidgetItem([title, url])
-                item.setData(0, Qt.ItemDataRole.UserRole, i)
-                
-                # Add status indicator - Fixed reference
-                status = "Active"
-                if self.tab_widget.memory_manager.states.get(i) == TabState.SNOOZED:
-                    status = "Snoozed 💤"
-                item.setText(2, status)
-                
-                self.tab_list.addTopLevelItem(item)
+        """Show the tabs of a group (a TabGroup, UNGROUPED or None for all) matching search"""
+        self.tab_filter.set_group(getattr(group, 'name', group))
+        self.tab_filter.set_text(search_text or '')
+
+    def selected_tabs(self):
+        """Current indexes of the selected tabs, in tab order"""
+        registry = self.tab_widget.registry
+        rows = self.tab_list.selectionModel().selectedRows()
+        indexes = (registry.index_of(row.data(TabRoles.TAB_ID)) for row in rows)
+        return sorted(index for index in indexes if index >= 0)
 
     def filter_tabs(self):
         """Filter tabs based on search text"""
@@ -475,10 +467,9 @@ class TabListDialog(QDialog):
         
         action = menu.exec(self.tab_list.mapToGlobal(position))
         if action == popout:  # Handle popout action
-            selected_items = self.tab_list.selectedItems()
-            if selected_items:
-                tab_index = selected_items[0].data(0, Qt.ItemDataRole.UserRole)
-                self.popout_tab(tab_index)
+            selected = self.selected_tabs()
+            if selected:
+                self.popout_tab(selected[0])
                 
     def popout_tab(self, tab_index):
         """Create a popout window for the selected tab"""
@@ -495,19 +486,23 @@ class TabListDialog(QDialog):
         group_counts = {}
         total_tabs = self.tab_widget.count()
         active_tabs = sum(1 for i in range(total_tabs) 
-                         if self.tab_widget.memory_manager.states.get(i) == TabState.ACTIVE)
+                         if self.tab_widget.memory_manager.state_of(i) == TabState.ACTIVE)
         
         
         for i in range(total_tabs):
-            group = self.tab_widget.tab_groups.get(i, "Ungrouped")
+            group = (self.tab_widget.group_of(i) or "Ungrouped")
             group_counts[group] = group_counts.get(group, 0) + 1
         
+        # Last reading of the shared metrics sampler
+        snapshot = self.tab_widget.memory_manager.metrics.latest()
+        memory = (snapshot.rss + snapshot.renderer_rss) / 1024 / 1024 if snapshot else 0
+        
         # Create stats display
         stats_text = f"""
         Total Tabs: {total_tabs}
         Active Tabs: {active_tabs}
         Snoozed Tabs: {total_tabs - active_tabs}
-        Memory Usage: {psutil.Process().memory_info().rss / 1024 / 1024:.1f} MB
+        Memory Usage: {memory:.1f} MB
         
         Tabs by Group:
         {'-' * 20}
@@ -522,8 +517,8 @@ class TabListDialog(QDialog):
 
     def export_tabs(self):
         """Export tabs to various formats"""
-        selected_items = self.tab_list.selectedItems()
-        if not selected_items:
+        selected_tabs = self.selected_tabs()
+        if not selected_tabs:
             return
             
         export_dialog = QDialog(self)
@@ -544,7 +539,7 @@ class TabListDialog(QDialog):
                 filter=f"*.{fmt.lower().split()[0]}"
             )
             if path:
-                self.export_tabs_to_file(path, fmt, selected_items)
+                self.export_tabs_to_file(path, fmt, selected_tabs)
         
         export_btn.clicked.connect(do_export)
         export_dialog.exec()
@@ -556,21 +551,21 @@ class TabListDialog(QDialog):
 
     def duplicate_selected(self):
         """Duplicate selected tabs"""
-        selected_items = self.tab_list.selectedItems()
-        for item in selected_items:
-            tab_index = item.data(0, Qt.ItemDataRole.UserRole)
+        for tab_index in self.selected_tabs():
             tab = self.tab_widget.widget(tab_index)
             if hasattr(tab, 'url'):
-                new_index = self.tab_widget.add_new_tab(tab.url())
+                # Open in the background; the load scheduler paces the navigations
+                view = self.tab_widget.parent().create_web_view()
+                new_index = self.tab_widget.addTab(view, self.tab_widget.tabText(tab_index))
+                self.tab_widget.load_later(new_index, tab.url())
                 # Copy group assignment if any
-                group = self.tab_widget.tab_groups.get(tab_index)
+                group = self.tab_widget.group_of(tab_index)
                 if group:
                     self.tab_widget.addTabToGroup(new_index, group)
 
     def move_to_group(self):
         """Move selected tabs to a different group"""
-        selected_items = self.tab_list.selectedItems()
-        if not selected_items:
+        if not self.selected_tabs():
             return
             
         menu = QMenu(self)
@@ -588,80 +583,85 @@ class TabListDialog(QDialog):
 
     def _do_move_to_group(self, group_name):
         """Actually move the selected tabs to the group"""
-        for item in self.tab_list.selectedItems():
-            tab_index = item.data(0, Qt.ItemDataRole.UserRole)
+        # By ID: regrouping may reorder the tabs
+        registry = self.tab_widget.registry
+        for tab_id in [registry.id_at(index) for index in self.selected_tabs()]:
+            tab_index = registry.index_of(tab_id)
             if group_name:
                 self.tab_widget.addTabToGroup(tab_index, group_name)
             else:
                 # Remove from current group
                 self.tab_widget.remove_from_group(tab_index)
-        self.populate_tabs()
 
     def snooze_selected(self):
         """Snooze selected tabs"""
-        selected_items = self.tab_list.selectedItems()
-        for item in selected_items:
-            tab_index = item.data(0, Qt.ItemDataRole.UserRole)
+        # The list follows the state change by itself
+        for tab_index in self.selected_tabs():
             self.tab_widget.memory_manager.snooze_tab(tab_index)
-        self.populate_tabs()  # Refresh the list
 
 class TabSpreadDialog(QDialog):
+    """Overview of all tabs as a grid of thumbnails, filterable by group and text"""
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Tab Spread")
         self.setModal(True)
+        self.resize(900, 640)
         
         # Create main layout
         self.layout = QVBoxLayout(self)
         
-        # Create scroll area
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.layout.addWidget(self.scroll_area)
+        # Filters: search text and group
+        filter_layout = QHBoxLayout()
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Search tabs...")
+        self.search.installEventFilter(self)
+        filter_layout.addWidget(self.search)
+        self.group_combo = QComboBox()
+        filter_layout.addWidget(self.group_combo)
+        self.layout.addLayout(filter_layout)
         
-        # Create container widget for grid
-        self.container = QWidget()
-        self.scroll_area.setWidget(self.container)
+        # Grid of tab tiles over the shared tab model
+        self.view = TabSpreadView(parent, self)
+        self.view.tab_selected.connect(self._handle_preview_click)
+        self.layout.addWidget(self.view)
         
-        # Create grid layout
-        self.grid_layout = QGridLayout(self.container)
-        self.grid_layout.setSpacing(10)
+        self.search.textChanged.connect(self.view.set_text)
+        self.group_combo.currentIndexChanged.connect(
+            lambda _: self.view.set_group(self.group_combo.currentData()))
         
         # Add close button
         self.close_button = QPushButton("Close")
         self.close_button.clicked.connect(self.close)
         self.layout.addWidget(self.close_button)
         
-    def populate_spread(self):
-        """Populate the spread with tab previews"""
-        # Clear existing items
-        for i in reversed(range(self.grid_layout.count())):
-            self.grid_layout.itemAt(i).widget().deleteLater()
-        
-        # Get tab widget
+    def populate_spread(self, group_filter=None):
+        """Reset the filters and put the cursor on the current tab; the tiles come from the model"""
         tab_widget = self.parent()
         if not tab_widget:
             return
+        
+        self.group_combo.blockSignals(True)
+        self.group_combo.clear()
+        self.group_combo.addItem("All Tabs", None)
+        self.group_combo.addItem("Ungrouped", UNGROUPED)
+        for name in tab_widget.groups:
+            self.group_combo.addItem(name, name)
+        self.group_combo.setCurrentIndex(max(0, self.group_combo.findData(group_filter)))
+        self.group_combo.blockSignals(False)
+        
+        self.search.clear()
+        self.view.set_group(group_filter)
+        self.view.select_tab(tab_widget.currentIndex())
+        self.view.setFocus()
             
-        # Calculate grid dimensions
-        tab_count = tab_widget.count()
-        cols = min(4, tab_count)  # Max 4 columns
-        rows = (tab_count + cols - 1) // cols  # Ceiling division
-        
-        # Add tab previews
-        for i in range(tab_count):
-            tab = tab_widget.widget(i)
-            if not tab:
-                continue
-                
-            # Create preview widget
-            preview = TabPreviewWidget(tab)
-            preview.clicked.connect(lambda idx=i: self._handle_preview_click(idx))
-            
-            # Add to grid
-            row = i // cols
-            col = i % cols
-            self.grid_layout.addWidget(preview, row, col)
+    def eventFilter(self, obj, event):
+        """Arrow keys in the search box move on to the grid"""
+        if (obj is self.search and event.type() == QEvent.Type.KeyPress
+                and event.key() in (Qt.Key.Key_Down, Qt.Key.Key_Up)):
+            self.view.setFocus()
+            return True
+        return super().eventFilter(obj, event)
             
     def _handle_preview_click(self, index):
         """Handle preview click by switching to tab and closing dialog"""
@@ -669,42 +669,3 @@ class TabSpreadDialog(QDialog):
         if tab_widget:
             tab_widget.setCurrentIndex(index)
         self.close()
-
-class TabPreviewWidget(QWidget):
-    clicked = pyqtSignal()
-    
-    def __init__(self, tab, parent=None):
-        super().__init__(parent)
-        self.setMinimumSize(200, 150)
-        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        
-        layout = QVBoxLayout(self)
-        
-        # Add title label
-        title = tab.windowTitle() or "Untitled"
-        title_label = QLabel(title)
-        title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(title_label)
-        
-        # Add preview (if available)
-        if hasattr(tab, 'grab'):
-            preview = tab.grab().scaled(180, 120, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            preview_label = QLabel()
-            preview_label.setPixmap(preview)
-            preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            layout.addWidget(preview_label)
-        
-        self.setStyleSheet("""
-            QWidget {
-                background: #2e3440;
-                border-radius: 8px;
-                padding: 8px;
-            }
-            QLabel {
-                color: #d8dee9;
-            }
-        """)
-        
-    def mousePressEvent(self, event):
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.clicked.emit()
\ No newline at end of file
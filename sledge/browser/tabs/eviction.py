@@ -0,0 +1,291 @@
+import time
+
+from .states import TabState
+
+UNSAMPLED_TAB_BYTES = 100 << 20   # Assumed for a tab whose renderer hasn't been sampled yet
+
+
+class IndexedHeap:
+    """Binary min-heap of (score, key) with O(log n) update and removal by key"""
+
+    def __init__(self):
+        self._heap = []         # [score, key] pairs
+        self._positions = {}    # key -> index in _heap
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def score(self, key):
+        return self._heap[self._positions[key]][0]
+
+    def push(self, key, score):
+        """Insert a key, or move it if it's already queued"""
+        position = self._positions.get(key)
+        if position is not None:
+            old = self._heap[position][0]
+            self._heap[position][0] = score
+            if score < old:
+                self._sift_up(position)
+            elif old < score:
+                self._sift_down(position)
+            return
+        self._heap.append([score, key])
+        self._positions[key] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def peek(self):
+        """(score, key) with the lowest score"""
+        score, key = self._heap[0]
+        return score, key
+
+    def pop(self):
+        """Remove and return the (score, key) with the lowest score"""
+        score, key = self._heap[0]
+        self.remove(key)
+        return score, key
+
+    def remove(self, key):
+        """Drop a key; unknown keys are ignored"""
+        position = self._positions.pop(key, None)
+        if position is None:
+            return
+        last = self._heap.pop()
+        if position < len(self._heap):
+            self._heap[position] = last
+            self._positions[last[1]] = position
+            self._sift_up(position)
+            self._sift_down(self._positions[last[1]])
+
+    def _sift_up(self, position):
+        heap = self._heap
+        item = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if not item[0] < heap[parent][0]:
+                break
+            heap[position] = heap[parent]
+            self._positions[heap[position][1]] = position
+            position = parent
+        heap[position] = item
+        self._positions[item[1]] = position
+
+    def _sift_down(self, position):
+        heap = self._heap
+        size = len(heap)
+        item = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if not heap[child][0] < item[0]:
+                break
+            heap[position] = heap[child]
+            self._positions[heap[position][1]] = position
+            position = child
+        heap[position] = item
+        self._positions[item[1]] = position
+
+
+class EvictionPolicy:
+    """Orders tabs for hibernation; the lowest score goes first
+
+    A score may only depend on the tab's registry entry (and the scheduler's
+    context), so it only has to be recomputed when that entry changes.
+    """
+
+    name = ''
+
+    def score(self, entry, scheduler):
+        raise NotImplementedError
+
+    def evicted(self, entry, score):
+        """Called for every tab the scheduler picks"""
+
+    def forget(self, tab_id):
+        """Called when a tab leaves the scheduler"""
+
+
+class LRUPolicy(EvictionPolicy):
+    """Least recently used first"""
+
+    name = 'lru'
+
+    def score(self, entry, scheduler):
+        return entry.last_accessed.timestamp()
+
+
+class LFUPolicy(EvictionPolicy):
+    """Least frequently used first, least recently used among equals"""
+
+    name = 'lfu'
+
+    def score(self, entry, scheduler):
+        return (entry.access_count, entry.last_accessed.timestamp())
+
+
+class SizeWeightedPolicy(EvictionPolicy):
+    """GreedyDual-Size: big tabs that haven't been used for a while go first
+
+    Every tab is worth ``inflation + 1 / size_in_MB``, where inflation is the
+    value of the last tab evicted at the time the tab was last used. Using a
+    tab lifts it above everything evicted so far and big tabs stay cheap to
+    evict, without scores having to age with the clock.
+    """
+
+    name = 'size'
+
+    def __init__(self):
+        self.inflation = 0.0
+        self._seen = {}  # tab_id -> (last_accessed, inflation at that access)
+
+    def score(self, entry, scheduler):
+        seen = self._seen.get(entry.id)
+        if seen is None or seen[0] != entry.last_accessed:
+            seen = self._seen[entry.id] = (entry.last_accessed, self.inflation)
+        return seen[1] + (1 << 20) / max(entry.memory, 1 << 16)
+
+    def evicted(self, entry, score):
+        self.inflation = max(self.inflation, score)
+
+    def forget(self, tab_id):
+        self._seen.pop(tab_id, None)
+
+
+class GroupAwarePolicy(EvictionPolicy):
+    """Another policy, ranked by group first
+
+    Tabs hidden in collapsed groups go before other tabs, and tabs in the same
+    group as the current tab go last.
+    """
+
+    name = 'group'
+
+    HIDDEN, OTHER, CURRENT_GROUP = range(3)
+
+    def __init__(self, base=None):
+        self.base = base or LRUPolicy()
+
+    def score(self, entry, scheduler):
+        if entry.group and entry.group == scheduler.current_group:
+            rank = self.CURRENT_GROUP
+        elif entry.group and entry.group in scheduler.collapsed_groups:
+            rank = self.HIDDEN
+        else:
+            rank = self.OTHER
+        return (rank, self.base.score(entry, scheduler))
+
+    def evicted(self, entry, score):
+        self.base.evicted(entry, score[1])
+
+    def forget(self, tab_id):
+        self.base.forget(tab_id)
+
+
+POLICIES = {
+    'lru': LRUPolicy,
+    'lfu': LFUPolicy,
+    'size': SizeWeightedPolicy,
+    'group': GroupAwarePolicy,
+}
+
+
+class EvictionScheduler:
+    """Picks which tabs to hibernate to get back under a memory budget
+
+    Tabs that could be hibernated sit in an IndexedHeap ordered by the
+    policy's score. The scheduler listens to the TabRegistry and only
+    rescores tabs whose entry changed since the last pick.
+
+    ``is_evictable`` is checked when a tab comes off the heap, so conditions
+    that change without touching the entry (keep-active groups, the current
+    tab) don't need rescoring. Tabs used less than ``min_idle`` seconds ago
+    are skipped too, so a tab that was just woken isn't hibernated again on
+    the next pass.
+
+    A tab's memory is 0 until the renderer sampler has seen it; such tabs
+    count as ``memory_estimate()`` bytes so one pass can't take every tab.
+    No pass hibernates more than ``max_per_pass`` tabs either.
+    """
+
+    def __init__(self, registry, policy=None, is_evictable=None, group_members=None, min_idle=300,
+                 max_per_pass=8, memory_estimate=None):
+        self.registry = registry
+        self.policy = policy or GroupAwarePolicy()
+        self.is_evictable = is_evictable or (lambda entry: True)
+        self.group_members = group_members or (lambda group: ())
+        self.min_idle = min_idle
+        self.max_per_pass = max_per_pass
+        self.memory_estimate = memory_estimate or (lambda: UNSAMPLED_TAB_BYTES)
+        self.current_group = None
+        self.collapsed_groups = set()
+        self.heap = IndexedHeap()
+        self._dirty = set(registry)
+        registry.subscribe(self.mark_dirty)
+
+    def mark_dirty(self, tab_id):
+        """Rescore a tab before the next pick"""
+        self._dirty.add(tab_id)
+
+    def set_policy(self, policy):
+        """Switch policies and rescore every tab"""
+        self.policy = policy
+        self.heap = IndexedHeap()
+        self._dirty = set(self.registry)
+
+    def set_current_group(self, group):
+        """Follow the current tab's group; only the two groups involved are rescored"""
+        if group != self.current_group:
+            for name in (self.current_group, group):
+                if name:
+                    self._dirty.update(self.group_members(name))
+            self.current_group = group
+
+    def group_changed(self, group):
+        """Rescore a group's tabs, e.g. after it was collapsed or expanded"""
+        self._dirty.update(self.group_members(group))
+
+    def refresh(self):
+        """Rescore the tabs that changed; returns how many were rescored"""
+        dirty, self._dirty = self._dirty, set()
+        for tab_id in dirty:
+            entry = self.registry.entry(tab_id)
+            if entry is None or entry.state == TabState.HIBERNATED:
+                self.heap.remove(tab_id)
+                self.policy.forget(tab_id)
+            else:
+                self.heap.push(tab_id, self.policy.score(entry, self))
+        return len(dirty)
+
+    def select(self, to_free):
+        """Entries to hibernate, lowest score first, until their memory covers to_free bytes"""
+        self.refresh()
+        now = time.time()
+        selected = []
+        skipped = []
+        freed = 0
+        estimate = None
+        while self.heap and freed < to_free and len(selected) < self.max_per_pass:
+            score, tab_id = self.heap.pop()
+            entry = self.registry.entry(tab_id)
+            if (now - entry.last_accessed.timestamp() < self.min_idle
+                    or not self.is_evictable(entry)):
+                skipped.append((tab_id, score))
+                continue
+            self.policy.evicted(entry, score)
+            selected.append(entry)
+            if entry.memory:
+                freed += entry.memory
+            else:
+                if estimate is None:
+                    estimate = self.memory_estimate()
+                freed += estimate
+        for tab_id, score in skipped:
+            self.heap.push(tab_id, score)
+        # Picked tabs drop out once hibernated; any that weren't come back on refresh
+        self._dirty.update(entry.id for entry in selected)
+        return selected
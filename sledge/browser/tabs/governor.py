@@ -0,0 +1,76 @@
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from .states import TabState
+
+
+class CpuGovernor(QObject):
+    """Freezes background tabs that keep burning CPU
+
+    Fed per-tab CPU readings (percent of one core, see
+    RendererMemorySampler.cpu_sampled). A tab that stays over ``budget`` for
+    ``strikes`` samples in a row is frozen with ``freeze(entry)``, provided
+    ``can_freeze(entry)`` agrees: the caller decides about the current tab,
+    audible media, keep-active groups and the page's recommendedState.
+
+    Decisions are kept in ``log`` and announced through ``decision``.
+    """
+
+    decision = pyqtSignal(str)
+
+    def __init__(self, registry, freeze, can_freeze=None, budget=30.0, strikes=2, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.freeze = freeze
+        self.can_freeze = can_freeze or (lambda entry: True)
+        self.budget = budget
+        self.strikes = strikes
+        self.enabled = True
+        self.frozen = set()     # Tabs this governor froze
+        self.log = deque(maxlen=50)
+        self._over = {}         # tab_id -> samples over budget in a row
+
+    def sampled(self, per_tab):
+        """Take a CPU sample; returns the IDs of the tabs frozen"""
+        over = {}
+        for tab_id, percent in per_tab.items():
+            if percent > self.budget:
+                over[tab_id] = self._over.get(tab_id, 0) + 1
+        self._over = over
+        if not self.enabled:
+            return []
+
+        frozen = []
+        for tab_id, count in list(over.items()):
+            if count < self.strikes:
+                continue
+            entry = self.registry.entry(tab_id)
+            if entry is None or entry.state != TabState.ACTIVE:
+                continue
+            if not self.can_freeze(entry):
+                continue
+            self.freeze(entry)
+            self.frozen.add(tab_id)
+            del self._over[tab_id]
+            frozen.append(tab_id)
+            self._record(f"froze tab {entry.index} ({per_tab[tab_id]:.0f}% CPU) {entry.title or entry.url}")
+        return frozen
+
+    def thawed(self, tab_id, reason):
+        """Note that a tab this governor froze is active again"""
+        if tab_id in self.frozen:
+            self.frozen.discard(tab_id)
+            entry = self.registry.entry(tab_id)
+            index = entry.index if entry is not None else -1
+            self._record(f"thawed tab {index} ({reason})")
+
+    def forget(self, tab_id):
+        self.frozen.discard(tab_id)
+        self._over.pop(tab_id, None)
+
+    def _record(self, message):
+        line = f"{time.strftime('%H:%M:%S')} {message}"
+        self.log.append(line)
+        self.decision.emit(line)
@@ -0,0 +1,134 @@
+import itertools
+import os
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from .eviction import IndexedHeap
+from .pressure import PressureLevel
+
+
+class LoadPriority:
+    FOREGROUND = 0   # The current tab: never waits
+    SAME_GROUP = 1   # Tabs in the current tab's group
+    BACKGROUND = 2
+
+
+class LoadScheduler(QObject):
+    """Limits how many tab navigations run at once
+
+    Bulk operations (waking a group, restoring a session, duplicating tabs)
+    hand each tab's load to schedule() instead of starting it. Queued loads
+    wait in an IndexedHeap ordered by (priority class, arrival), and the next
+    one is admitted when a running load's view emits loadFinished or its
+    timeout expires. Foreground loads start right away regardless of the
+    limit.
+
+    Under memory pressure only one background load runs at a time, and none
+    while pressure is critical.
+    """
+
+    started = pyqtSignal(int)    # Tab ID
+    finished = pyqtSignal(int)   # Tab ID
+    idle = pyqtSignal()
+
+    def __init__(self, registry, priority_of=None, max_in_flight=None, timeout=15000, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.priority_of = priority_of or (lambda tab_id: LoadPriority.BACKGROUND)
+        self.max_in_flight = max_in_flight or os.cpu_count() or 4
+        self.timeout = timeout
+        self.pressure = PressureLevel.NONE
+        self.queue = IndexedHeap()
+        self._starts = {}       # tab_id -> start callable
+        self._in_flight = {}    # tab_id -> (view, timer)
+        self._order = itertools.count()
+
+    def __len__(self):
+        return len(self.queue)
+
+    @property
+    def in_flight(self):
+        """Tab IDs whose load has started and not finished yet"""
+        return list(self._in_flight)
+
+    @property
+    def limit(self):
+        """Background loads allowed at once at the current pressure"""
+        if self.pressure >= PressureLevel.CRITICAL:
+            return 0
+        if self.pressure >= PressureLevel.MODERATE:
+            return 1
+        return self.max_in_flight
+
+    def schedule(self, tab_id, start):
+        """Queue a tab's load
+
+        start() begins the navigation and returns the view whose loadFinished
+        ends it, or None when there turned out to be nothing to load.
+        """
+        self._starts[tab_id] = start
+        self.queue.push(tab_id, (self.priority_of(tab_id), next(self._order)))
+        self._admit()
+
+    def cancel(self, tab_id):
+        """Drop a tab's load, e.g. because the tab was closed, hibernated or loaded directly
+
+        A load already running stops counting against the limit.
+        """
+        self.queue.remove(tab_id)
+        self._starts.pop(tab_id, None)
+        self._finish(tab_id)
+
+    def reprioritize(self):
+        """Recompute priority classes after the current tab changed, keeping arrival order"""
+        for tab_id in list(self._starts):
+            _, order = self.queue.score(tab_id)
+            self.queue.push(tab_id, (self.priority_of(tab_id), order))
+        self._admit()
+
+    def set_pressure(self, level):
+        self.pressure = level
+        self._admit()
+
+    def _admit(self):
+        while self.queue:
+            (priority, _), tab_id = self.queue.peek()
+            if priority != LoadPriority.FOREGROUND and len(self._in_flight) >= self.limit:
+                return
+            self.queue.pop()
+            start = self._starts.pop(tab_id)
+            if tab_id in self.registry:
+                self._start(tab_id, start)
+
+    def _start(self, tab_id, start):
+        try:
+            view = start()
+        except RuntimeError as e:
+            # Typically the view was deleted under a load nobody cancelled
+            print(f"Error starting load of tab {tab_id}: {e}")
+            return
+        if view is None:
+            return
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._finish(tab_id))
+        timer.start(self.timeout)
+        connection = view.loadFinished.connect(lambda ok: self._finish(tab_id))
+        self._in_flight[tab_id] = (view, timer, connection)
+        self.started.emit(tab_id)
+
+    def _finish(self, tab_id):
+        flight = self._in_flight.pop(tab_id, None)
+        if flight is None:
+            return  # Already finished or timed out
+        view, timer, connection = flight
+        timer.stop()
+        timer.deleteLater()
+        try:
+            view.loadFinished.disconnect(connection)
+        except (RuntimeError, TypeError):
+            pass  # View already gone with its tab
+        self.finished.emit(tab_id)
+        self._admit()
+        if not self._in_flight and not self.queue:
+            self.idle.emit()
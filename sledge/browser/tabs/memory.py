@@ -1,77 +1,184 @@
-from PyQt6.QtCore import Qt, QTimer, QUrl
+from PyQt6.QtCore import Qt, QTimer, QUrl, pyqtSignal
+from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QCheckBox
 from PyQt6.QtWebEngineCore import QWebEnginePage
-from PyQt6.QtWebEngineWidgets import QWebEngineView
 from datetime import datetime
-import psutil
+import heapq
+import time
 from .states import TabState
+from .renderers import RendererMemorySampler, MetricsFeed
+from .eviction import EvictionScheduler, POLICIES, UNSAMPLED_TAB_BYTES
+from .snapshots import TabSnapshot
+from .store import HibernatedTabStore
+from .pressure import MemoryPressureMonitor, PressureLevel
+from .loads import LoadScheduler, LoadPriority
+from .governor import CpuGovernor
+from sledge.utils.sampler import shared_sampler
 
 class TabMemoryManager:
-    def __init__(self, tab_widget):
+    def __init__(self, tab_widget, policy='group'):
         self.tab_widget = tab_widget
-        self.states = {}  # Track tab states
+        self.registry = tab_widget.registry  # Tab states and last access live here
         self.memory_timer = QTimer()
         self.memory_timer.timeout.connect(self.check_memory_usage)
         self.memory_timer.start(60000)  # Check every minute
-        self.memory_threshold = 75  # Percentage of system memory
-        self.last_accessed = {}  # Track when tabs were last accessed
-        self.frozen_tabs = set()  # Track frozen tabs
-        self.memory_usage_history = []  # Track memory usage over time
-
-    def check_memory_usage(self):
-        """Check system memory usage and manage tabs intelligently"""
-        current_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
-        system_memory = psutil.virtual_memory().percent
+        self.memory_threshold = 75  # Start hibernating above this percentage of system memory
+        self.memory_target = 65     # ...and keep going until back under this one
+        
+        # Process-tree and system metrics, sampled once for every consumer
+        self.metrics = MetricsFeed(shared_sampler())
+        
+        # Per-tab memory, read from the renderer processes on a worker thread
+        self.renderer_memory = RendererMemorySampler(self.registry)
+        self.renderer_memory.start()
+        
+        # Background tabs that keep a core busy get frozen
+        self.governor = CpuGovernor(
+            self.registry, lambda entry: self.freeze_tab(entry.index),
+            can_freeze=self._can_freeze,
+        )
+        self.renderer_memory.cpu_sampled.connect(self.governor.sampled)
+        
+        # Hibernation candidates, rescored only when their registry entry changes
+        self.scheduler = EvictionScheduler(
+            self.registry, POLICIES[policy](),
+            is_evictable=self._is_evictable,
+            group_members=self._group_members,
+            memory_estimate=self._estimated_tab_memory,
+        )
+        self.scheduler.collapsed_groups = tab_widget.collapsed_groups
         
-        self.memory_usage_history.append(current_memory)
-        if len(self.memory_usage_history) > 10:
-            self.memory_usage_history.pop(0)
+        # Snapshots of hibernated tabs, kept on disk until they're woken
+        self.store = HibernatedTabStore()
         
-        # Calculate memory trend
-        memory_increasing = (len(self.memory_usage_history) > 1 and 
-                           self.memory_usage_history[-1] > self.memory_usage_history[0])
+        # React to pressure as the kernel reports it; the minute timer is only a backstop
+        self.pressure = MemoryPressureMonitor(self.memory_threshold, sampler=self.metrics.sampler)
+        self.pressure.moderate.connect(lambda: self.relieve_pressure(PressureLevel.MODERATE))
+        self.pressure.critical.connect(lambda: self.relieve_pressure(PressureLevel.CRITICAL))
+        self.pressure.start()
+        self._last_relief = (0, PressureLevel.NONE)  # (monotonic time, level)
         
-        if system_memory > self.memory_threshold or memory_increasing:
+        # Bulk wakes and opens stream in a few loads at a time, slower under pressure
+        self.loads = LoadScheduler(self.registry, self.load_priority)
+        self.pressure.level_changed.connect(self.loads.set_pressure)
+
+    def shutdown(self):
+        """Stop sampling and drop the hibernated tab store"""
+        self.memory_timer.stop()
+        self.pressure.stop()
+        self.renderer_memory.stop()
+        self.metrics.close()
+        self.store.close()
+
+    def set_policy(self, name):
+        """Switch the eviction policy ('lru', 'lfu', 'size' or 'group')"""
+        self.scheduler.set_policy(POLICIES[name]())
+
+    def tab_memory_usage(self):
+        """Bytes used by the browser process plus all renderers at the last sample"""
+        snapshot = self.metrics.latest()
+        rss = snapshot.rss if snapshot is not None else 0
+        return int(rss) + self.renderer_memory.renderer_bytes
+
+    def check_memory_usage(self):
+        """Check system memory usage and hibernate tabs when over the threshold"""
+        if self.pressure.usage_percent() > self.memory_threshold:
             self.optimize_memory_usage()
 
-    def optimize_memory_usage(self):
-        """Optimize memory usage using various strategies"""
-        current_index = self.tab_widget.currentIndex()
+    def relieve_pressure(self, level):
+        """Hibernate tabs right away when the pressure monitor reports a stall
         
-        for i in range(self.tab_widget.count()):
-            if i == current_index:
-                continue
-                
-            tab = self.tab_widget.widget(i)
-            if not hasattr(tab, 'page'):
-                continue
-                
-            # Check if tab should be managed - Fixed reference
-            group = self.tab_widget.tab_groups.get(i)
-            if group and self.tab_widget.groups[group].keep_active:
-                continue
-            
-            # Calculate tab priority
-            priority = self.calculate_tab_priority(i)
-            
-            if priority < 0.3:
-                self.hibernate_tab(i)
-            elif priority < 0.6:
-                self.snooze_tab(i)
-            else:
-                self.freeze_tab(i)
+        PSI stalls can happen well below the usage threshold (e.g. at a
+        container's memory.high), so at least a share of renderer memory is
+        freed: a tenth when moderate, a quarter when critical. Repeats of the
+        same level are ignored for two seconds while the last pass takes effect.
+        """
+        now = time.monotonic()
+        last_time, last_level = self._last_relief
+        if level <= last_level and now - last_time < 2:
+            return []
+        self._last_relief = (now, level)
+        
+        in_use, total = self.pressure.usage()
+        share = 0.25 if level == PressureLevel.CRITICAL else 0.1
+        to_free = max(in_use - total * self.memory_target / 100,
+                      self.renderer_memory.renderer_bytes * share)
+        return self.optimize_memory_usage(to_free)
+
+    def optimize_memory_usage(self, to_free=None):
+        """Hibernate the tabs the eviction policy ranks first until enough memory is freed
+
+        Without an explicit to_free, frees down to memory_target rather than
+        just under the threshold, so the next check doesn't start again right
+        away. Returns the IDs of the hibernated tabs.
+        """
+        if to_free is None:
+            in_use, total = self.pressure.usage()
+            to_free = in_use - total * self.memory_target / 100
+        if to_free <= 0:
+            return []
+        
+        self.scheduler.set_current_group(self.tab_widget.group_of(self.tab_widget.currentIndex()))
+        return self.hibernate_tabs([entry.index for entry in self.scheduler.select(to_free)])
+
+    def _estimated_tab_memory(self):
+        """Memory assumed for an unsampled tab: the average renderer share, but at least the default"""
+        tabs = len(self.registry)
+        average = self.renderer_memory.renderer_bytes // tabs if tabs else 0
+        return max(average, UNSAMPLED_TAB_BYTES)
+
+    def _is_evictable(self, entry):
+        """Whether a tab may be hibernated right now"""
+        if entry.index == self.tab_widget.currentIndex():
+            return False
+        if entry.state == TabState.HIBERNATED or not hasattr(entry.widget, 'page'):
+            return False
+        group = self.tab_widget.groups.get(entry.group)
+        return not (group and group.keep_active)
+
+    def _can_freeze(self, entry):
+        """Whether the CPU governor may freeze a tab"""
+        if entry.index == self.tab_widget.currentIndex() or not hasattr(entry.widget, 'page'):
+            return False
+        page = entry.widget.page()
+        if page.recentlyAudible():
+            return False
+        group = self.tab_widget.groups.get(entry.group)
+        if group and group.keep_active:
+            return False
+        # Qt recommends Active while freezing would break the page, e.g. visible or playing media
+        return page.recommendedState() != QWebEnginePage.LifecycleState.Active
+
+    def lifecycle_changed(self, tab_id, state):
+        """Keep the registry in step with lifecycle changes, including ones Qt makes itself"""
+        entry = self.registry.entry(tab_id)
+        if entry is None:
+            return
+        if state == QWebEnginePage.LifecycleState.Active:
+            if entry.state in [TabState.SNOOZED, TabState.FROZEN]:
+                self.governor.thawed(tab_id, "page became active")
+                self.registry.set_state(tab_id, TabState.ACTIVE)
+                self.tab_widget.tabBar().update_tab_appearance(entry.index)
+        elif entry.state == TabState.ACTIVE:
+            self.registry.set_state(tab_id, TabState.FROZEN)
+            self.tab_widget.tabBar().update_tab_appearance(entry.index)
+
+    def _group_members(self, name):
+        group = self.tab_widget.groups.get(name)
+        return group.tabs if group else ()
 
     def calculate_tab_priority(self, index):
         """Calculate tab priority based on various factors"""
         current_time = datetime.now()
-        last_access = self.last_accessed.get(index, datetime.min)
-        time_factor = min(1.0, (current_time - last_access).seconds / 3600)
+        entry = self.registry.entry_at(index)
+        last_access = entry.last_accessed if entry is not None else datetime.min
+        time_factor = min(1.0, (current_time - last_access).total_seconds() / 3600)
         
         # Check if tab is in view
         visibility_factor = 1.0 if self.tab_widget.tabBar().isTabVisible(index) else 0.5
         
         # Check if tab is in an active group
-        group = self.tab_widget.tab_groups.get(index)
+        group = self.tab_widget.group_of(index)
         group_factor = 1.0
         if group:
             group_obj = self.tab_widget.groups[group]
@@ -82,98 +189,219 @@ class TabMemoryManager:
 
     def freeze_tab(self, index):
         """Freeze tab to reduce memory usage but keep it quickly accessible"""
-        if index not in self.frozen_tabs:
+        if self.state_of(index) != TabState.FROZEN:
             tab = self.tab_widget.widget(index)
             if hasattr(tab, 'page'):
                 tab.page().setLifecycleState(
                     QWebEnginePage.LifecycleState.Frozen
                 )
-                self.frozen_tabs.add(index)
-                self.states[index] = TabState.FROZEN
-                self.tab_widget.tabBar.update_tab_appearance(index)
+                self.registry.set_state(self.tab_widget.tab_id(index), TabState.FROZEN)
+                self.tab_widget.tabBar().update_tab_appearance(index)
 
     def hibernate_tab(self, index):
-        """Hibernate tab by storing its state and freeing memory"""
-        tab = self.tab_widget.widget(index)
-        if hasattr(tab, 'page'):
-            # Store tab data
-            url = tab.url().toString()
-            title = self.tab_widget.tabText(index)
-            scroll_pos = tab.page().scrollPosition()
-            
-            # Create minimal placeholder
-            placeholder = QWidget()
-            placeholder.url = lambda: QUrl(url)
-            placeholder.stored_data = {
-                'url': url,
-                'title': title,
-                'scroll': scroll_pos
-            }
-            
-            # Replace tab
-            self.tab_widget.removeTab(index)
-            self.tab_widget.insertTab(index, placeholder, title)
-            self.states[index] = TabState.HIBERNATED
+        """Hibernate tab by snapshotting its state and freeing its page"""
+        self.hibernate_tabs([index])
+
+    def hibernate_tabs(self, indexes):
+        """Hibernate several tabs, writing their snapshots in one transaction
+        
+        Returns the IDs of the tabs hibernated.
+        """
+        snapshots = []
+        for index in indexes:
+            tab = self.tab_widget.widget(index)
+            tab_id = self.tab_widget.tab_id(index)
+            if hasattr(tab, 'page') and self.state_of(index) != TabState.HIBERNATED:
+                # A queued navigation would start on the deleted view; it becomes the snapshot's URL
+                self.loads.cancel(tab_id)
+                entry = self.registry.entry(tab_id)
+                snapshot = TabSnapshot.capture(tab, self.tab_widget.tabText(index),
+                                               thumbnail=self.tab_widget.thumbnail_data(tab_id) or None,
+                                               url=entry.pending_url or None)
+                snapshots.append((tab_id, snapshot, self.tab_widget.group_of(index)))
+        if not snapshots:
+            return []
+        
+        # Payloads go to disk before any page is dropped
+        self.store.put_many(snapshots)
+        
+        for tab_id, snapshot, group in snapshots:
+            # Replace tab with a placeholder, keeping its ID
+            index = self.registry.index_of(tab_id)
+            placeholder = HibernatedTab(self.store, tab_id)
+            self.tab_widget.replace_tab(index, placeholder, snapshot.title)
+            self.registry.update(tab_id, url=snapshot.url, pending_url='')
+            self.registry.set_state(tab_id, TabState.HIBERNATED)
+            if snapshot.icon:
+                self.tab_widget.setTabIcon(index, snapshot.favicon())
             self.tab_widget.tabBar().update_tab_appearance(index)
-            
-            # Add click handler to wake up tab
-            placeholder.mousePressEvent = lambda e: self.wake_tab(index)
+            placeholder.clicked.connect(self.wake_hibernated)
+        return [tab_id for tab_id, _, _ in snapshots]
+
+    def add_unloaded_tabs(self, snapshots):
+        """Append tabs that only load once activated, e.g. on session restore
+        
+        Each tab gets a placeholder backed by its snapshot in the store, the
+        same as a hibernated tab; all snapshots are written in one
+        transaction. Returns the new tabs' IDs.
+        """
+        tab_ids = []
+        for snapshot in snapshots:
+            placeholder = HibernatedTab(self.store, None)
+            index = self.tab_widget.addTab(placeholder, snapshot.title or snapshot.url)
+            tab_id = placeholder.tab_id = self.tab_widget.tab_id(index)
+            self.registry.set_state(tab_id, TabState.HIBERNATED)
+            self.registry.update(tab_id, url=snapshot.url)
+            if snapshot.icon:
+                self.tab_widget.setTabIcon(index, snapshot.favicon())
+            placeholder.clicked.connect(self.wake_hibernated)
+            tab_ids.append(tab_id)
+        self.store.put_many([(tab_id, snapshot, None) for tab_id, snapshot in zip(tab_ids, snapshots)])
+        return tab_ids
+
+    def hibernate_group(self, group_name):
+        """Hibernate every tab of a group except the current one"""
+        current = self.tab_widget.currentIndex()
+        return self.hibernate_tabs(
+            [i for i in self.tab_widget.group_indexes(group_name) if i != current])
+
+    def wake_group(self, group_name):
+        """Wake every tab of a group through the load scheduler"""
+        self.queue_wake(self.tab_widget.group_indexes(group_name))
+
+    def queue_wake(self, indexes):
+        """Wake many tabs without loading them all at once
+        
+        Hibernated tabs queue on the load scheduler and keep their
+        placeholder until admitted; snoozed and frozen tabs still have their
+        page and wake right away.
+        """
+        for index in indexes:
+            tab_id = self.tab_widget.tab_id(index)
+            state = self.state_of(index)
+            if state == TabState.HIBERNATED:
+                self.loads.schedule(tab_id, lambda tab_id=tab_id: self._wake_admitted(tab_id))
+            elif state in [TabState.SNOOZED, TabState.FROZEN]:
+                self.wake_tab(index)
+
+    def _wake_admitted(self, tab_id):
+        """Wake a queued tab once the scheduler admits it; returns its new view"""
+        index = self.registry.index_of(tab_id)
+        if index < 0 or self.state_of(index) != TabState.HIBERNATED:
+            return None  # Closed, or already woken by activating it
+        if self.wake_tabs([index]):
+            return self.registry.widget(tab_id)
+        return None
+
+    def load_priority(self, tab_id):
+        """Load class of a tab relative to the current one"""
+        current = self.tab_widget.currentIndex()
+        if self.registry.index_of(tab_id) == current:
+            return LoadPriority.FOREGROUND
+        entry = self.registry.entry(tab_id)
+        if entry is not None and entry.group and entry.group == self.tab_widget.group_of(current):
+            return LoadPriority.SAME_GROUP
+        return LoadPriority.BACKGROUND
+
+    def wake_hibernated(self, tab_id):
+        """Wake a hibernated tab wherever it has moved to and select it"""
+        index = self.registry.index_of(tab_id)
+        if index >= 0:
+            self.wake_tab(index)
+
+    def state_of(self, index):
+        """TabState of the tab at index"""
+        entry = self.registry.entry_at(index)
+        return entry.state if entry is not None else None
 
     def wake_tab(self, index):
         """Wake up a hibernated or snoozed tab"""
+        tab_id = self.tab_widget.tab_id(index)
+        if tab_id is None:
+            return
         tab = self.tab_widget.widget(index)
         
-        if self.states.get(index) == TabState.HIBERNATED:
-            # Restore hibernated tab
-            stored_data = getattr(tab, 'stored_data', None)
-            if stored_data:
-                # Create new web view
-                web_view = QWebEngineView()
-                web_view.setPage(QWebEnginePage(
-                    self.tab_widget.parent().profile, web_view))
-                
-                # Set dark mode before loading
-                self.tab_widget.parent().inject_dark_mode_to_tab(web_view)
-                
-                # Load URL and restore state
-                web_view.setUrl(QUrl(stored_data['url']))
-                web_view.loadFinished.connect(
-                    lambda ok: self.restore_tab_state(web_view, stored_data) if ok else None
-                )
-                
-                # Replace placeholder with real tab
-                self.tab_widget.removeTab(index)
-                self.tab_widget.insertTab(index, web_view, stored_data['title'])
-                self.states[index] = TabState.ACTIVE
-                
+        if self.state_of(index) == TabState.HIBERNATED:
+            if self.wake_tabs([index]):
                 # Make sure the tab is selected after restoration
                 self.tab_widget.setCurrentIndex(index)
+            return
                 
-        elif self.states.get(index) in [TabState.SNOOZED, TabState.FROZEN]:
+        elif self.state_of(index) in [TabState.SNOOZED, TabState.FROZEN]:
             if hasattr(tab, 'page'):
                 tab.page().setLifecycleState(
                     QWebEnginePage.LifecycleState.Active
                 )
-                self.frozen_tabs.discard(index)
-                self.states[index] = TabState.ACTIVE
+                self.registry.set_state(tab_id, TabState.ACTIVE)
         
-        self.last_accessed[index] = datetime.now()
+        self.registry.touch(tab_id)
         self.tab_widget.tabBar().update_tab_appearance(index)
 
-    def restore_tab_state(self, web_view, stored_data):
-        """Restore tab state after loading"""
-        if 'scroll' in stored_data:
-            web_view.page().setScrollPosition(stored_data['scroll'])
-        # Add any other state restoration here
+    def wake_tabs(self, indexes):
+        """Bring hibernated tabs back from their snapshots; returns the IDs woken"""
+        tab_ids = [self.tab_widget.tab_id(index) for index in indexes
+                   if self.state_of(index) == TabState.HIBERNATED]
+        woken = []
+        for tab_id, snapshot in self.store.take_many(tab_ids).items():
+            self.loads.cancel(tab_id)
+            index = self.registry.index_of(tab_id)
+            
+            # New web view with the browser's usual scripts and signal handlers
+            web_view = self.tab_widget.parent().create_web_view()
+            
+            # Rebuild the history in one go; this loads its current entry
+            snapshot.restore(web_view)
+            
+            # Replace placeholder with real tab
+            self.tab_widget.replace_tab(index, web_view, snapshot.title)
+            self.registry.set_state(tab_id, TabState.ACTIVE)
+            self.registry.touch(tab_id)
+            self.tab_widget.tabBar().update_tab_appearance(index)
+            woken.append(tab_id)
+        return woken
 
     def snooze_tab(self, index):
         """Snooze a tab to reduce memory usage"""
-        if self.states.get(index) == TabState.ACTIVE:
+        if self.state_of(index) == TabState.ACTIVE:
             tab = self.tab_widget.widget(index)
-            if hasattr(tab, 'url'):
-                self.states[index] = TabState.SNOOZED
+            if hasattr(tab, 'page'):
+                self.registry.set_state(self.tab_widget.tab_id(index), TabState.SNOOZED)
                 tab.page().setLifecycleState(tab.page().LifecycleState.Frozen)
-                self.tab_widget.tabBar.update_tab_appearance(index)
+                self.tab_widget.tabBar().update_tab_appearance(index)
+
+class HibernatedTab(QLabel):
+    """Stands in for a hibernated tab's web view
+    
+    Holds nothing but the tab ID; the thumbnail is read from the store the
+    first time the placeholder is shown.
+    """
+    clicked = pyqtSignal(int)  # Tab ID
+    
+    def __init__(self, store, tab_id, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.tab_id = tab_id
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    
+    def url(self):
+        stored = self.store.index.get(self.tab_id)
+        return QUrl(stored.url if stored else '')
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.pixmap().isNull() and not self.text():
+            stored = self.store.index.get(self.tab_id)
+            thumbnail = QPixmap()
+            thumbnail.loadFromData(self.store.thumbnail(self.tab_id), 'JPEG')
+            if not thumbnail.isNull():
+                self.setPixmap(thumbnail)
+            elif stored is not None:
+                self.setText(stored.title or stored.url)
+            if stored is not None:
+                self.setToolTip(f"{stored.url}\nHibernated - click to wake")
+    
+    def mousePressEvent(self, event):
+        self.clicked.emit(self.tab_id)
 
 class TabMemoryIndicator(QWidget):
     """Widget showing memory usage and tab states"""
@@ -199,27 +427,36 @@ class TabMemoryIndicator(QWidget):
         self.auto_manage.toggled.connect(self.toggle_auto_manage)
         layout.addWidget(self.auto_manage)
         
-        # Update timer
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_indicators)
-        self.update_timer.start(1000)  # Update every second
+        # Updated from the shared metrics sampler
+        self.tab_widget.memory_manager.metrics.snapshot.connect(self.update_indicators)
+        
+        # Biggest tabs, refreshed when a renderer sample arrives
+        self.tab_widget.memory_manager.renderer_memory.sampled.connect(self.update_top_tabs)
+        
+        # Recolor as soon as pressure changes rather than on the next tick
+        self.tab_widget.memory_manager.pressure.level_changed.connect(lambda level: self.update_indicators())
         
-    def update_indicators(self):
+    def update_indicators(self, snapshot=None):
         """Update memory usage and tab state indicators"""
-        memory = psutil.Process().memory_info().rss / 1024 / 1024
-        system_memory = psutil.virtual_memory().percent
+        snapshot = snapshot or self.tab_widget.memory_manager.metrics.latest()
+        if snapshot is None:
+            return
+        memory = snapshot.rss / 1024 / 1024
+        system_memory = snapshot.memory_percent
+        renderers = self.tab_widget.memory_manager.renderer_memory
         
         self.memory_label.setText(
-            f"Memory: {memory:.1f}MB ({system_memory}% system)"
+            f"Memory: {memory:.1f}MB + {renderers.renderer_bytes / 1024 / 1024:.1f}MB "
+            f"in {renderers.renderer_count} renderers ({system_memory:.1f}% system)"
         )
         
-        # Count tab states - Fixed reference
-        states = self.tab_widget.memory_manager.states
+        # Count tab states - kept up to date by the registry
+        states = self.tab_widget.registry.state_counts()
         counts = {
-            "Active": sum(1 for s in states.values() if s == TabState.ACTIVE),
-            "Snoozed": sum(1 for s in states.values() if s == TabState.SNOOZED),
-            "Frozen": sum(1 for s in states.values() if s == TabState.FROZEN),
-            "Hibernated": sum(1 for s in states.values() if s == TabState.HIBERNATED)
+            "Active": states[TabState.ACTIVE],
+            "Snoozed": states[TabState.SNOOZED],
+            "Frozen": states[TabState.FROZEN],
+            "Hibernated": states[TabState.HIBERNATED]
         }
         
         self.state_label.setText(
@@ -227,12 +464,24 @@ class TabMemoryIndicator(QWidget):
         )
         
         # Update color based on memory pressure
-        if system_memory > 85:
+        pressure = self.tab_widget.memory_manager.pressure.level
+        if system_memory > 85 or pressure == PressureLevel.CRITICAL:
             self.setStyleSheet("background-color: #662222")
-        elif system_memory > 75:
+        elif system_memory > 75 or pressure == PressureLevel.MODERATE:
             self.setStyleSheet("background-color: #666622")
         else:
             self.setStyleSheet("")
+    
+    def update_top_tabs(self, per_tab):
+        """List the tabs using the most renderer memory in the tooltip"""
+        registry = self.tab_widget.registry
+        top = heapq.nlargest(5, per_tab.items(), key=lambda item: item[1])
+        lines = []
+        for tab_id, memory in top:
+            entry = registry.entry(tab_id)
+            if entry is not None and memory:
+                lines.append(f"{memory / 1024 / 1024:.1f}MB  {entry.title or entry.url}")
+        self.memory_label.setToolTip("\n".join(lines))
             
     def toggle_auto_manage(self):
         """Toggle automatic memory management"""
@@ -0,0 +1,188 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+
+from .states import TabState
+
+UNGROUPED = ''  # TabFilterModel.set_group value for tabs outside any group
+
+
+class TabRoles:
+    TAB_ID = Qt.ItemDataRole.UserRole
+    URL = Qt.ItemDataRole.UserRole + 1
+    GROUP = Qt.ItemDataRole.UserRole + 2
+    STATE = Qt.ItemDataRole.UserRole + 3
+    MEMORY = Qt.ItemDataRole.UserRole + 4
+    THUMBNAIL = Qt.ItemDataRole.UserRole + 5   # QImage, null when there is none
+
+
+STATE_LABELS = {
+    TabState.ACTIVE: "Active",
+    TabState.SNOOZED: "Snoozed 💤",
+    TabState.FROZEN: "Frozen ❄",
+    TabState.HIBERNATED: "Hibernated",
+}
+
+
+def tab_matches(entry, text):
+    """Whether a tab's title or URL contains text, ignoring case"""
+    if not text:
+        return True
+    text = text.lower()
+    return text in entry.title.lower() or text in entry.url.lower()
+
+
+class TabListModel(QAbstractTableModel):
+    """The tabs of a TabWidget as a table, one row per tab in tab order
+
+    Rows mirror the TabRegistry and are kept current from its listeners:
+    opening and closing a tab inserts or removes one row, a move is one
+    rowsMoved, and a metadata change (title, URL, group, state, memory)
+    is a dataChanged on that row only. Views put a TabFilterModel in front
+    to filter by group or text without rebuilding anything.
+
+    Icons and thumbnails aren't in the registry; ``icon_of(tab_id)`` and
+    ``thumbnail_of(tab_id)`` supply them, and refresh() announces changes.
+    """
+
+    TITLE, URL, GROUP, STATE, MEMORY = range(5)
+    HEADERS = ("Title", "URL", "Group", "Status", "Memory")
+
+    def __init__(self, registry, icon_of=None, thumbnail_of=None, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.icon_of = icon_of
+        self.thumbnail_of = thumbnail_of
+        self._rows = list(registry)   # Tab IDs, mirrors the registry's order
+        registry.subscribe(self._tab_changed)
+        registry.subscribe_moves(self._tab_moved)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def tab_id(self, row):
+        return self._rows[row]
+
+    def row_of(self, tab_id):
+        """Row of a tab, -1 if the model doesn't have it"""
+        index = self.registry.index_of(tab_id)
+        if 0 <= index < len(self._rows) and self._rows[index] == tab_id:
+            return index
+        return self._rows.index(tab_id) if tab_id in self._rows else -1
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        tab_id = self._rows[index.row()]
+        entry = self.registry.entry(tab_id)
+        if entry is None:
+            return None
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.TITLE:
+                return entry.title or entry.url or "Untitled"
+            if column == self.URL:
+                return entry.url
+            if column == self.GROUP:
+                return entry.group or ""
+            if column == self.STATE:
+                return STATE_LABELS.get(entry.state, entry.state)
+            if column == self.MEMORY:
+                return f"{entry.memory / (1024 * 1024):.0f} MB" if entry.memory else ""
+        elif role == Qt.ItemDataRole.ToolTipRole and column == self.TITLE:
+            return entry.url
+        elif role == Qt.ItemDataRole.DecorationRole and column == self.TITLE:
+            return self.icon_of(tab_id) if self.icon_of is not None else None
+        elif role == TabRoles.TAB_ID:
+            return tab_id
+        elif role == TabRoles.URL:
+            return entry.url
+        elif role == TabRoles.GROUP:
+            return entry.group
+        elif role == TabRoles.STATE:
+            return entry.state
+        elif role == TabRoles.MEMORY:
+            return entry.memory
+        elif role == TabRoles.THUMBNAIL:
+            return self.thumbnail_of(tab_id) if self.thumbnail_of is not None else None
+        return None
+
+    def refresh(self, tab_id, roles=()):
+        """Announce a change the registry doesn't see, e.g. a new icon or thumbnail"""
+        row = self.row_of(tab_id)
+        if row >= 0:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1),
+                                  list(roles))
+
+    # Registry listeners
+    def _tab_changed(self, tab_id):
+        in_registry = tab_id in self.registry and self.registry.index_of(tab_id) >= 0
+        row = self.row_of(tab_id)
+        if in_registry and row < 0:
+            row = self.registry.index_of(tab_id)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._rows.insert(row, tab_id)
+            self.endInsertRows()
+        elif not in_registry and row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+        elif row >= 0:
+            self.refresh(tab_id)
+
+    def _tab_moved(self, from_index, to_index):
+        # beginMoveRows takes the destination as a row before the move
+        destination = to_index + 1 if to_index > from_index else to_index
+        self.beginMoveRows(QModelIndex(), from_index, from_index, QModelIndex(), destination)
+        self._rows.insert(to_index, self._rows.pop(from_index))
+        self.endMoveRows()
+
+
+class TabFilterModel(QSortFilterProxyModel):
+    """A TabListModel narrowed to one group and/or a search text
+
+    set_group(None) shows every group, set_group(UNGROUPED) only ungrouped
+    tabs. Filtering is dynamic, so rows come and go as tabs change instead
+    of the view being repopulated.
+    """
+
+    def __init__(self, source=None, parent=None):
+        super().__init__(parent)
+        self.group = None
+        self.text = ''
+        self.setDynamicSortFilter(True)
+        if source is not None:
+            self.setSourceModel(source)
+
+    def set_group(self, group):
+        if group != self.group:
+            self.group = group
+            self.invalidateFilter()
+
+    def set_text(self, text):
+        if text != self.text:
+            self.text = text
+            self.invalidateFilter()
+
+    def tab_id(self, row):
+        return self.data(self.index(row, 0), TabRoles.TAB_ID)
+
+    def tab_ids(self):
+        """Tab IDs of the rows passing the filter, in order"""
+        return [self.tab_id(row) for row in range(self.rowCount())]
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        source = self.sourceModel()
+        entry = source.registry.entry(source.tab_id(source_row))
+        if entry is None:
+            return False
+        if self.group is not None and (entry.group or UNGROUPED) != self.group:
+            return False
+        return tab_matches(entry, self.text)
@@ -0,0 +1,89 @@
+from bisect import bisect_left
+
+
+def longest_increasing_subsequence(values):
+    """Positions of a longest strictly increasing subsequence of values, O(n log n)"""
+    tails = []          # tails[k]: smallest tail value of an increasing run of length k + 1
+    tail_positions = []
+    previous = [-1] * len(values)
+    for position, value in enumerate(values):
+        k = bisect_left(tails, value)
+        if k == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[k] = value
+            tail_positions[k] = position
+        previous[position] = tail_positions[k - 1] if k else -1
+
+    result = []
+    position = tail_positions[-1] if tail_positions else -1
+    while position >= 0:
+        result.append(position)
+        position = previous[position]
+    result.reverse()
+    return result
+
+
+def minimal_moves(current, target):
+    """moveTab(from, to) calls that turn the order current into target
+
+    Both are lists of the same tab IDs. The tabs on a longest increasing
+    subsequence of target positions are already in relative order and stay
+    put; every other tab is moved once, to just after the tab that precedes
+    it in target. That is the fewest single-tab moves possible. Moves are
+    meant to be applied in the order returned.
+    """
+    rank = {tab_id: position for position, tab_id in enumerate(target)}
+    ranks = [rank[tab_id] for tab_id in current]
+    stay = {current[position] for position in longest_increasing_subsequence(ranks)}
+
+    working = list(current)
+    moves = []
+    for position, tab_id in enumerate(target):
+        if tab_id in stay:
+            continue
+        from_index = working.index(tab_id)
+        working.pop(from_index)
+        to_index = working.index(target[position - 1]) + 1 if position else 0
+        working.insert(to_index, tab_id)
+        if from_index != to_index:
+            moves.append((from_index, to_index))
+    return moves
+
+
+def group_layout(entries, collapsed_groups, representatives, current_id=None):
+    """Which tabs to show, and in what order, for the groups' collapse state
+
+    entries are the registry's TabEntry objects in tab order. While a group
+    is expanded only its tabs are shown; otherwise each group is shown by its
+    representative, followed by the ungrouped tabs. Returns (order, visible,
+    chosen): the full target order (visible tabs first, the rest keeping
+    their relative order), the visible tab IDs, and representatives picked
+    for groups whose one was missing, preferring the current tab.
+    """
+    grouped = {}
+    ungrouped = []
+    for entry in entries:
+        if entry.group:
+            grouped.setdefault(entry.group, []).append(entry.id)
+        else:
+            ungrouped.append(entry.id)
+
+    chosen = {}
+    expanded = next((name for name in grouped if name not in collapsed_groups), None)
+    if expanded is not None:
+        visible = list(grouped[expanded])
+    else:
+        visible = []
+        for name, tabs in grouped.items():
+            representative = representatives.get(name)
+            if representative is None or representative not in tabs:
+                representative = current_id if current_id in tabs else tabs[0]
+                chosen[name] = representative
+            visible.append(representative)
+        visible.extend(ungrouped)
+
+    shown = set(visible)
+    order = visible + [entry.id for entry in entries if entry.id not in shown]
+    return order, visible, chosen
@@ -0,0 +1,234 @@
+import os
+
+import psutil
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QSocketNotifier, QTimer, pyqtSignal
+
+PSI_MEMORY = '/proc/pressure/memory'
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+# PSI triggers: (kind, stall us, window us). Unprivileged processes may only
+# use windows that are a multiple of 2s.
+MODERATE_TRIGGER = ('some', 150_000, 2_000_000)
+CRITICAL_TRIGGER = ('full', 100_000, 2_000_000)
+
+
+class PressureLevel:
+    NONE = 0
+    MODERATE = 1
+    CRITICAL = 2
+
+
+def parse_psi(text):
+    """Parse a PSI file into {'some': {'avg10': ..., 'total': ...}, 'full': {...}}"""
+    result = {}
+    for line in text.splitlines():
+        kind, *fields = line.split()
+        result[kind] = {key: float(value) for key, value in (f.split('=') for f in fields)}
+    return result
+
+
+def parse_flat_keyed(text):
+    """Parse a cgroup 'key value' file such as memory.events"""
+    result = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(' ')
+        if value:
+            result[key] = int(value)
+    return result
+
+
+def cgroup_dir(proc_cgroup, root=CGROUP_ROOT):
+    """This process's cgroup v2 directory, None outside a v2 hierarchy or at its root"""
+    for line in proc_cgroup.splitlines():
+        if line.startswith('0::'):
+            path = line[3:].strip()
+            if path and path != '/':
+                return os.path.join(root, path.lstrip('/'))
+    return None
+
+
+def events_level(previous, current):
+    """Pressure implied by memory.events counters going up"""
+    def grew(key):
+        return current.get(key, 0) > previous.get(key, 0)
+    if grew('oom') or grew('oom_kill') or grew('max'):
+        return PressureLevel.CRITICAL
+    if grew('high'):
+        return PressureLevel.MODERATE
+    return PressureLevel.NONE
+
+
+def usage_level(percent, moderate, critical):
+    if percent >= critical:
+        return PressureLevel.CRITICAL
+    if percent >= moderate:
+        return PressureLevel.MODERATE
+    return PressureLevel.NONE
+
+
+def poll_interval(percent, moderate, fastest=250, slowest=10_000):
+    """Poll faster the closer memory use gets to the moderate threshold"""
+    headroom = moderate - percent
+    return int(min(slowest, max(fastest, headroom * 500)))
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class MemoryPressureMonitor(QObject):
+    """Reports memory pressure as it happens instead of on a fixed poll
+
+    On Linux PSI triggers are registered on the process's cgroup
+    memory.pressure (falling back to /proc/pressure/memory), and the kernel
+    wakes the event loop through a QSocketNotifier as soon as tasks stall on
+    memory for longer than the trigger allows. Inside a cgroup v2 container,
+    memory.events is watched as well so hitting memory.high or memory.max
+    registers even when PSI isn't available. Without either, memory use is
+    polled, more often the closer it gets to ``moderate``.
+
+    A level sticks until ``relax`` ms pass without a new event. System memory
+    figures come from the SystemSampler when one is given.
+    """
+
+    level_changed = pyqtSignal(int)   # PressureLevel
+    moderate = pyqtSignal()
+    critical = pyqtSignal()
+
+    def __init__(self, moderate=75, critical=90, relax=10_000, sampler=None, parent=None):
+        super().__init__(parent)
+        self.sampler = sampler
+        self.moderate_percent = moderate
+        self.critical_percent = critical
+        self.level = PressureLevel.NONE
+        self.source = None  # 'psi', 'cgroup' or 'poll'
+        self._fds = []
+        self._notifiers = []
+        self._events = {}
+        self._watcher = None
+
+        self.cgroup = cgroup_dir(_read('/proc/self/cgroup') or '')
+        if self.cgroup is not None and not os.path.exists(os.path.join(self.cgroup, 'memory.current')):
+            self.cgroup = None
+
+        self._relax_timer = QTimer(self)
+        self._relax_timer.setSingleShot(True)
+        self._relax_timer.setInterval(relax)
+        self._relax_timer.timeout.connect(self._relax)
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setSingleShot(True)
+        self._poll_timer.timeout.connect(self._poll)
+
+    def start(self):
+        if self._start_psi():
+            self.source = 'psi'
+        if self._start_cgroup_events():
+            self.source = self.source or 'cgroup'
+        if self.source is None:
+            self.source = 'poll'
+            self._poll()
+
+    def stop(self):
+        self._relax_timer.stop()
+        self._poll_timer.stop()
+        for notifier in self._notifiers:
+            notifier.setEnabled(False)
+        self._notifiers = []
+        for fd in self._fds:
+            os.close(fd)
+        self._fds = []
+        self._watcher = None
+
+    def usage(self):
+        """(bytes in use, bytes available in total), from the cgroup limit when there is one"""
+        if self.cgroup is not None:
+            limit = (_read(os.path.join(self.cgroup, 'memory.high')) or 'max').strip()
+            if limit == 'max':
+                limit = (_read(os.path.join(self.cgroup, 'memory.max')) or 'max').strip()
+            current = _read(os.path.join(self.cgroup, 'memory.current'))
+            if limit != 'max' and current is not None:
+                return int(current), int(limit)
+        snapshot = self.sampler.latest() if self.sampler is not None else None
+        if snapshot is not None:
+            return snapshot.memory_used, snapshot.memory_total
+        memory = psutil.virtual_memory()
+        return memory.total - memory.available, memory.total
+
+    def usage_percent(self):
+        in_use, total = self.usage()
+        return 100 * in_use / total if total else 0
+
+    # Sources
+    def _start_psi(self):
+        path = PSI_MEMORY
+        if self.cgroup is not None and os.path.exists(os.path.join(self.cgroup, 'memory.pressure')):
+            path = os.path.join(self.cgroup, 'memory.pressure')
+        for level, (kind, stall, window) in ((PressureLevel.MODERATE, MODERATE_TRIGGER),
+                                             (PressureLevel.CRITICAL, CRITICAL_TRIGGER)):
+            try:
+                fd = os.open(path, os.O_RDWR | os.O_NONBLOCK)
+            except OSError:
+                break
+            try:
+                os.write(fd, f'{kind} {stall} {window}\0'.encode())
+            except OSError:
+                os.close(fd)
+                break
+            self._fds.append(fd)
+            # The kernel signals a trigger with POLLPRI
+            notifier = QSocketNotifier(fd, QSocketNotifier.Type.Exception, self)
+            notifier.activated.connect(lambda _socket, level=level: self._raise(level))
+            self._notifiers.append(notifier)
+        else:
+            return True
+        self.stop()
+        return False
+
+    def _start_cgroup_events(self):
+        if self.cgroup is None:
+            return False
+        path = os.path.join(self.cgroup, 'memory.events')
+        text = _read(path)
+        if text is None:
+            return False
+        self._events = parse_flat_keyed(text)
+        # cgroup v2 sends a modify notification whenever a counter changes
+        self._watcher = QFileSystemWatcher([path], self)
+        self._watcher.fileChanged.connect(self._events_changed)
+        return True
+
+    def _events_changed(self, path):
+        events = parse_flat_keyed(_read(path) or '')
+        level = events_level(self._events, events)
+        self._events = events
+        if level:
+            self._raise(level)
+
+    def _poll(self):
+        percent = self.usage_percent()
+        level = usage_level(percent, self.moderate_percent, self.critical_percent)
+        if level:
+            self._raise(level)
+        self._poll_timer.start(poll_interval(percent, self.moderate_percent))
+
+    # Levels
+    def _raise(self, level):
+        self._relax_timer.start()
+        if level > self.level:
+            self._set_level(level)
+        if level == PressureLevel.CRITICAL:
+            self.critical.emit()
+        elif level == PressureLevel.MODERATE:
+            self.moderate.emit()
+
+    def _relax(self):
+        self._set_level(PressureLevel.NONE)
+
+    def _set_level(self, level):
+        if level != self.level:
+            self.level = level
+            self.level_changed.emit(level)
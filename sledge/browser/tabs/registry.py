@@ -0,0 +1,225 @@
+from contextlib import contextmanager
+from datetime import datetime
+
+from .states import TabState
+
+
+class TabEntry:
+    """What the registry knows about one tab"""
+
+    __slots__ = ('id', 'widget', 'index', 'group', 'state', 'last_accessed', 'access_count',
+                 'url', 'title', 'pending_url', 'pid', 'memory')
+
+    def __init__(self, tab_id, widget, index):
+        self.id = tab_id
+        self.widget = widget
+        self.index = index
+        self.group = None
+        self.state = TabState.ACTIVE
+        self.last_accessed = datetime.now()
+        self.access_count = 0
+        self.url = ''
+        self.title = ''
+        self.pending_url = ''   # Where a load still queued on the LoadScheduler will go
+        self.pid = 0      # Renderer process, 0 until it has started
+        self.memory = 0   # Bytes of renderer memory attributed to this tab
+
+    def __repr__(self):
+        return f"TabEntry(id={self.id}, index={self.index}, group={self.group!r}, state={self.state!r})"
+
+
+class TabRegistry:
+    """Stable IDs for the tabs of a TabWidget
+
+    Indexes shift whenever a tab is opened, closed or moved, so anything that
+    remembers a tab keys it by the ID handed out here. The registry mirrors
+    the tab order and keeps index -> id, id -> entry and widget -> id lookups
+    current from the widget's insert/remove hooks and QTabBar.tabMoved.
+    
+    Subscribers are called with a tab ID whenever that tab is opened, closed
+    or its metadata changes (index moves don't count); move subscribers get
+    each move as (from_index, to_index).
+    """
+
+    def __init__(self):
+        self._order = []        # Tab IDs in tab bar order
+        self._entries = {}      # Tab ID -> TabEntry
+        self._by_widget = {}    # Widget -> tab ID
+        self._state_counts = {TabState.ACTIVE: 0, TabState.SNOOZED: 0,
+                              TabState.FROZEN: 0, TabState.HIBERNATED: 0}
+        self._next_id = 1
+        self._carry = None      # ID kept across a widget swap, see replacing()
+        self._listeners = []
+        self._move_listeners = []
+
+    def subscribe(self, listener):
+        """Call listener(tab_id) whenever a tab's entry changes"""
+        self._listeners.append(listener)
+
+    def subscribe_moves(self, listener):
+        """Call listener(from_index, to_index) after a tab moves"""
+        self._move_listeners.append(listener)
+
+    def _changed(self, tab_id):
+        for listener in self._listeners:
+            listener(tab_id)
+
+    # Keeping in sync with the tab widget
+    def inserted(self, index, widget):
+        """Register the tab just inserted at index and return its ID"""
+        tab_id = self._carry
+        if tab_id is not None and tab_id in self._entries and self._entries[tab_id].index < 0:
+            entry = self._entries[tab_id]
+            entry.widget = widget
+        else:
+            tab_id = self._next_id
+            self._next_id += 1
+            entry = self._entries[tab_id] = TabEntry(tab_id, widget, index)
+            self._state_counts[entry.state] += 1
+        self._by_widget[widget] = tab_id
+
+        index = min(max(index, 0), len(self._order))
+        self._order.insert(index, tab_id)
+        self._reindex(index, len(self._order))
+        self._changed(tab_id)
+        return tab_id
+
+    def removed(self, index):
+        """Forget the tab that was at index; returns its entry, or None while replacing()"""
+        if not 0 <= index < len(self._order):
+            return None
+        tab_id = self._order.pop(index)
+        self._reindex(index, len(self._order))
+
+        entry = self._entries[tab_id]
+        if self._by_widget.get(entry.widget) == tab_id:
+            del self._by_widget[entry.widget]
+        entry.index = -1
+        if tab_id == self._carry:
+            return None  # The replacement widget takes over this entry
+        del self._entries[tab_id]
+        self._state_counts[entry.state] -= 1
+        self._changed(tab_id)
+        return entry
+
+    def moved(self, from_index, to_index):
+        """Follow QTabBar.tabMoved"""
+        if from_index == to_index or not 0 <= from_index < len(self._order):
+            return
+        self._order.insert(to_index, self._order.pop(from_index))
+        self._reindex(min(from_index, to_index), max(from_index, to_index) + 1)
+        for listener in self._move_listeners:
+            listener(from_index, to_index)
+
+    @contextmanager
+    def replacing(self, tab_id):
+        """Keep a tab's ID and metadata while its widget is removed and a new one inserted"""
+        self._carry = tab_id
+        try:
+            yield
+        finally:
+            self._carry = None
+            entry = self._entries.get(tab_id)
+            if entry is not None and entry.index < 0:
+                # Nothing was inserted in its place
+                del self._entries[tab_id]
+                self._state_counts[entry.state] -= 1
+                self._changed(tab_id)
+
+    def _reindex(self, start, stop):
+        entries = self._entries
+        order = self._order
+        for index in range(start, min(stop, len(order))):
+            entries[order[index]].index = index
+
+    # Lookups
+    def id_at(self, index):
+        """ID of the tab at index, None when out of range"""
+        if 0 <= index < len(self._order):
+            return self._order[index]
+        return None
+
+    def index_of(self, tab_id):
+        """Current index of a tab, -1 when it is not open"""
+        entry = self._entries.get(tab_id)
+        return entry.index if entry is not None else -1
+
+    def id_of(self, widget):
+        """ID of the tab showing widget"""
+        return self._by_widget.get(widget)
+
+    def entry(self, tab_id):
+        return self._entries.get(tab_id)
+
+    def entry_at(self, index):
+        tab_id = self.id_at(index)
+        return self._entries[tab_id] if tab_id is not None else None
+
+    def widget(self, tab_id):
+        entry = self._entries.get(tab_id)
+        return entry.widget if entry is not None else None
+
+    def entries(self):
+        """All entries in tab order"""
+        return [self._entries[tab_id] for tab_id in self._order]
+
+    # Metadata
+    def set_group(self, tab_id, group):
+        """Record a tab's group, returns the group it was in"""
+        entry = self._entries[tab_id]
+        previous, entry.group = entry.group, group
+        if previous != group:
+            self._changed(tab_id)
+        return previous
+
+    def set_state(self, tab_id, state):
+        """Record a tab's memory state"""
+        entry = self._entries[tab_id]
+        if entry.state != state:
+            self._state_counts[entry.state] -= 1
+            self._state_counts[state] = self._state_counts.get(state, 0) + 1
+            entry.state = state
+            self._changed(tab_id)
+
+    def state_counts(self):
+        """Number of tabs in each TabState"""
+        return dict(self._state_counts)
+
+    def touch(self, tab_id, when=None):
+        """Mark a tab as just used"""
+        entry = self._entries.get(tab_id)
+        if entry is not None:
+            entry.last_accessed = when or datetime.now()
+            entry.access_count += 1
+            self._changed(tab_id)
+
+    def set_memory(self, tab_id, memory):
+        """Record the renderer memory attributed to a tab"""
+        entry = self._entries.get(tab_id)
+        if entry is not None and entry.memory != memory:
+            entry.memory = memory
+            self._changed(tab_id)
+
+    def update(self, tab_id, url=None, title=None, pid=None, pending_url=None):
+        """Record a tab's URL, title, queued URL or renderer PID, ignoring tabs that are already closed"""
+        entry = self._entries.get(tab_id)
+        if entry is None:
+            return
+        if url is not None:
+            entry.url = url
+        if title is not None:
+            entry.title = title
+        if pending_url is not None:
+            entry.pending_url = pending_url
+        if pid is not None:
+            entry.pid = pid
+        self._changed(tab_id)
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        return iter(list(self._order))
+
+    def __contains__(self, tab_id):
+        return tab_id in self._entries
@@ -0,0 +1,180 @@
+import queue
+import threading
+
+import psutil
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+
+def process_memory(pid):
+    """Memory of one process as (pss, uss) in bytes, None if it can't be read
+
+    PSS charges shared pages proportionally to every process mapping them, so
+    summing it over renderers doesn't count shared libraries twice. Where PSS
+    isn't available (non-Linux) USS, and failing that RSS, stands in for it.
+    """
+    try:
+        process = psutil.Process(pid)
+        try:
+            info = process.memory_full_info()
+        except psutil.AccessDenied:
+            rss = process.memory_info().rss
+            return rss, rss
+        uss = getattr(info, 'uss', info.rss)
+        return getattr(info, 'pss', uss), uss
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+
+
+def process_cpu(processes, pid):
+    """CPU percent of a process since the last call for it, None if it can't be read
+
+    processes caches psutil.Process objects by PID, since cpu_percent measures
+    against the previous call on the same object. A process's first reading
+    is 0.
+    """
+    process = processes.get(pid)
+    try:
+        if process is None:
+            process = processes[pid] = psutil.Process(pid)
+            process.cpu_percent(None)
+            return 0.0
+        return process.cpu_percent(None)
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        processes.pop(pid, None)
+        return None
+
+
+def apportion_cpu(pid_tabs, cpu):
+    """Split each renderer's CPU percent evenly across the tabs it hosts"""
+    per_tab = {}
+    for pid, tab_ids in pid_tabs.items():
+        percent = cpu.get(pid)
+        if percent is None or not tab_ids:
+            continue
+        for tab_id in tab_ids:
+            per_tab[tab_id] = percent / len(tab_ids)
+    return per_tab
+
+
+def apportion_memory(pid_tabs, usage):
+    """Split each renderer's memory across the tabs it hosts
+
+    pid_tabs maps renderer PID -> tab IDs, usage maps PID -> (pss, uss).
+    Returns {tab_id: bytes}; tabs whose renderer couldn't be sampled are left out.
+    """
+    per_tab = {}
+    for pid, tab_ids in pid_tabs.items():
+        sample = usage.get(pid)
+        if sample is None or not tab_ids:
+            continue
+        share = sample[0] // len(tab_ids)
+        for tab_id in tab_ids:
+            per_tab[tab_id] = share
+    return per_tab
+
+
+class RendererMemorySampler(QObject):
+    """Attributes Chromium renderer memory and CPU to tabs
+
+    Page memory lives in the renderer processes, not in the browser process
+    psutil.Process() looks at. On every tick the GUI thread groups tabs by
+    the renderer PID recorded in the registry and hands that map to a worker
+    thread, which reads PSS/USS and CPU use of each renderer and splits
+    shared renderers evenly across their tabs. Results arrive back on the
+    GUI thread through ``sampled`` and ``cpu_sampled``; memory is stored on
+    the registry entries.
+    """
+
+    sampled = pyqtSignal(object)      # {tab_id: bytes}
+    cpu_sampled = pyqtSignal(object)  # {tab_id: percent of one core}
+    _sample_ready = pyqtSignal(object, object, object)  # Worker -> GUI thread
+
+    def __init__(self, registry, interval=5000, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.renderer_bytes = 0   # PSS of all renderers in the last sample
+        self.renderer_count = 0
+        self._requests = queue.Queue(maxsize=1)
+        self._thread = None
+        self._sample_ready.connect(self._apply)
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.sample)
+
+    def start(self):
+        """Start periodic sampling"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='sledge-renderer-memory', daemon=True)
+            self._thread.start()
+        self.timer.start()
+        self.sample()
+
+    def stop(self):
+        self.timer.stop()
+        if self._thread is not None:
+            try:
+                self._requests.get_nowait()  # Drop a pending sample so the stop fits
+            except queue.Empty:
+                pass
+            self._requests.put(None)
+            self._thread.join(1.0)
+            self._thread = None
+
+    def sample(self):
+        """Queue a sample of the current renderer -> tabs map; skipped while one is running"""
+        pid_tabs = {}
+        for entry in self.registry.entries():
+            if entry.pid:
+                pid_tabs.setdefault(entry.pid, []).append(entry.id)
+        try:
+            self._requests.put_nowait(pid_tabs)
+        except queue.Full:
+            pass
+
+    def _run(self):
+        processes = {}  # Only touched on this thread
+        while True:
+            pid_tabs = self._requests.get()
+            if pid_tabs is None:
+                return
+            usage = {}
+            cpu = {}
+            for pid in pid_tabs:
+                sample = process_memory(pid)
+                if sample is not None:
+                    usage[pid] = sample
+                    cpu[pid] = process_cpu(processes, pid)
+            for pid in set(processes) - set(pid_tabs):
+                del processes[pid]
+            self._sample_ready.emit(pid_tabs, usage, cpu)
+
+    def _apply(self, pid_tabs, usage, cpu):
+        per_tab = apportion_memory(pid_tabs, usage)
+        for tab_id in self.registry:
+            self.registry.set_memory(tab_id, per_tab.get(tab_id, 0))
+        self.renderer_bytes = sum(pss for pss, _ in usage.values())
+        self.renderer_count = len(usage)
+        self.sampled.emit(per_tab)
+        self.cpu_sampled.emit(apportion_cpu(pid_tabs, cpu))
+
+
+class MetricsFeed(QObject):
+    """Delivers SystemSampler snapshots to the GUI thread as a signal"""
+
+    snapshot = pyqtSignal(object)  # MetricsSnapshot
+
+    def __init__(self, sampler, parent=None):
+        super().__init__(parent)
+        self.sampler = sampler
+        # Emitted from the sampler thread, so connections are queued to the receivers' thread
+        self._emit = self.snapshot.emit
+        sampler.subscribe(self._emit)
+
+    def latest(self):
+        return self.sampler.latest()
+
+    def history(self, count=None):
+        return self.sampler.history(count)
+
+    def close(self):
+        self.sampler.unsubscribe(self._emit)
@@ -0,0 +1,132 @@
+import time
+import zlib
+
+from PyQt6.QtCore import QBuffer, QByteArray, QDataStream, QIODevice, QUrl, Qt
+from PyQt6.QtGui import QIcon, QImage, QPixmap
+
+THUMBNAIL_WIDTH = 192
+THUMBNAIL_QUALITY = 60
+ICON_SIZE = 16
+
+# Chromium restores the history's current entry itself; the scroll offset is
+# applied once the page has painted, two frames in so layout has settled.
+SCROLL_SCRIPT = """
+(function(x, y) {
+    requestAnimationFrame(function() {
+        requestAnimationFrame(function() { window.scrollTo(x, y); });
+    });
+})(%r, %r);
+"""
+
+
+def encode_image(image, fmt, quality=-1):
+    """QImage -> bytes in the given format, b'' for a null image"""
+    if image.isNull():
+        return b''
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, fmt, quality)
+    buffer.close()
+    return bytes(data)
+
+
+def make_thumbnail(image, width=THUMBNAIL_WIDTH):
+    """Downscale a page grab to a small JPEG"""
+    if image.isNull():
+        return b''
+    if image.width() > width:
+        image = image.scaledToWidth(width, Qt.TransformationMode.SmoothTransformation)
+    return encode_image(image.convertToFormat(QImage.Format.Format_RGB32), 'JPEG', THUMBNAIL_QUALITY)
+
+
+def save_history(history):
+    """Serialize a QWebEngineHistory, compressed"""
+    data = QByteArray()
+    stream = QDataStream(data, QIODevice.OpenModeFlag.WriteOnly)
+    stream << history
+    return zlib.compress(bytes(data)) if not data.isEmpty() else b''
+
+
+def load_history(blob, history):
+    """Replace a QWebEngineHistory with one saved by save_history"""
+    stream = QDataStream(QByteArray(zlib.decompress(blob)), QIODevice.OpenModeFlag.ReadOnly)
+    stream >> history
+    return stream.status() == QDataStream.Status.Ok
+
+
+class TabSnapshot:
+    """What's kept of a hibernated tab
+
+    The back/forward stack is the page's QWebEngineHistory as written by
+    QDataStream, zlib-compressed, and it's read back in a single step on wake.
+    With a 192px JPEG thumbnail and a 16px PNG favicon a snapshot is typically
+    a few KB.
+    """
+
+    __slots__ = ('url', 'title', 'history', 'scroll', 'thumbnail', 'icon', 'created')
+
+    def __init__(self, url, title='', history=b'', scroll=(0.0, 0.0), thumbnail=b'', icon=b'',
+                 created=None):
+        self.url = url
+        self.title = title
+        self.history = history      # save_history() blob
+        self.scroll = scroll        # (x, y) in CSS pixels
+        self.thumbnail = thumbnail  # JPEG
+        self.icon = icon            # PNG
+        self.created = created or time.time()
+
+    def __repr__(self):
+        return f"TabSnapshot(url={self.url!r}, size={self.size()})"
+
+    @classmethod
+    def capture(cls, view, title='', thumbnail=None, url=None):
+        """Snapshot a live QWebEngineView; call before it's destroyed
+
+        Hidden views can't be grabbed, so background tabs get no thumbnail
+        unless one is passed in. A url given here, e.g. of a load that was
+        still queued, replaces the view's; its history is then left out, as
+        waking would load the history's current entry instead.
+        """
+        page = view.page()
+        position = page.scrollPosition()
+        icon = page.icon()
+        return cls(
+            url or view.url().toString(),
+            title or page.title(),
+            history=b'' if url else save_history(page.history()),
+            scroll=(position.x(), position.y()),
+            thumbnail=thumbnail if thumbnail is not None else (
+                make_thumbnail(view.grab().toImage()) if view.isVisible() else b''),
+            icon=encode_image(icon.pixmap(ICON_SIZE, ICON_SIZE).toImage(), 'PNG') if not icon.isNull() else b'',
+        )
+
+    def restore(self, view):
+        """Load the snapshot into a fresh view: history first, then scroll after first paint"""
+        x, y = self.scroll
+        if x or y:
+            def scroll(ok):
+                view.loadFinished.disconnect(scroll)
+                if ok:
+                    view.page().runJavaScript(SCROLL_SCRIPT % (x, y))
+            view.loadFinished.connect(scroll)
+
+        if not (self.history and load_history(self.history, view.page().history())):
+            view.setUrl(QUrl(self.url))
+
+    def size(self):
+        """Bytes held by the snapshot's payloads"""
+        return (len(self.history) + len(self.thumbnail) + len(self.icon)
+                + len(self.url) + len(self.title))
+
+    def thumbnail_pixmap(self):
+        pixmap = QPixmap()
+        if self.thumbnail:
+            pixmap.loadFromData(self.thumbnail, 'JPEG')
+        return pixmap
+
+    def favicon(self):
+        pixmap = QPixmap()
+        if self.icon:
+            pixmap.loadFromData(self.icon, 'PNG')
+        return QIcon(pixmap) if not pixmap.isNull() else QIcon()
@@ -1,98 +1,182 @@
-class TabSpreadView(QWidget):
-    def __init__(self, parent=None):
+from collections import OrderedDict
+
+from PyQt6.QtCore import QRect, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QPen, QPixmap
+from PyQt6.QtWidgets import QAbstractItemView, QListView, QStyle, QStyledItemDelegate
+
+from .appearance import STATE_COLORS
+from .model import TabFilterModel, TabRoles
+
+TILE_SIZE = QSize(200, 150)
+THUMBNAIL_SIZE = QSize(184, 104)
+TILE_SPACING = 10
+PIXMAP_CACHE = 256   # Scaled thumbnails kept by the delegate
+
+
+class TabPreviewDelegate(QStyledItemDelegate):
+    """Paints one tab tile: thumbnail, title, group colour and state
+
+    Only tiles the view asks for are painted, and thumbnails are pulled from
+    the model (the thumbnail service) the first time a tile shows, then kept
+    scaled in a small LRU until the model reports a new one.
+    """
+
+    def __init__(self, group_color=None, parent=None):
         super().__init__(parent)
-        self.tab_widget = parent
-        self.init_ui()
-        
-    def init_ui(self):
-        layout = QGridLayout()
-        self.setLayout(layout)
-        
-        # Search bar at the top
-        self.search_bar = QLineEdit()
-        self.search_bar.setPlaceholderText("Search tabs...")
-        self.search_bar.textChanged.connect(self.filter_tabs)
-        layout.addWidget(self.search_bar, 0, 0, 1, -1)
-        
-        # Grid for tab previews
-        self.grid = QGridLayout()
-        layout.addLayout(self.grid, 1, 0)
-        
-        self.update_previews()
-        
-    def update_previews(self):
-        # Clear existing previews
-        for i in reversed(range(self.grid.count())): 
-            self.grid.itemAt(i).widget().setParent(None)
-            
-        # Create new previews
-        row = 0
-        col = 0
-        max_cols = 3  # Adjust based on window width
-        
-        for index in range(self.tab_widget.count()):
-            preview = self.create_tab_preview(index)
-            self.grid.addWidget(preview, row, col)
-            
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
-                
-    def create_tab_preview(self, index):
-        tab = self.tab_widget.widget(index)
-        preview = QWidget()
-        preview.setMinimumSize(300, 200)
-        
-        layout = QVBoxLayout()
-        preview.setLayout(layout)
-        
+        self.group_color = group_color or (lambda name: None)
+        self._pixmaps = OrderedDict()   # tab_id -> QPixmap
+
+    def sizeHint(self, option, index):
+        return TILE_SIZE
+
+    def forget(self, tab_id=None):
+        """Drop cached pixmaps, of one tab or all"""
+        if tab_id is None:
+            self._pixmaps.clear()
+        else:
+            self._pixmaps.pop(tab_id, None)
+
+    def data_changed(self, top_left, bottom_right, roles):
+        if roles and TabRoles.THUMBNAIL not in roles:
+            return
+        model = top_left.model()
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self.forget(model.index(row, 0).data(TabRoles.TAB_ID))
+
+    def thumbnail(self, index):
+        tab_id = index.data(TabRoles.TAB_ID)
+        pixmap = self._pixmaps.get(tab_id)
+        if pixmap is None:
+            image = index.data(TabRoles.THUMBNAIL)
+            pixmap = QPixmap()
+            if image is not None and not image.isNull():
+                pixmap = QPixmap.fromImage(image).scaled(
+                    THUMBNAIL_SIZE, Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation)
+            self._pixmaps[tab_id] = pixmap
+            if len(self._pixmaps) > PIXMAP_CACHE:
+                self._pixmaps.popitem(last=False)
+        else:
+            self._pixmaps.move_to_end(tab_id)
+        return pixmap
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+        # Tile
+        background = QColor('#434c5e') if selected else QColor('#3b4252') if hovered else QColor('#2e3440')
+        painter.setPen(QPen(QColor('#88c0d0'), 2) if selected else Qt.PenStyle.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(rect, 8, 8)
+
+        # Thumbnail, or the favicon when there is none yet
+        frame = QRect(rect.left() + (rect.width() - THUMBNAIL_SIZE.width()) // 2, rect.top() + 8,
+                      THUMBNAIL_SIZE.width(), THUMBNAIL_SIZE.height())
+        pixmap = self.thumbnail(index)
+        if not pixmap.isNull():
+            target = QRect(0, 0, pixmap.width(), pixmap.height())
+            target.moveCenter(frame.center())
+            painter.drawPixmap(target, pixmap)
+        else:
+            painter.fillRect(frame, QColor('#3b4252'))
+            icon = index.data(Qt.ItemDataRole.DecorationRole)
+            if icon is not None and not icon.isNull():
+                icon.paint(painter, QRect(frame.center().x() - 16, frame.center().y() - 16, 32, 32))
+
+        # Group colour strip along the thumbnail's top edge
+        color = self.group_color(index.data(TabRoles.GROUP))
+        if color is not None:
+            painter.fillRect(QRect(frame.left(), frame.top(), frame.width(), 3), color)
+
+        # State marker
+        state_color = STATE_COLORS.get(index.data(TabRoles.STATE))
+        if state_color is not None:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(state_color)
+            painter.drawEllipse(frame.right() - 12, frame.top() + 6, 8, 8)
+
         # Title
-        title = QLabel(self.tab_widget.tabText(index))
-        title.setAlignment(Qt.AlignCenter)
-        layout.addWidget(title)
-        
-        # Thumbnail (if available)
-        if hasattr(tab, 'grab'):
-            thumbnail = tab.grab().scaled(280, 150, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            thumb_label = QLabel()
-            thumb_label.setPixmap(thumbnail)
-            thumb_label.setAlignment(Qt.AlignCenter)
-            layout.addWidget(thumb_label)
-            
-        # Make the preview clickable
-        preview.mousePressEvent = lambda e: self.select_tab(index)
-        preview.setCursor(Qt.PointingHandCursor)
-        preview.setStyleSheet("""
-            QWidget {
-                background: palette(base);
-                border: 1px solid palette(mid);
-                border-radius: 5px;
-                padding: 10px;
-            }
-            QWidget:hover {
-                background: palette(alternate-base);
-                border-color: palette(highlight);
-            }
-        """)
-        
-        return preview
-        
+        text_rect = QRect(rect.left() + 8, frame.bottom() + 6, rect.width() - 16, rect.bottom() - frame.bottom() - 8)
+        title = option.fontMetrics.elidedText(index.data(Qt.ItemDataRole.DisplayRole) or "",
+                                              Qt.TextElideMode.ElideRight, text_rect.width())
+        painter.setPen(QColor('#88c0d0') if selected else QColor('#d8dee9'))
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignVCenter, title)
+        painter.restore()
+
+
+class TabSpreadView(QListView):
+    """Overview grid of a TabWidget's tabs
+
+    A view on the shared TabListModel through a TabFilterModel: nothing is
+    created per tab, the delegate paints the tiles in view, so opening it
+    costs the same with ten tabs or a thousand. Arrow keys move between
+    tiles, Enter or a click picks one (``tab_selected`` with its index).
+    """
+
+    tab_selected = pyqtSignal(int)   # Tab index
+
+    def __init__(self, tab_widget, parent=None):
+        super().__init__(parent)
+        self.tab_widget = tab_widget
+        self.tab_filter = TabFilterModel(tab_widget.tab_model, self)
+        self.setModel(self.tab_filter)
+
+        self.preview_delegate = TabPreviewDelegate(self._group_color, self)
+        self.setItemDelegate(self.preview_delegate)
+        tab_widget.tab_model.dataChanged.connect(self._source_changed)
+
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setMovement(QListView.Movement.Static)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(200)
+        self.setUniformItemSizes(True)
+        self.setGridSize(TILE_SIZE + QSize(TILE_SPACING, TILE_SPACING))
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self.setStyleSheet("QListView { background: #242933; border: none; }")
+
+        self.clicked.connect(self._activate)
+
+    def set_group(self, group):
+        """Show one group's tabs (UNGROUPED for tabs outside groups, None for all)"""
+        self.tab_filter.set_group(group)
+
+    def set_text(self, text):
+        self.tab_filter.set_text(text)
+
     def select_tab(self, index):
-        self.tab_widget.setCurrentIndex(index)
-        self.hide()  # Close the spread view after selection
-        
-    def filter_tabs(self, text):
-        text = text.lower()
-        for i in range(self.grid.count()):
-            item = self.grid.itemAt(i)
-            if item and item.widget():
-                widget = item.widget()
-                title = widget.layout().itemAt(0).widget().text().lower()
-                widget.setVisible(text in title)
-                
-    def showEvent(self, event):
-        super().showEvent(event)
-        self.update_previews()
-        self.search_bar.setFocus()
-        self.search_bar.clear() 
\ No newline at end of file
+        """Put the cursor on the tile of the tab at index, or the first tile"""
+        source = self.tab_widget.tab_model
+        row = source.row_of(self.tab_widget.tab_id(index))
+        current = self.tab_filter.mapFromSource(source.index(row, 0)) if row >= 0 else None
+        if current is None or not current.isValid():
+            current = self.tab_filter.index(0, 0)
+        if current.isValid():
+            self.setCurrentIndex(current)
+            self.scrollTo(current)
+
+    def keyPressEvent(self, event):
+        """Enter picks the tile under the cursor; arrows and paging move it as usual"""
+        if event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter) and self.currentIndex().isValid():
+            self._activate(self.currentIndex())
+            event.accept()
+            return
+        super().keyPressEvent(event)
+
+    def _group_color(self, name):
+        group = self.tab_widget.groups.get(name) if name else None
+        return group.color if group is not None else None
+
+    def _source_changed(self, top_left, bottom_right, roles):
+        self.preview_delegate.data_changed(top_left, bottom_right, roles)
+
+    def _activate(self, index):
+        tab_index = self.tab_widget.registry.index_of(index.data(TabRoles.TAB_ID))
+        if tab_index >= 0:
+            self.tab_selected.emit(tab_index)
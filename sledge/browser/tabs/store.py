@@ -0,0 +1,163 @@
+import glob
+import itertools
+import os
+import sqlite3
+import sys
+
+import psutil
+
+from .snapshots import TabSnapshot
+
+STORE_DIR = os.path.expanduser('~/.sledge/hibernated')
+
+_store_numbers = itertools.count(1)
+
+
+def _remove_stale_stores(directory):
+    """Delete the databases of sledge processes that are no longer running"""
+    for path in glob.glob(os.path.join(directory, '*.db*')):
+        pid = os.path.basename(path).split('-', 1)[0]
+        if pid.isdigit() and int(pid) != os.getpid() and not psutil.pid_exists(int(pid)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class StoredTab:
+    """Resident index entry for a hibernated tab; the payload stays on disk"""
+
+    __slots__ = ('url', 'title', 'group', 'size')
+
+    def __init__(self, url, title, group, size):
+        self.url = url
+        self.title = title
+        self.group = group
+        self.size = size  # Bytes of the row's payloads
+
+    def __repr__(self):
+        return f"StoredTab(url={self.url!r}, group={self.group!r}, size={self.size})"
+
+
+class HibernatedTabStore:
+    """SQLite store for the snapshots of hibernated tabs
+
+    Only URL, title, group and payload size stay in memory; history blobs,
+    thumbnails and favicons are read back when a tab is woken or previewed.
+    Tab IDs only live as long as their TabWidget, so each one gets its own
+    database under ~/.sledge/hibernated, deleted on close or by the next
+    process to start after a crash.
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            os.makedirs(STORE_DIR, exist_ok=True)
+            _remove_stale_stores(STORE_DIR)
+            path = os.path.join(STORE_DIR, f'{os.getpid()}-{next(_store_numbers)}.db')
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        # Scratch data: losing the tail of it in a crash only costs the snapshots
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=OFF')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS snapshots (
+                tab_id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT,
+                group_name TEXT,
+                scroll_x REAL,
+                scroll_y REAL,
+                created REAL,
+                history BLOB,
+                thumbnail BLOB,
+                icon BLOB
+            )
+        ''')
+        self.index = {}  # tab_id -> StoredTab
+
+    def close(self):
+        self._conn.close()
+        if self.path != ':memory:':
+            for path in (self.path, self.path + '-wal', self.path + '-shm'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, tab_id):
+        return tab_id in self.index
+
+    def put(self, tab_id, snapshot, group=None):
+        self.put_many([(tab_id, snapshot, group)])
+
+    def put_many(self, items):
+        """Store (tab_id, snapshot, group) triples in one transaction"""
+        rows = [(tab_id, s.url, s.title, group, s.scroll[0], s.scroll[1], s.created,
+                 s.history, s.thumbnail, s.icon) for tab_id, s, group in items]
+        with self._conn:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        for tab_id, snapshot, group in items:
+            self.index[tab_id] = StoredTab(snapshot.url, snapshot.title, group, snapshot.size())
+
+    def get(self, tab_id):
+        """Read a tab's snapshot back, None if it isn't stored"""
+        if tab_id not in self.index:
+            return None
+        row = self._conn.execute(
+            'SELECT url, title, scroll_x, scroll_y, created, history, thumbnail, icon '
+            'FROM snapshots WHERE tab_id = ?', (tab_id,)).fetchone()
+        if row is None:
+            return None
+        url, title, x, y, created, history, thumbnail, icon = row
+        return TabSnapshot(url, title, history or b'', (x, y), thumbnail or b'', icon or b'', created)
+
+    def take_many(self, tab_ids):
+        """Read and remove several snapshots in one transaction; returns {tab_id: snapshot}"""
+        tab_ids = [tab_id for tab_id in tab_ids if tab_id in self.index]
+        with self._conn:
+            snapshots = {tab_id: self.get(tab_id) for tab_id in tab_ids}
+            self._conn.executemany('DELETE FROM snapshots WHERE tab_id = ?',
+                                   [(tab_id,) for tab_id in tab_ids])
+        for tab_id in tab_ids:
+            del self.index[tab_id]
+        return {tab_id: s for tab_id, s in snapshots.items() if s is not None}
+
+    def take(self, tab_id):
+        return self.take_many([tab_id]).get(tab_id)
+
+    def thumbnail(self, tab_id):
+        """JPEG thumbnail of a stored tab without loading the rest of its row"""
+        if tab_id not in self.index:
+            return b''
+        row = self._conn.execute('SELECT thumbnail FROM snapshots WHERE tab_id = ?',
+                                 (tab_id,)).fetchone()
+        return (row[0] or b'') if row else b''
+
+    def discard(self, tab_id):
+        """Drop a tab's snapshot, e.g. when the tab is closed"""
+        if self.index.pop(tab_id, None) is not None:
+            with self._conn:
+                self._conn.execute('DELETE FROM snapshots WHERE tab_id = ?', (tab_id,))
+
+    def resident_bytes(self):
+        """Approximate memory held by the resident index"""
+        total = sys.getsizeof(self.index)
+        for stored in self.index.values():
+            total += (sys.getsizeof(stored) + sys.getsizeof(stored.url)
+                      + sys.getsizeof(stored.title) + sys.getsizeof(stored.size))
+        return total
+
+    def payload_bytes(self):
+        """Bytes of snapshot payloads stored"""
+        return sum(stored.size for stored in self.index.values())
+
+    def disk_bytes(self):
+        """Bytes of database pages in use"""
+        pages = self._conn.execute('PRAGMA page_count').fetchone()[0]
+        free = self._conn.execute('PRAGMA freelist_count').fetchone()[0]
+        page_size = self._conn.execute('PRAGMA page_size').fetchone()[0]
+        return (pages - free) * page_size
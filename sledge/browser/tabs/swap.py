@@ -0,0 +1,28 @@
+from PyQt6.QtWidgets import QTabWidget
+
+
+def swap_tab_widget(tab_widget, index, widget, title):
+    """Show a different widget for a tab of a QTabWidget with a ``registry``
+
+    The tab keeps its registry ID, group and state. The old widget is
+    deleted; removeTab alone would keep a replaced web view, its page and
+    renderer alive. A current tab stays current without currentChanged
+    firing, since removing it would otherwise select (and wake) its
+    neighbour. Returns the tab's ID.
+    """
+    registry = tab_widget.registry
+    tab_id = registry.id_at(index)
+    old = tab_widget.widget(index)
+    was_current = index == tab_widget.currentIndex()
+    blocked = tab_widget.blockSignals(was_current)
+    try:
+        with registry.replacing(tab_id):
+            tab_widget.removeTab(index)
+            tab_widget.insertTab(index, widget, title)
+        if was_current:
+            QTabWidget.setCurrentIndex(tab_widget, index)
+    finally:
+        tab_widget.blockSignals(blocked)
+    if old is not None and old is not widget:
+        old.deleteLater()   # Takes its page along, which is parented to it
+    return tab_id
@@ -0,0 +1,187 @@
+import hashlib
+import os
+import queue
+import threading
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from .snapshots import make_thumbnail
+
+THUMBNAIL_DIR = os.path.expanduser('~/.sledge/thumbnails')
+CACHE_BUDGET = 16 * 1024 * 1024   # Bytes of JPEG kept in memory
+DISK_LIMIT = 2000                 # Thumbnail files kept on disk
+
+
+def thumbnail_path(directory, url):
+    """Where the thumbnail of a URL is kept; by URL so it outlives tab IDs"""
+    return os.path.join(directory, hashlib.sha1(url.encode()).hexdigest() + '.jpg')
+
+
+class ThumbnailCache:
+    """Least recently used JPEG thumbnails by tab ID, bounded in total bytes
+
+    Each thumbnail carries the navigation generation it was captured at, so
+    one taken before the tab navigated away isn't mistaken for the new page.
+    """
+
+    def __init__(self, budget=CACHE_BUDGET):
+        self.budget = budget
+        self.bytes = 0
+        self._entries = OrderedDict()   # tab_id -> (generation, data)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, tab_id):
+        return tab_id in self._entries
+
+    def get(self, tab_id, generation=None):
+        """The thumbnail of a tab, None if missing or from another generation"""
+        entry = self._entries.get(tab_id)
+        if entry is None or (generation is not None and entry[0] != generation):
+            return None
+        self._entries.move_to_end(tab_id)
+        return entry[1]
+
+    def put(self, tab_id, generation, data):
+        """Store a thumbnail; returns the tab IDs evicted to stay within budget"""
+        self.discard(tab_id)
+        self._entries[tab_id] = (generation, data)
+        self.bytes += len(data)
+        evicted = []
+        while self.bytes > self.budget and len(self._entries) > 1:
+            old_id, (_, old) = self._entries.popitem(last=False)
+            self.bytes -= len(old)
+            evicted.append(old_id)
+        return evicted
+
+    def discard(self, tab_id):
+        entry = self._entries.pop(tab_id, None)
+        if entry is not None:
+            self.bytes -= len(entry[1])
+
+
+class ThumbnailService(QObject):
+    """Tab thumbnails captured as pages change, not when they're shown
+
+    The tab widget calls capture() when a page finishes loading and when its
+    tab is about to be left, while the view is still on screen. Only the
+    grab happens on the GUI thread; downscaling and JPEG encoding run on a
+    worker thread (QImage is safe to use there) and the result lands in a
+    ThumbnailCache and on disk, keyed by URL, so hibernated and restored
+    tabs have a preview straight away. ``ready`` announces each new one.
+
+    navigated() bumps a tab's generation; captures still in flight for the
+    previous page are dropped when they arrive.
+    """
+
+    ready = pyqtSignal(int)   # Tab ID
+    _encoded = pyqtSignal(int, int, str, bytes)   # Worker -> GUI thread
+
+    def __init__(self, directory=THUMBNAIL_DIR, budget=CACHE_BUDGET, parent=None):
+        super().__init__(parent)
+        self.directory = directory
+        self.cache = ThumbnailCache(budget)
+        self._generations = {}   # tab_id -> navigation count
+        self._requests = queue.Queue()
+        self._thread = None
+        self._encoded.connect(self._store)
+
+    def generation(self, tab_id):
+        return self._generations.get(tab_id, 0)
+
+    def navigated(self, tab_id):
+        """The tab left its page; its thumbnail no longer applies"""
+        self._generations[tab_id] = self.generation(tab_id) + 1
+        self.cache.discard(tab_id)
+
+    def forget(self, tab_id):
+        self._generations.pop(tab_id, None)
+        self.cache.discard(tab_id)
+
+    def capture(self, tab_id, view):
+        """Grab a visible view and queue it for encoding; returns whether it was queued"""
+        if not view.isVisible() or view.width() <= 0:
+            return False
+        image = view.grab().toImage()
+        if image.isNull():
+            return False
+        self._start()
+        generation = self._generations.setdefault(tab_id, 0)
+        self._requests.put((tab_id, generation, view.url().toString(), image))
+        return True
+
+    def thumbnail(self, tab_id, url=None):
+        """JPEG bytes for a tab, falling back to the one saved for its URL; b'' if none"""
+        data = self.cache.get(tab_id, self.generation(tab_id))
+        if data is None and url:
+            try:
+                with open(thumbnail_path(self.directory, url), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                return b''
+            self.cache.put(tab_id, self.generation(tab_id), data)
+        return data or b''
+
+    def image(self, tab_id, url=None):
+        """Decoded thumbnail, a null QImage if there is none"""
+        data = self.thumbnail(tab_id, url)
+        return QImage.fromData(data, 'JPEG') if data else QImage()
+
+    def stop(self):
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread.join(1.0)
+            self._thread = None
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='sledge-thumbnails', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        self._prune()
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            tab_id, generation, url, image = request
+            data = make_thumbnail(image)
+            if not data:
+                continue
+            if url:
+                self._save(url, data)
+            self._encoded.emit(tab_id, generation, url, data)
+
+    def _save(self, url, data):
+        path = thumbnail_path(self.directory, url)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(data)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            print(f"Error saving thumbnail: {e}")
+
+    def _prune(self, limit=DISK_LIMIT):
+        """Drop the least recently written thumbnails beyond limit"""
+        try:
+            with os.scandir(self.directory) as entries:
+                files = [(entry.stat().st_mtime, entry.path) for entry in entries
+                         if entry.name.endswith('.jpg')]
+        except OSError:
+            return
+        files.sort()
+        for _, path in files[:max(0, len(files) - limit)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _store(self, tab_id, generation, url, data):
+        if self._generations.get(tab_id) != generation:
+            return  # Captured before the tab navigated, or the tab is gone
+        self.cache.put(tab_id, generation, data)
+        self.ready.emit(tab_id)
@@ -1,9 +1,10 @@
 from PyQt6.QtCore import Qt, QPoint, QEvent, QRect, QSize, QTimer, QPointF, QUrl, QPropertyAnimation, QEasingCurve
 from PyQt6.QtWidgets import (
     QTabWidget, QWidget, QHBoxLayout, QVBoxLayout, 
-    QToolButton, QMenu, QLabel, QPushButton, QDockWidget, QDialog, QDialogButtonBox, QLineEdit, QColorDialog, QComboBox, QStackedWidget, QTabBar, QListWidget, QListWidgetItem, QGridLayout, QInputDialog
+    QToolButton, QMenu, QLabel, QPushButton, QDockWidget, QDialog, QDialogButtonBox, QLineEdit, QColorDialog, QComboBox, QStackedWidget, QTabBar, QListWidget, QListWidgetItem, QGridLayout, QInputDialog,
+    QStyle, QListView
 )
-from PyQt6.QtGui import QColor, QCursor, QIcon, QShortcut
+from PyQt6.QtGui import QColor, QCursor, QIcon, QImage, QPainter, QShortcut
 from PyQt6.QtGui import QKeySequence
 from PyQt6.QtWidgets import QApplication, QMainWindow
 from PyQt6.QtWebEngineWidgets import QWebEngineView
@@ -11,10 +12,16 @@ from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
 
 from .states import TabState
 from .groups import TabGroup
+from .appearance import PLAIN_LOOK, paint_tab_look, tab_look
+from .ordering import group_layout, minimal_moves
+from .model import TabFilterModel, TabListModel, TabRoles, tab_matches
+from .thumbnails import ThumbnailService
 from .memory import TabMemoryManager, TabMemoryIndicator
 from .ring_menu import RingMenu
 from .dialogs import TabListDialog, TabSpreadDialog
 from .debug import TabDebugPanel
+from .registry import TabRegistry
+from .swap import swap_tab_widget
 import os
         
         # # Set up tab bar styling and behavior first
@@ -40,6 +47,9 @@ class TabWidget(QTabWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         
+        # Stable tab IDs; all per-tab state below is keyed by them
+        self.registry = TabRegistry()
+        
         # Initialize view pool for instant tab creation
         self.view_pool = []
         self._warm_pool_size = 3
@@ -54,6 +64,18 @@ class TabWidget(QTabWidget):
         # Create enhanced TabBar
         self._tab_bar = TabBar(self)
         self.setTabBar(self._tab_bar)
+        self._tab_bar.tabMoved.connect(self.registry.moved)
+        self.registry.subscribe(self._tab_bar.tab_changed)
+        
+        # One model of the tabs shared by the tab list, previews and search
+        self.tab_model = TabListModel(self.registry, icon_of=self._tab_icon,
+                                      thumbnail_of=self._tab_thumbnail, parent=self)
+        
+        # Thumbnails are captured as pages load and tabs are left, never on show
+        self.thumbnails = ThumbnailService(parent=self)
+        self.thumbnails.ready.connect(
+            lambda tab_id: self.tab_model.refresh(tab_id, [TabRoles.THUMBNAIL]))
+        self._tab_bar.tabBarClicked.connect(self._leaving_current)
         
         # Set up modern styling
         self.setStyleSheet("""
@@ -75,20 +97,16 @@ class TabWidget(QTabWidget):
             }
         """)
         
-        # Initialize memory management
-        self.memory_manager = TabMemoryManager(self)
-        
         # Set up fast tab switching
         self._setup_shortcuts()
         
-        # Initialize tab groups at the widget level
-        self.tab_groups = {}  # Map of tab index to group name
+        # Initialize tab groups at the widget level (tab membership lives in the registry)
         self.groups = {}      # Map of group name to group properties
         
         # Initialize state tracking first
         self.min_group_collapse_threshold = 2
-        self.hibernated_tabs = {} 
-        self.group_representatives = {}
+        self.hibernated_tabs = {}  # {tab_id: {url, title, icon, group}}
+        self.group_representatives = {}  # {group name: tab_id}
         self.collapsed_groups = set()
         self.hibernation_pending = set()
         self.restoration_pending = set()
@@ -358,23 +376,167 @@ class TabWidget(QTabWidget):
     def _handle_tab_change(self, index):
         """Handle tab change event"""
         self._tab_bar.setCurrentIndex(index)
-            
+        tab_id = self.registry.id_at(index)
+        self.registry.touch(tab_id)
+        self.memory_manager.loads.reprioritize()
+        state = self.memory_manager.state_of(index)
+        if state == TabState.HIBERNATED:
+            # Unloaded and hibernated tabs load on first activation, once the switch is done
+            QTimer.singleShot(0, lambda: self._wake_if_current(tab_id))
+        elif state in [TabState.FROZEN, TabState.SNOOZED]:
+            self.memory_manager.governor.thawed(tab_id, "activated")
+            self.memory_manager.wake_tab(index)
+
+    def _wake_if_current(self, tab_id):
+        index = self.registry.index_of(tab_id)
+        if (index >= 0 and index == self.currentIndex()
+                and self.memory_manager.state_of(index) == TabState.HIBERNATED):
+            self.memory_manager.wake_tab(index)
+
+    # Tab identity
+    def tabInserted(self, index):
+        """Give every new tab a registry ID"""
+        super().tabInserted(index)
+        widget = self.widget(index)
+        tab_id = self.registry.inserted(index, widget)
+        url = widget.url().toString() if hasattr(widget, 'url') else ''
+        page = widget.page() if hasattr(widget, 'page') else None
+        pid = page.renderProcessPid() if page is not None else 0
+        self.registry.update(tab_id, url=url, title=self.tabText(index), pid=pid)
+        if hasattr(widget, 'urlChanged'):
+            widget.urlChanged.connect(
+                lambda qurl, tab_id=tab_id: self.registry.update(tab_id, url=qurl.toString()))
+            widget.urlChanged.connect(lambda qurl, tab_id=tab_id: self.thumbnails.navigated(tab_id))
+        if hasattr(widget, 'loadFinished'):
+            widget.loadFinished.connect(lambda ok, tab_id=tab_id: self._page_loaded(tab_id, ok))
+        if page is not None:
+            # Renderers start lazily and are replaced after a crash
+            page.renderProcessPidChanged.connect(
+                lambda pid, tab_id=tab_id: self.registry.update(tab_id, pid=pid))
+            page.lifecycleStateChanged.connect(
+                lambda state, tab_id=tab_id: self.memory_manager.lifecycle_changed(tab_id, state))
+
+    def tabRemoved(self, index):
+        """Drop per-tab state of a closed tab"""
+        super().tabRemoved(index)
+        entry = self.registry.removed(index)
+        if entry is None:
+            return  # Widget swapped by replace_tab, the tab itself stays
+        self.hibernated_tabs.pop(entry.id, None)
+        self.memory_manager.store.discard(entry.id)
+        self.memory_manager.loads.cancel(entry.id)
+        self.memory_manager.governor.forget(entry.id)
+        self.thumbnails.forget(entry.id)
+        if entry.group in self.groups:
+            self.groups[entry.group].remove_tab(entry.id)
+            if self.group_representatives.get(entry.group) == entry.id:
+                remaining = self.groups[entry.group].tabs
+                if remaining:
+                    self.group_representatives[entry.group] = remaining[0]
+                else:
+                    del self.group_representatives[entry.group]
+
+    def setTabText(self, index, text):
+        super().setTabText(index, text)
+        self.registry.update(self.registry.id_at(index), title=text)
+
+    def setTabIcon(self, index, icon):
+        super().setTabIcon(index, icon)
+        self.tab_model.refresh(self.registry.id_at(index), [Qt.ItemDataRole.DecorationRole])
+
+    def _tab_icon(self, tab_id):
+        return self.tabIcon(self.registry.index_of(tab_id))
+
+    def _tab_thumbnail(self, tab_id):
+        data = self.thumbnail_data(tab_id)
+        return QImage.fromData(data, 'JPEG') if data else QImage()
+
+    # Thumbnails
+    def thumbnail_data(self, tab_id):
+        """JPEG thumbnail of a tab from the thumbnail service or its snapshot, b'' if none"""
+        entry = self.registry.entry(tab_id)
+        url = entry.url if entry is not None else None
+        return self.thumbnails.thumbnail(tab_id, url) or self.memory_manager.store.thumbnail(tab_id)
+
+    def capture_thumbnail(self, tab_id):
+        """Capture a tab's thumbnail if it's the one on screen"""
+        index = self.registry.index_of(tab_id)
+        widget = self.widget(index) if index >= 0 else None
+        if index == self.currentIndex() and hasattr(widget, 'page'):
+            self.thumbnails.capture(tab_id, widget)
+
+    def _page_loaded(self, tab_id, ok):
+        if ok and self.registry.index_of(tab_id) == self.currentIndex():
+            # Give the page a moment to paint
+            QTimer.singleShot(300, lambda: self.capture_thumbnail(tab_id))
+
+    def _leaving_current(self, index):
+        """Capture the current tab while it's still visible, before switching away"""
+        if index != self.currentIndex():
+            self.capture_thumbnail(self.tab_id(self.currentIndex()))
+
+    def setCurrentIndex(self, index):
+        self._leaving_current(index)
+        super().setCurrentIndex(index)
+
+    def replace_tab(self, index, widget, title):
+        """Show a different widget for a tab, keeping its ID, group and state"""
+        return swap_tab_widget(self, index, widget, title)
+
+    def tab_id(self, index):
+        """Stable ID of the tab at index"""
+        return self.registry.id_at(index)
+
+    def group_of(self, index):
+        """Group name of the tab at index, None when ungrouped"""
+        entry = self.registry.entry_at(index)
+        return entry.group if entry is not None else None
+
+    def group_indexes(self, group_name):
+        """Current indexes of a group's tabs, in tab order"""
+        group = self.groups.get(group_name)
+        if group is None:
+            return []
+        index_of = self.registry.index_of
+        return sorted(index for index in map(index_of, group.tabs) if index >= 0)
+
+    def representative_index(self, group_name):
+        """Index of the tab standing in for a collapsed group, -1 if none"""
+        tab_id = self.group_representatives.get(group_name)
+        return self.registry.index_of(tab_id) if tab_id is not None else -1
+
+    def _set_tab_group(self, tab_id, group_name):
+        """Move a tab into a group (or out of any group when group_name is None)"""
+        old_group = self.registry.set_group(tab_id, group_name)
+        if old_group == group_name:
+            return
+        if old_group in self.groups:
+            self.groups[old_group].remove_tab(tab_id)
+            if self.group_representatives.get(old_group) == tab_id:
+                remaining = self.groups[old_group].tabs
+                if remaining:
+                    self.group_representatives[old_group] = remaining[0]
+                else:
+                    del self.group_representatives[old_group]
+        if group_name in self.groups:
+            self.groups[group_name].add_tab(tab_id)
+
     def _handle_debug_hibernation(self, index):
         """Handle hibernation request from debug panel"""
         if 0 <= index < self.count():
             tab = self.widget(index)
             if hasattr(tab, 'url'):
-                self.hibernated_tabs[index] = {
+                self.hibernated_tabs[self.tab_id(index)] = {
                     'url': tab.url().toString(),
                     'title': self.tabText(index),
                     'icon': self.tabIcon(index),
-                    'group': self.tab_groups.get(index)
+                    'group': self.group_of(index)
                 }
                 self.debug_panel.refresh_state()
     
     def _handle_debug_restoration(self, index):
         """Handle restoration request from debug panel"""
-        if index in self.hibernated_tabs:
+        if self.tab_id(index) in self.hibernated_tabs:
             self._restore_tab(index)
             self.debug_panel.refresh_state()
     
@@ -388,23 +550,24 @@ class TabWidget(QTabWidget):
             
             # Add tabs to group
             for index in valid_indices:
-                self.tab_groups[index] = group_name
+                self._set_tab_group(self.tab_id(index), group_name)
             
             # Set representative if needed
             if group_name not in self.group_representatives:
-                self.group_representatives[group_name] = valid_indices[0]
+                self.group_representatives[group_name] = self.tab_id(valid_indices[0])
             
             self._organize_tabs()
             self.debug_panel.refresh_state()
     
     def _restore_tab(self, index):
         """Restore a hibernated tab"""
-        if index not in self.hibernated_tabs or index in self.restoration_pending:
+        tab_id = self.tab_id(index)
+        if tab_id not in self.hibernated_tabs or tab_id in self.restoration_pending:
             return
             
         try:
-            self.restoration_pending.add(index)
-            tab_data = self.hibernated_tabs[index]
+            self.restoration_pending.add(tab_id)
+            tab_data = self.hibernated_tabs[tab_id]
             
             # Create new tab with stored data
             new_tab = self.widget(index)
@@ -417,12 +580,12 @@ class TabWidget(QTabWidget):
             self.setTabText(index, tab_data['title'])
             
             # Restore group if needed
-            if 'group' in tab_data:
-                self.tab_groups[index] = tab_data['group']
+            if tab_data.get('group'):
+                self._set_tab_group(tab_id, tab_data['group'])
             
             # Clean up hibernation state
-            del self.hibernated_tabs[index]
-            self.restoration_pending.remove(index)
+            del self.hibernated_tabs[tab_id]
+            self.restoration_pending.remove(tab_id)
             
             # Update debug panel if it exists
             if hasattr(self, 'debug_panel'):
@@ -430,7 +593,7 @@ class TabWidget(QTabWidget):
             
         except Exception as e:
             print(f"Error restoring tab {index}: {e}")
-            self.restoration_pending.remove(index)
+            self.restoration_pending.discard(tab_id)
             # Keep hibernation data in case we want to retry
 
     # Group management methods
@@ -441,22 +604,14 @@ class TabWidget(QTabWidget):
 
     def addTabToGroup(self, index, group_name):
         """Add a tab to a group with visual representation"""
-        if group_name in self.groups:
-            # Remove from any existing group first
-            if index in self.tab_groups:
-                old_group = self.tab_groups[index]
-                if old_group in self.groups:
-                    self.groups[old_group].tabs.remove(index)
-            
-            # Add to new group
-            self.tab_groups[index] = group_name
-            if index not in self.groups[group_name].tabs:
-                self.groups[group_name].tabs.append(index)
-                self.groups[group_name].tabs.sort()  # Keep tabs ordered
+        tab_id = self.tab_id(index)
+        if group_name in self.groups and tab_id is not None:
+            # Moves the tab out of any existing group first
+            self._set_tab_group(tab_id, group_name)
             
             # If this is the first tab in the group, make it the representative
             if len(self.groups[group_name].tabs) == 1:
-                self.group_representatives[group_name] = index
+                self.group_representatives[group_name] = tab_id
             
             # Ensure group is initially collapsed if it meets the threshold
             if len(self.groups[group_name].tabs) >= self.min_group_collapse_threshold:
@@ -465,10 +620,10 @@ class TabWidget(QTabWidget):
             # Update the group representative if needed
             if group_name in self.group_representatives:
                 rep_tab = self.group_representatives[group_name]
-                if not hasattr(self.widget(rep_tab), 'url'):
+                if not hasattr(self.registry.widget(rep_tab), 'url'):
                     # Current representative is invalid, choose a new one
                     valid_tabs = [i for i in self.groups[group_name].tabs 
-                                if hasattr(self.widget(i), 'url')]
+                                if hasattr(self.registry.widget(i), 'url')]
                     if valid_tabs:
                         self.group_representatives[group_name] = valid_tabs[0]
             
@@ -510,7 +665,8 @@ class TabWidget(QTabWidget):
         """Organize tabs by groups with improved behavior"""
         # Store current state
         current_index = self.currentIndex()
-        current_group = self.tab_groups.get(current_index)
+        current_id = self.tab_id(current_index)
+        current_group = self.group_of(current_index)
         
         # Update status container visibility first
         self.status_container.setVisible(bool(current_group and current_group in self.groups))
@@ -521,94 +677,40 @@ class TabWidget(QTabWidget):
         else:
             self.breadcrumb_container.hide()
         
-        # Collect tabs by group
-        grouped_tabs = {}
-        ungrouped = []
-        
-        for i in range(self.count()):
-            group = self.tab_groups.get(i)
-            if group:
-                if group not in grouped_tabs:
-                    grouped_tabs[group] = []
-                grouped_tabs[group].append(i)
-            else:
-                ungrouped.append(i)
-
-        # Track visible tabs for selection cursor
-        visible_tabs = []
-        
         if reorder:
-            # First, hide all tabs
-            for i in range(self.count()):
-                self._tab_bar.setTabVisible(i, False)
-
-            # Build new order
-            new_order = []
-            expanded_group = None
-            
-            # Find expanded group if any
-            for group_name in grouped_tabs:
-                if group_name not in self.collapsed_groups:
-                    expanded_group = group_name
-                    break
-            
-            if expanded_group:
-                # Show expanded group's tabs
-                group_tabs = sorted(grouped_tabs[expanded_group])
-                new_order.extend(group_tabs)
-                for tab_idx in group_tabs:
-                    self._tab_bar.setTabVisible(tab_idx, True)
-                    visible_tabs.append(tab_idx)
-                
-                # Ensure current tab stays visible if in this group
-                if current_group == expanded_group:
-                    if current_index not in visible_tabs:
-                        visible_tabs.append(current_index)
-                        self._tab_bar.setTabVisible(current_index, True)
-            else:
-                # Show group representatives and ungrouped tabs
-                for group_name, tabs in grouped_tabs.items():
-                    if not tabs:  # Skip empty groups
-                        continue
-                        
-                    # Choose representative tab
-                    rep_tab = self.group_representatives.get(group_name)
-                    if rep_tab is None or rep_tab not in tabs:
-                        # Prefer current tab as representative
-                        if current_index in tabs:
-                            rep_tab = current_index
-                        else:
-                            rep_tab = tabs[0]
-                        self.group_representatives[group_name] = rep_tab
-                    
-                    # Only add representative if it's a valid tab
-                    if rep_tab >= 0 and rep_tab < self.count():
-                        new_order.append(rep_tab)
-                        self._tab_bar.setTabVisible(rep_tab, True)
-                        visible_tabs.append(rep_tab)
-                
-                # Add ungrouped tabs
-                for tab_idx in ungrouped:
-                    new_order.append(tab_idx)
-                    self._tab_bar.setTabVisible(tab_idx, True)
-                    visible_tabs.append(tab_idx)
-
-            # Move tabs safely
-            for i, target_idx in enumerate(new_order):
-                current_idx = self._tab_bar.tabAt(self._tab_bar.tabRect(i).center())
-                if current_idx != target_idx and current_idx >= 0:
-                    self._tab_bar.moveTab(current_idx, i)
+            order, visible_tabs, chosen = group_layout(
+                self.registry.entries(), self.collapsed_groups,
+                self.group_representatives, current_id)
+            self.group_representatives.update(chosen)
+            
+            # Fewest moves from the current order, then only the visibility
+            # changes; the bar repaints once at the end
+            self._tab_bar.setUpdatesEnabled(False)
+            try:
+                for from_index, to_index in minimal_moves(list(self.registry), order):
+                    self._tab_bar.moveTab(from_index, to_index)
+                shown = set(visible_tabs)
+                for index, tab_id in enumerate(self.registry):
+                    visible = tab_id in shown
+                    if self._tab_bar.isTabVisible(index) != visible:
+                        self._tab_bar.setTabVisible(index, visible)
+            finally:
+                self._tab_bar.setUpdatesEnabled(True)
+        else:
+            visible_tabs = [tab_id for tab_id in self.registry
+                            if self._tab_bar.isTabVisible(self.registry.index_of(tab_id))]
         
         # Update selection cursor
-        if self.selection_cursor not in visible_tabs:
-            self.selection_cursor = visible_tabs[0] if visible_tabs else 0
+        visible_indexes = [self.registry.index_of(tab_id) for tab_id in visible_tabs]
+        if self.selection_cursor not in visible_indexes:
+            self.selection_cursor = visible_indexes[0] if visible_indexes else 0
         
         # Ensure current tab stays visible and selected
-        if current_index not in visible_tabs:
+        if current_id not in visible_tabs:
             if current_group and current_group in self.group_representatives:
-                self.setCurrentIndex(self.group_representatives[current_group])
-            elif visible_tabs:
-                self.setCurrentIndex(visible_tabs[0])
+                self.setCurrentIndex(self.representative_index(current_group))
+            elif visible_indexes:
+                self.setCurrentIndex(visible_indexes[0])
         
         self.update_tab_appearances()
 
@@ -618,7 +720,8 @@ class TabWidget(QTabWidget):
             return
             
         current_index = self.currentIndex()
-        current_group = self.tab_groups.get(current_index)
+        current_group = self.group_of(current_index)
+        was_collapsed = set(self.collapsed_groups)
         
         if group_name in self.collapsed_groups:
             # Expanding this group - collapse others first
@@ -631,7 +734,7 @@ class TabWidget(QTabWidget):
             
             # Show first tab in group if current tab isn't in this group
             if current_group != group_name:
-                group_tabs = sorted(self.groups[group_name].tabs)
+                group_tabs = self.group_indexes(group_name)
                 if group_tabs:
                     self.setCurrentIndex(group_tabs[0])
                     self.selection_cursor = group_tabs[0]
@@ -641,38 +744,38 @@ class TabWidget(QTabWidget):
             
             # Ensure current tab becomes representative if it's in this group
             if current_group == group_name:
-                self.group_representatives[group_name] = current_index
+                self.group_representatives[group_name] = self.tab_id(current_index)
             
             # Update selection cursor
-            if self.selection_cursor in self.groups[group_name].tabs:
-                self.selection_cursor = self.group_representatives[group_name]
+            if self.group_of(self.selection_cursor) == group_name:
+                self.selection_cursor = self.representative_index(group_name)
+        
+        # Hidden tabs are hibernated first, so rescore the groups that changed
+        for changed in was_collapsed ^ self.collapsed_groups:
+            self.memory_manager.scheduler.group_changed(changed)
         
         self._organize_tabs()
 
     def remove_from_group(self, index):
         """Remove a tab from its group"""
-        if index in self.tab_groups:
-            group_name = self.tab_groups[index]
-            self.groups[group_name].tabs.remove(index)
-            del self.tab_groups[index]
+        tab_id = self.tab_id(index)
+        if tab_id is not None and self.group_of(index):
+            self._set_tab_group(tab_id, None)
             self.check_and_collapse_groups()
 
     # Collapse management methods
     def check_and_collapse_groups(self):
         """Force collapse all eligible groups"""
         changed = False
-        for group_name in list(self.groups.keys()):
-            group_tabs = [i for i in range(self.count()) 
-                         if self.tab_groups.get(i) == group_name]
-            
-            if len(group_tabs) >= self.min_group_collapse_threshold:
+        current_id = self.tab_id(self.currentIndex())
+        for group_name, group in self.groups.items():
+            if len(group.tabs) >= self.min_group_collapse_threshold:
                 if group_name not in self.collapsed_groups:
                     self.collapsed_groups.add(group_name)
-                    current_index = self.currentIndex()
-                    if current_index in group_tabs:
-                        self.group_representatives[group_name] = current_index
+                    if current_id in group.tabs:
+                        self.group_representatives[group_name] = current_id
                     else:
-                        self.group_representatives[group_name] = group_tabs[0]
+                        self.group_representatives[group_name] = group.tabs[0]
                     changed = True
         
         if changed:
@@ -680,17 +783,14 @@ class TabWidget(QTabWidget):
 
     def force_initial_collapse(self):
         """Force collapse all groups on initial setup"""
-        for group_name in list(self.groups.keys()):
-            group_tabs = [i for i in range(self.count()) 
-                         if self.tab_groups.get(i) == group_name]
-            
-            if len(group_tabs) >= self.min_group_collapse_threshold:
+        current_id = self.tab_id(self.currentIndex())
+        for group_name, group in self.groups.items():
+            if len(group.tabs) >= self.min_group_collapse_threshold:
                 self.collapsed_groups.add(group_name)
-                current_index = self.currentIndex()
-                if current_index in group_tabs:
-                    self.group_representatives[group_name] = current_index
+                if current_id in group.tabs:
+                    self.group_representatives[group_name] = current_id
                 else:
-                    self.group_representatives[group_name] = group_tabs[0]
+                    self.group_representatives[group_name] = group.tabs[0]
         
         self.update()
 
@@ -712,7 +812,7 @@ class TabWidget(QTabWidget):
             menu.add_action("Duplicate", lambda: self.duplicate_tab(current_index))
             
             # Add group-related actions
-            group = self.tab_groups.get(current_index)
+            group = self.group_of(current_index)
             if group:
                 menu.add_action(f"Leave {group}", 
                               lambda: self.remove_from_group(current_index))
@@ -721,7 +821,7 @@ class TabWidget(QTabWidget):
                               lambda: self.show_group_menu(current_index))
             
             # Add memory management actions
-            state = self.memory_manager.states.get(current_index)
+            state = self.memory_manager.state_of(current_index)
             if state == TabState.ACTIVE:
                 menu.add_action("Snooze", 
                               lambda: self.memory_manager.snooze_tab(current_index))
@@ -766,7 +866,7 @@ class TabWidget(QTabWidget):
         menu.addAction("Close", lambda: self.removeTab(index))
         
         # Group actions
-        group = self.tab_groups.get(index)
+        group = self.group_of(index)
         if group:
             menu.addAction(f"Leave {group}", 
                           lambda: self.remove_from_group(index))
@@ -775,7 +875,7 @@ class TabWidget(QTabWidget):
                           lambda: self.show_group_menu(index))
         
         # Memory actions
-        state = self.memory_manager.states.get(index)
+        state = self.memory_manager.state_of(index)
         if state == TabState.ACTIVE:
             menu.addAction("Snooze", 
                           lambda: self.memory_manager.snooze_tab(index))
@@ -791,7 +891,7 @@ class TabWidget(QTabWidget):
         if hasattr(tab, 'url'):
             new_index = self.parent().add_new_tab(tab.url())
             # Copy group assignment if any
-            group = self.tab_groups.get(index)
+            group = self.group_of(index)
             if group:
                 self.addTabToGroup(new_index, group)
 
@@ -813,10 +913,10 @@ class TabWidget(QTabWidget):
                 tab = VideoTab(url, self)
                 idx = self.addTab(tab, "Video")
             else:
-                # Create regular WebEngineView tab
+                # Create regular WebEngineView tab, loading once the scheduler gets to it
                 web_view = QWebEngineView()
-                web_view.setUrl(QUrl(url))
                 idx = self.addTab(web_view, "New Tab")
+                self.load_later(idx, url)
             
             if isinstance(idx, int) and idx >= 0:  # Verify tab was added
                 # Add to group and ensure it's tracked
@@ -864,7 +964,7 @@ class TabWidget(QTabWidget):
         for group_name in self.groups:
             self.collapsed_groups.add(group_name)
             # Set first tab as representative if not set
-            group_tabs = sorted(self.groups[group_name].tabs)
+            group_tabs = self.groups[group_name].tabs
             if group_tabs and (group_name not in self.group_representatives or 
                               self.group_representatives[group_name] not in group_tabs):
                 self.group_representatives[group_name] = group_tabs[0]
@@ -874,125 +974,53 @@ class TabWidget(QTabWidget):
         self.update_tab_appearances()
         
         # Switch to the development group and expand it
-        dev_tabs = [i for i in range(self.count()) 
-                    if self.tab_groups.get(i) == "Development"]
+        dev_tabs = self.group_indexes("Development")
         if dev_tabs:
             self.setCurrentIndex(dev_tabs[0])
             if "Development" in self.collapsed_groups:
                 self._toggle_group("Development")
 
     def update_tab_appearances(self, index=None):
-        """Update appearances of all tabs or a specific tab with improved indication"""
-        styles = []
-        
-        # Base style for all tabs
-        styles.append("""
-            QTabBar::tab {
-                background-color: #2e3440;
-                color: #d8dee9;
-                padding: 4px 8px;
-                margin: 1px;
-                border-radius: 3px;
-                min-width: 150px;
-                max-width: 300px;
-            }
-            QTabBar::tab:selected {
-                background-color: #3b4252;
-                color: #88c0d0;
-                border-bottom: 2px solid #88c0d0;
-            }
-        """)
+        """Update group titles and repaint the tabs whose look changed
         
+        The tab bar paints group colours, badges, state and the selection
+        cursor itself (see TabBar.paintEvent), so this only touches tab text
+        and tooltips that differ and asks the bar to refresh.
+        """
         tabs_to_update = [index] if index is not None else range(self.count())
         
         for i in tabs_to_update:
             if not self._tab_bar.isTabVisible(i):
                 continue
                 
-            group = self.tab_groups.get(i)
-            if group and group in self.groups:
-                color = self.groups[group].color
-                is_representative = (i == self.group_representatives.get(group))
+            group = self.group_of(i)
+            if not group or group not in self.groups:
+                continue
+            
+            if i == self.representative_index(group):
+                # Show group name and collapse arrow; the bar draws the count badge
                 is_collapsed = group in self.collapsed_groups
-                
-                if is_representative:
-                    # Show group name and count for representative
-                    group_count = len(self.groups[group].tabs)
-                    collapse_icon = "▼" if not is_collapsed else "►"
-                    self.setTabText(i, f"{collapse_icon} {group} ({group_count})")
-                    
-                    styles.append(f"""
-                        QTabBar::tab:nth-child({i + 1}) {{
-                            background: qlineargradient(
-                                x1:0, y1:0, x2:1, y2:0,
-                                stop:0 {color.name()},
-                                stop:1 {color.darker(110).name()}
-                            );
-                            color: black;
-                            font-weight: bold;
-                            border: none;
-                            padding-left: 24px;
-                            margin: 2px 4px;
-                            border-radius: 5px;
-                        }}
-                    """)
-                else:
-                    # Keep original tab name for non-representatives
-                    tab = self.widget(i)
-                    if hasattr(tab, 'page'):
-                        tab_name = tab.page().title()
-                        if tab_name:
-                            self.setTabText(i, tab_name)
-                    
-                    styles.append(f"""
-                        QTabBar::tab:nth-child({i + 1}) {{
-                            background-color: {color.darker(150).name()};
-                            color: white;
-                            border-left: 4px solid {color.name()};
-                            padding: 4px 12px;
-                            margin: 2px 2px 2px 16px;
-                            border-radius: 0 3px 3px 0;
-                        }}
-                    """)
+                group_count = len(self.groups[group].tabs)
+                collapse_icon = "►" if is_collapsed else "▼"
+                text = f"{collapse_icon} {group}"
+                tooltip = f"Group: {group}\nTabs: {group_count}\n"
+                tooltip += "Click arrow to expand" if is_collapsed else "Click arrow to collapse"
+            else:
+                # Keep original tab name for non-representatives
+                tab = self.widget(i)
+                text = tab.page().title() if hasattr(tab, 'page') else ""
+                tooltip = None
             
-            # Selection cursor indicator
-            if i == self.selection_cursor:
-                styles.append(f"""
-                    QTabBar::tab:nth-child({i + 1}) {{
-                        border: 2px solid #ebcb8b !important;
-                    }}
-                """)
+            # Setting text re-lays out the whole bar, so only do it on change
+            if text and self.tabText(i) != text:
+                self.setTabText(i, text)
+            if tooltip is not None and self._tab_bar.tabToolTip(i) != tooltip:
+                self._tab_bar.setTabToolTip(i, tooltip)
         
         # Update breadcrumbs
         self.update_breadcrumbs()
         
-        # Apply styles
-        self._tab_bar.setStyleSheet('\n'.join(styles))
-        
-        # Update tab text and indicators
-        for i in tabs_to_update:
-            if not self._tab_bar.isTabVisible(i):
-                continue
-                
-            group = self.tab_groups.get(i)
-            if group and group in self.groups:
-                is_representative = (i == self.group_representatives.get(group))
-                is_collapsed = group in self.collapsed_groups
-                
-                if is_representative:
-                    # Update tab text with improved indicators
-                    group_count = len(self.groups[group].tabs)
-                    collapse_icon = "▼" if not is_collapsed else "►"
-                    count_badge = f" ({group_count})" if is_collapsed else ""
-                    self.setTabText(i, f"{collapse_icon} {group}{count_badge}")
-                    
-                    # Add tooltip with group info
-                    tooltip = f"Group: {group}\nTabs: {group_count}\n"
-                    if is_collapsed:
-                        tooltip += "Click arrow to expand"
-                    else:
-                        tooltip += "Click arrow to collapse"
-                    self._tab_bar.setTabToolTip(i, tooltip)
+        self._tab_bar.refresh(None if index is None else [index])
 
     # Alias for backward compatibility
     def update_tab_appearance(self, index):
@@ -1001,53 +1029,29 @@ class TabWidget(QTabWidget):
 
     def _is_first_in_group(self, index, group):
         """Check if tab is the first visible tab in its group"""
-        for i in range(self.count()):
-            if self.tab_groups.get(i) == group:
-                if i == index:
-                    return True
-                if self._tab_bar.isTabVisible(i):
-                    return False
+        for i in self.group_indexes(group):
+            if i == index:
+                return True
+            if self._tab_bar.isTabVisible(i):
+                return False
         return False
 
     def find_tab(self, search_text):
         """Find tabs matching search text"""
-        matches = []
-        for i in range(self.count()):
-            title = self.tabText(i)
-            tab = self.widget(i)
-            url = tab.url().toString() if hasattr(tab, 'url') else ""
-            group = self.tab_groups.get(i, "")
-            
-            if (search_text.lower() in title.lower() or 
-                search_text.lower() in url.lower()):
-                matches.append({
-                    'index': i,
-                    'title': title,
-                    'url': url,
-                    'group': group,
-                    'state': self.memory_manager.states.get(i, TabState.ACTIVE)
-                })
-        
-        return matches
+        return [{
+            'index': entry.index,
+            'title': entry.title,
+            'url': entry.url,
+            'group': entry.group or "",
+            'state': entry.state
+        } for entry in self.registry.entries() if tab_matches(entry, search_text)]
 
     def highlight_tab(self, index):
         """Temporarily highlight a tab to make it easy to find"""
         if not 0 <= index < self.count():
             return
             
-        # Save original style
-        original_style = self._tab_bar.tabTextColor(index)
-        
-        # Flash effect
-        def flash(count=6):
-            if count > 0:
-                color = QColor("#ff9933") if count % 2 else original_style
-                self._tab_bar.setTabTextColor(index, color)
-                QTimer.singleShot(200, lambda: flash(count - 1))
-            else:
-                self.update_tab_appearances(index)
-        
-        flash()
+        self._tab_bar.flash(index)
 
     def setup_preview_dropdown(self):
         """Setup the quick preview dropdown for keyboard/mouse navigation"""
@@ -1057,38 +1061,40 @@ class TabWidget(QTabWidget):
         layout.setContentsMargins(4, 4, 4, 4)
         layout.setSpacing(2)
         
-        # Create preview list
-        self.group_preview = QListWidget(self.preview_container)
+        # Create preview list over the group's rows of the tab model
+        self.group_preview_filter = TabFilterModel(self.tab_model, self.preview_container)
+        self.group_preview = QListView(self.preview_container)
+        self.group_preview.setModel(self.group_preview_filter)
+        self.group_preview.setUniformItemSizes(True)
         self.group_preview.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.group_preview.setStyleSheet("""
-            QListWidget {
+            QListView {
                 background: #2e3440;
                 border: 1px solid #4c566a;
                 border-radius: 4px;
                 min-width: 200px;
                 max-width: 400px;
             }
-            QListWidget::item {
+            QListView::item {
                 color: #d8dee9;
                 padding: 4px 8px;
                 border-bottom: 1px solid #3b4252;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background: #3b4252;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background: #4c566a;
                 color: #88c0d0;
             }
         """)
-        self.group_preview.itemClicked.connect(self._handle_preview_click)
+        self.group_preview.clicked.connect(self._handle_preview_click)
+        self.group_preview.activated.connect(self._navigate_to_preview_tab)
         layout.addWidget(self.group_preview)
 
     def _handle_preview_click(self, item):
         """Handle click on preview item"""
-        tab_index = item.data(Qt.ItemDataRole.UserRole)
-        self.setCurrentIndex(tab_index)
-        self.preview_container.hide()
+        self._navigate_to_preview_tab(item)
 
     def show_tab_menu(self, tab_index, position):
         """Show context menu for the specified tab"""
@@ -1107,7 +1113,7 @@ class TabWidget(QTabWidget):
         group_menu = menu.addMenu("Move to Group")
         
         # Add "Remove from Group" if tab is in a group
-        if tab_index in self.tab_groups:
+        if self.group_of(tab_index):
             remove_action = group_menu.addAction("Remove from Group")
             remove_action.triggered.connect(lambda: self.remove_from_group(tab_index))
             group_menu.addSeparator()
@@ -1206,7 +1212,7 @@ class TabWidget(QTabWidget):
     def goto_prev_group(self):
         """Go to previous group"""
         current_index = self.currentIndex()
-        current_group = self.tab_groups.get(current_index)
+        current_group = self.group_of(current_index)
         if not current_group:
             return
             
@@ -1221,8 +1227,7 @@ class TabWidget(QTabWidget):
             # Get previous group
             prev_group = groups[(current_idx - 1) % len(groups)]
             # Switch to first tab in that group
-            group_tabs = [i for i in range(self.count()) 
-                         if self.tab_groups.get(i) == prev_group]
+            group_tabs = self.group_indexes(prev_group)
             if group_tabs:
                 self.setCurrentIndex(group_tabs[0])
                 if prev_group in self.collapsed_groups:
@@ -1233,7 +1238,7 @@ class TabWidget(QTabWidget):
     def goto_next_group(self):
         """Go to next group"""
         current_index = self.currentIndex()
-        current_group = self.tab_groups.get(current_index)
+        current_group = self.group_of(current_index)
         if not current_group:
             return
             
@@ -1248,8 +1253,7 @@ class TabWidget(QTabWidget):
             # Get next group
             next_group = groups[(current_idx + 1) % len(groups)]
             # Switch to first tab in that group
-            group_tabs = [i for i in range(self.count()) 
-                         if self.tab_groups.get(i) == next_group]
+            group_tabs = self.group_indexes(next_group)
             if group_tabs:
                 self.setCurrentIndex(group_tabs[0])
                 if next_group in self.collapsed_groups:
@@ -1272,12 +1276,16 @@ class TabWidget(QTabWidget):
         menu.addSeparator()
         
         # Group sleep management
-        if current_group := self.tab_groups.get(current_index):
+        if current_group := self.group_of(current_index):
             wake_group = menu.addAction(f"Wake All in '{current_group}'")
             wake_group.triggered.connect(lambda: self.wake_group(current_group))
             
             sleep_group = menu.addAction(f"Sleep All in '{current_group}'")
             sleep_group.triggered.connect(lambda: self.sleep_group(current_group))
+            
+            hibernate_group = menu.addAction(f"Hibernate All in '{current_group}'")
+            hibernate_group.triggered.connect(
+                lambda: self.memory_manager.hibernate_group(current_group))
         
         menu.addSeparator()
         
@@ -1308,41 +1316,51 @@ class TabWidget(QTabWidget):
             if hasattr(tab, 'page'):
                 self.memory_manager.wake_tab(current_index)
                 # Set keep_active flag to prevent auto-sleep
-                group = self.tab_groups.get(current_index)
+                group = self.group_of(current_index)
                 if group:
                     self.groups[group].keep_active = True
 
     def wake_group(self, group_name):
         """Wake all tabs in a group"""
-        for i in range(self.count()):
-            if self.tab_groups.get(i) == group_name:
-                self.memory_manager.wake_tab(i)
+        self.memory_manager.wake_group(group_name)
         self.groups[group_name].keep_active = True
 
     def sleep_group(self, group_name):
         """Put all tabs in a group to sleep"""
         self.groups[group_name].keep_active = False
-        for i in range(self.count()):
-            if self.tab_groups.get(i) == group_name:
-                self.memory_manager.snooze_tab(i)
+        for i in self.group_indexes(group_name):
+            self.memory_manager.snooze_tab(i)
 
     def wake_all_tabs(self):
         """Wake all tabs"""
-        for i in range(self.count()):
-            self.memory_manager.wake_tab(i)
+        self.memory_manager.queue_wake(range(self.count()))
+
+    def load_later(self, index, url):
+        """Navigate the tab at index to url once the load scheduler admits it"""
+        view = self.widget(index)
+        tab_id = self.tab_id(index)
+        url = QUrl(url)
+        # Kept on the entry so hibernating the tab before it's admitted doesn't lose it
+        self.registry.update(tab_id, pending_url=url.toString())
+        
+        def start():
+            self.registry.update(tab_id, pending_url='')
+            view.setUrl(url)
+            return view
+        self.memory_manager.loads.schedule(tab_id, start)
 
     def create_group(self, name, tabs):
         """Create a new tab group"""
         if name not in self.groups:
-            self.groups[name] = {'color': '#88c0d0'}  # Default color
+            self.groups[name] = TabGroup(name, QColor('#88c0d0'))  # Default color
             
         # Add tabs to group
         for tab_index in tabs:
-            self.tab_groups[tab_index] = name
+            self._set_tab_group(self.tab_id(tab_index), name)
             
         # Set first tab as representative
         if tabs:
-            self.group_representatives[name] = tabs[0]
+            self.group_representatives[name] = self.tab_id(tabs[0])
             
         # Update tab appearances
         for tab_index in tabs:
@@ -1358,24 +1376,7 @@ class TabWidget(QTabWidget):
 
     def close_tab(self, index):
         """Close the tab at the given index"""
-        # Check if tab is in a group
-        group = self.tab_groups.get(index)
-        if group:
-            # Update group if this was the representative
-            if self.group_representatives.get(group) == index:
-                # Find new representative
-                for i in range(self.count()):
-                    if i != index and self.tab_groups.get(i) == group:
-                        self.group_representatives[group] = i
-                        break
-            # Remove from group
-            del self.tab_groups[index]
-            
-        # Clean up memory management
-        if hasattr(self, 'memory_manager'):
-            self.memory_manager.remove_tab(index)
-            
-        # Remove the tab
+        # Group, representative and memory state are dropped in tabRemoved
         self.removeTab(index)
         
         # If this was the last tab, create a new one
@@ -1392,7 +1393,7 @@ class TabWidget(QTabWidget):
         
         # Get current tab and group
         current_index = self.currentIndex()
-        current_group = self.tab_groups.get(current_index)
+        current_group = self.group_of(current_index)
         
         if not current_group or current_group not in self.groups:
             self.breadcrumb_container.hide()
@@ -1450,22 +1451,12 @@ class TabWidget(QTabWidget):
             if not self.preview_container:
                 return
             
-            # Get all tabs in this group
-            group_tabs = []
-            for i in range(self.count()):
-                if self.tab_groups.get(i) == group:
-                    group_tabs.append(i)
-            
-            if not group_tabs:
+            # Narrow the list to this group's tabs
+            self.group_preview_filter.set_text('')
+            self.group_preview_filter.set_group(group)
+            if not self.group_preview_filter.rowCount():
                 return
             
-            # Clear and populate preview list
-            self.group_preview.clear()
-            for tab_index in group_tabs:
-                item = QListWidgetItem(self.tabText(tab_index))
-                item.setData(Qt.ItemDataRole.UserRole, tab_index)
-                self.group_preview.addItem(item)
-            
             # Position and show preview
             tab_rect = self.tabBar().tabRect(index)
             global_pos = self.tabBar().mapToGlobal(tab_rect.bottomLeft())
@@ -1475,16 +1466,12 @@ class TabWidget(QTabWidget):
             
             # Focus and preselect
             self.group_preview.setFocus()
-            if self.group_preview.count() > 0:
-                self.group_preview.setCurrentRow(0)
-            
-            # Connect enter key to navigation
-            self.group_preview.itemActivated.connect(self._navigate_to_preview_tab)
+            self.group_preview.setCurrentIndex(self.group_preview_filter.index(0, 0))
 
     def _navigate_to_preview_tab(self, item):
         """Navigate to the selected tab from preview"""
-        tab_index = item.data(Qt.ItemDataRole.UserRole)
-        if isinstance(tab_index, int) and 0 <= tab_index < self.count():
+        tab_index = self.registry.index_of(item.data(TabRoles.TAB_ID))
+        if 0 <= tab_index < self.count():
             self.setCurrentIndex(tab_index)
             self.preview_container.hide()
 
@@ -1555,6 +1542,13 @@ class TabBar(QTabBar):
         # Enable keyboard navigation
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         
+        # Group and state decorations painted over each tab, by tab ID (see refresh)
+        self.looks = {}
+        self._flashing = {}  # tab_id -> blinks left
+        self._flash_timer = QTimer(self)
+        self._flash_timer.setInterval(200)
+        self._flash_timer.timeout.connect(self._flash_step)
+        
         self.setStyleSheet("""
             QTabBar::tab {
                 min-width: 150px;
@@ -1614,9 +1608,9 @@ class TabBar(QTabBar):
                             self.long_press_timer.stop()
                             # Check if this is a group representative tab
                             tab_widget = self.parent()
-                            if tab_widget and hasattr(tab_widget, 'tab_groups'):
-                                group = tab_widget.tab_groups.get(tab_index)
-                                if group and tab_index == tab_widget.group_representatives.get(group):
+                            if tab_widget and hasattr(tab_widget, 'registry'):
+                                group = tab_widget.group_of(tab_index)
+                                if group and tab_index == tab_widget.representative_index(group):
                                     # Use spread for touch
                                     tab_widget._show_group_preview(tab_index, group, use_spread=True)
                                 else:
@@ -1642,10 +1636,10 @@ class TabBar(QTabBar):
                 # Handle drag for group preview
                 if self.drag_active:
                     tab_widget = self.parent()
-                    if tab_widget and hasattr(tab_widget, 'tab_groups'):
+                    if tab_widget and hasattr(tab_widget, 'registry'):
                         tab_index = self.tabAt(current_pos.toPoint())
                         if tab_index >= 0:
-                            group = tab_widget.tab_groups.get(tab_index)
+                            group = tab_widget.group_of(tab_index)
                             if group:
                                 tab_widget._show_group_preview(tab_index, group, use_spread=True)
             return True
@@ -1665,22 +1659,86 @@ class TabBar(QTabBar):
         self.touch_start = None
         self.touch_tab_index = -1
 
-    def update_tab_appearance(self, index):
-        """Update tab appearance based on state"""
-        if not hasattr(self.parent(), 'memory_manager'):
+    # Painting
+    def refresh(self, indexes=None):
+        """Recompute the looks of some tabs (all by default) and repaint the ones that changed"""
+        tab_widget = self.parent()
+        registry = getattr(tab_widget, 'registry', None)
+        if registry is None:
             return
-            
-        # Get tab state
-        is_hibernated = index in getattr(self.parent().memory_manager, 'hibernated_tabs', {})
-        is_active = self.currentIndex() == index
-        
-        # Set style based on state
-        if is_hibernated:
-            self.setTabTextColor(index, QColor("#666666"))  # Dimmed for hibernated tabs
-        elif is_active:
-            self.setTabTextColor(index, QColor("#88c0d0"))  # Bright for active tab
+        if indexes is None:
+            indexes = range(self.count())
+        for index in indexes:
+            entry = registry.entry_at(index)
+            if entry is None:
+                continue
+            look = tab_look(entry, tab_widget.groups, tab_widget.group_representatives,
+                            tab_widget.collapsed_groups,
+                            cursor=index == tab_widget.selection_cursor,
+                            highlight=self._flashing.get(entry.id, 0) % 2 == 1)
+            if self.looks.get(entry.id) != look:
+                self.looks[entry.id] = look
+                self.update(self.tabRect(index))
+
+    def tab_changed(self, tab_id):
+        """Registry listener: a tab's state, group or metadata changed"""
+        index = self.parent().registry.index_of(tab_id)
+        if index < 0:
+            self.looks.pop(tab_id, None)
+            self._flashing.pop(tab_id, None)
         else:
-            self.setTabTextColor(index, QColor("#d8dee9"))  # Normal color
+            self.refresh([index])
+
+    def update_tab_appearance(self, index=None):
+        """Repaint a tab (all tabs by default) if its look changed"""
+        self.refresh(None if index is None else [index])
+
+    def flash(self, index, times=6):
+        """Blink a tab a few times to make it easy to find"""
+        tab_id = self.parent().registry.id_at(index)
+        if tab_id is None:
+            return
+        self._flashing[tab_id] = times
+        self.refresh([index])
+        self._flash_timer.start()
+
+    def _flash_step(self):
+        registry = self.parent().registry
+        for tab_id in list(self._flashing):
+            self._flashing[tab_id] -= 1
+            if self._flashing[tab_id] <= 0:
+                del self._flashing[tab_id]
+            index = registry.index_of(tab_id)
+            if index >= 0:
+                self.refresh([index])
+        if not self._flashing:
+            self._flash_timer.stop()
+
+    def paintEvent(self, event):
+        """Let the style draw the tabs, then draw group and state looks over the dirty ones"""
+        super().paintEvent(event)
+        if not self.looks:
+            return
+        registry = self.parent().registry
+        close_width = 0
+        if self.tabsClosable():
+            close_width = self.style().pixelMetric(QStyle.PixelMetric.PM_TabCloseIndicatorWidth, None, self)
+        dirty = event.rect()
+        painter = QPainter(self)
+        for index in range(self.count()):
+            rect = self.tabRect(index)
+            if not rect.intersects(dirty):
+                continue
+            look = self.looks.get(registry.id_at(index), PLAIN_LOOK)
+            if look != PLAIN_LOOK:
+                paint_tab_look(painter, rect, look, close_width)
+        painter.end()
+
+    def setCurrentIndex(self, index):
+        tab_widget = self.parent()
+        if hasattr(tab_widget, 'thumbnails'):
+            tab_widget._leaving_current(index)
+        super().setCurrentIndex(index)
 
     def keyPressEvent(self, event):
         """Handle keyboard navigation"""
@@ -1704,9 +1762,9 @@ class TabBar(QTabBar):
             # Show group preview dropdown
             current = self.currentIndex()
             tab_widget = self.parent()
-            if tab_widget and hasattr(tab_widget, 'tab_groups'):
-                group = tab_widget.tab_groups.get(current)
-                if group and current == tab_widget.group_representatives.get(group):
+            if tab_widget and hasattr(tab_widget, 'registry'):
+                group = tab_widget.group_of(current)
+                if group and current == tab_widget.representative_index(group):
                     tab_widget._show_group_preview(current, group, use_spread=False)
             event.accept()
             return
@@ -1,7 +1,7 @@
 from PyQt6.QtWidgets import (
     QDialog, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QCheckBox, QLineEdit, QPushButton, QComboBox,
-    QFileDialog, QGroupBox, QDialogButtonBox, QGridLayout
+    QFileDialog, QGroupBox, QDialogButtonBox, QGridLayout, QSpinBox
 )
 from PyQt6.QtCore import Qt, QUrl
 from ..security import SecurityPanel
@@ -53,12 +53,21 @@ class SettingsDialog(QDialog):
         self.restore_session = QCheckBox("Restore previous session")
         self.restore_session.setChecked(self.settings.get('startup', 'restore_session'))
         
+        eager_layout = QHBoxLayout()
+        eager_layout.addWidget(QLabel("Recent tabs to load on restore:"))
+        self.restore_eager = QSpinBox()
+        self.restore_eager.setRange(0, 50)
+        restore_eager = self.settings.get('startup', 'restore_eager')
+        self.restore_eager.setValue(3 if restore_eager is None else int(restore_eager))
+        eager_layout.addWidget(self.restore_eager)
+        
         home_layout = QHBoxLayout()
         home_layout.addWidget(QLabel("Homepage:"))
         self.homepage = QLineEdit(self.settings.get('startup', 'home_page'))
         home_layout.addWidget(self.homepage)
 
         startup_layout.addWidget(self.restore_session)
+        startup_layout.addLayout(eager_layout)
         startup_layout.addLayout(home_layout)
         startup_group.setLayout(startup_layout)
         layout.addWidget(startup_group)
@@ -141,6 +150,7 @@ class SettingsDialog(QDialog):
     def accept(self):
         # Save all settings
         self.settings.set('startup', 'restore_session', self.restore_session.isChecked())
+        self.settings.set('startup', 'restore_eager', self.restore_eager.value())
         self.settings.set('startup', 'home_page', self.homepage.text())
         
         self.settings.set('privacy', 'do_not_track', self.do_not_track.isChecked())
@@ -1,50 +1,18 @@
 from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile, QWebEngineSettings, QWebEngineUrlRequestInterceptor
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtCore import QUrl, pyqtSignal
-import re
+from .security.header_plans import HeaderPlanCache
 
 class RequestInterceptor(QWebEngineUrlRequestInterceptor):
-    """Intercepts and modifies web requests"""
+    """Intercepts and modifies web requests using a compiled RuleEngine"""
+    
+    def __init__(self, rules):
+        super().__init__()
+        self.rules = rules
+        self.header_plans = HeaderPlanCache()
     
     def interceptRequest(self, info):
-        url = info.requestUrl().toString()
-        
-        # Set default CORS headers
-        info.setHttpHeader(b"Access-Control-Allow-Origin", b"*")
-        info.setHttpHeader(b"Access-Control-Allow-Methods", b"GET, POST, OPTIONS")
-        info.setHttpHeader(b"Access-Control-Allow-Headers", b"*")
-        
-        # Handle video source domains
-        if any(domain in url for domain in [
-            'cizgifilmlerizle.com',
-            'watchanimesub.net',
-            'wcofun.net',
-            'fonts.gstatic.com'
-        ]):
-            # Add specific headers for video requests
-            info.setHttpHeader(b"Origin", b"https://embed.watchanimesub.net")
-            info.setHttpHeader(b"Referer", b"https://embed.watchanimesub.net/")
-            info.setHttpHeader(b"Sec-Fetch-Site", b"cross-site")
-            info.setHttpHeader(b"Sec-Fetch-Mode", b"cors")
-            info.setHttpHeader(b"Sec-Fetch-Dest", b"empty")
-            info.setHttpHeader(b"Accept", b"*/*")
-            info.setHttpHeader(b"Accept-Language", b"en-US,en;q=0.9")
-            info.setHttpHeader(b"Connection", b"keep-alive")
-            
-            # Remove problematic headers
-            info.setHttpHeader(b"X-Frame-Options", b"")
-            info.setHttpHeader(b"Content-Security-Policy", b"")
-            
-        # Handle video source URLs
-        if 'getvid' in url:
-            # Convert URL parameters to a format the server expects
-            if '?' in url:
-                base_url = url.split('?')[0]
-                params = url.split('?')[1]
-                # Clean up the parameters
-                params = re.sub(r'([^=&])%([^=&])', r'\1\2', params)
-                url = f"{base_url}?{params}"
-                info.redirect(QUrl(url))
+        self.rules.apply(info, self.header_plans)
 
 class WebView(QWebEngineView):
     """Custom web view with enhanced features"""
@@ -52,7 +20,7 @@ class WebView(QWebEngineView):
     titleChanged = pyqtSignal(str)
     urlChanged = pyqtSignal(QUrl)
     
-    def __init__(self, profile, parent=None):
+    def __init__(self, profile, parent=None, interceptor=None):
         super().__init__(parent)
         self.profile = profile
         self.parent = parent
@@ -85,9 +53,11 @@ class WebView(QWebEngineView):
         profile.setPersistentStoragePath("./cache")
         profile.setCachePath("./cache")
         
-        # Add request interceptor for CORS
-        self.interceptor = RequestInterceptor()
-        profile.setUrlRequestInterceptor(self.interceptor)
+        # Requests go through the browser's shared interceptor, which holds the
+        # rule engine and follows hot reloads; a profile that already has it keeps it
+        self.interceptor = interceptor
+        if interceptor is not None:
+            profile.setUrlRequestInterceptor(interceptor)
         
         # Connect signals
         self.page().titleChanged.connect(self.titleChanged)
@@ -0,0 +1,207 @@
+import os
+import time
+import atexit
+import logging
+import threading
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+
+class LogCategory:
+    """Bit flags for the log categories, named after the existing emoji tags"""
+    REQUEST = 1 << 0
+    CDN = 1 << 1
+    VIDEO = 1 << 2
+    WCO = 1 << 3
+    SECURITY = 1 << 4
+    ALL = REQUEST | CDN | VIDEO | WCO | SECURITY
+
+    NAMES = {
+        'REQUEST': REQUEST,
+        'CDN': CDN,
+        'VIDEO': VIDEO,
+        'WCO': WCO,
+        'SECURITY': SECURITY,
+        'ALL': ALL,
+    }
+
+    TAGS = {
+        REQUEST: "🌐",
+        CDN: "🎥",
+        VIDEO: "🎥",
+        WCO: "🎬",
+        SECURITY: "🛡️",
+    }
+
+
+class LogLevel:
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+
+    NAMES = {
+        'DEBUG': DEBUG,
+        'INFO': INFO,
+        'WARNING': WARNING,
+        'ERROR': ERROR,
+    }
+
+
+class Logger:
+    """Process-wide leveled logger for hot paths
+
+    Categorized log sites are off by default. Callers pass a format string and
+    arguments; nothing is formatted on the calling thread. Enabled records are
+    appended to a bounded deque (append/popleft are atomic in CPython, so
+    producers never take a lock) and a daemon thread drains them to a rotating
+    file. When the buffer is full the oldest records are overwritten.
+    """
+
+    categories = 0
+    level = LogLevel.INFO
+    dropped = 0
+
+    BUFFER_SIZE = 8192
+    DRAIN_INTERVAL = 0.25  # seconds
+    DEFAULT_PATH = os.path.expanduser('~/.sledge/logs/network.log')
+
+    _buffer = deque(maxlen=BUFFER_SIZE)
+    _handler = None
+    _thread = None
+    _stop = threading.Event()
+    _atexit_registered = False
+
+    @classmethod
+    def enabled(cls, category, level=LogLevel.DEBUG):
+        """Check whether a log site would record anything"""
+        if level < cls.level:
+            return False
+        return not category or bool(cls.categories & category)
+
+    @classmethod
+    def log(cls, category, level, fmt, *args):
+        """Queue a record if its category and level are enabled"""
+        if level < cls.level or (category and not cls.categories & category):
+            return
+        buffer = cls._buffer
+        if len(buffer) == buffer.maxlen:
+            cls.dropped += 1
+        buffer.append((time.time(), level, category, fmt, args))
+
+    @classmethod
+    def debug(cls, category, fmt, *args):
+        cls.log(category, LogLevel.DEBUG, fmt, *args)
+
+    @classmethod
+    def info(cls, category, fmt, *args):
+        cls.log(category, LogLevel.INFO, fmt, *args)
+
+    @classmethod
+    def warning(cls, fmt, *args):
+        cls.log(0, LogLevel.WARNING, fmt, *args)
+
+    @classmethod
+    def error(cls, fmt, *args):
+        cls.log(0, LogLevel.ERROR, fmt, *args)
+
+    @classmethod
+    def configure(cls, categories=None, level=None, path=None,
+                  max_bytes=5 * 1024 * 1024, backup_count=3):
+        """Set filters and start the background writer
+
+        ``categories`` and ``level`` accept either the numeric values or names
+        such as ``"CDN,VIDEO"`` and ``"debug"``.
+        """
+        if categories is not None:
+            cls.categories = cls._parse_categories(categories)
+        if level is not None:
+            cls.level = LogLevel.NAMES.get(str(level).upper(), level) if isinstance(level, str) else level
+
+        path = path or cls.DEFAULT_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                      encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        old_handler, cls._handler = cls._handler, handler
+        if old_handler:
+            old_handler.close()
+
+        if cls._thread is None or not cls._thread.is_alive():
+            cls._stop.clear()
+            cls._thread = threading.Thread(target=cls._drain_loop, name='sledge-log', daemon=True)
+            cls._thread.start()
+        if not cls._atexit_registered:
+            atexit.register(cls.shutdown)
+            cls._atexit_registered = True
+
+    @classmethod
+    def configure_from_env(cls):
+        """Configure from SLEDGE_LOG (categories) and SLEDGE_LOG_LEVEL"""
+        cls.configure(
+            categories=os.environ.get('SLEDGE_LOG', ''),
+            level=os.environ.get('SLEDGE_LOG_LEVEL', 'info'),
+            path=os.environ.get('SLEDGE_LOG_FILE') or None
+        )
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the writer thread after flushing pending records"""
+        cls._stop.set()
+        if cls._thread is not None:
+            cls._thread.join(timeout=2)
+            cls._thread = None
+        cls.flush()
+        if cls._handler:
+            cls._handler.close()
+            cls._handler = None
+
+    @classmethod
+    def flush(cls):
+        """Write every queued record to the log file"""
+        handler = cls._handler
+        buffer = cls._buffer
+        while True:
+            try:
+                record = buffer.popleft()
+            except IndexError:
+                break
+            if handler:
+                handler.emit(logging.makeLogRecord({'msg': cls._format(record), 'args': None}))
+        if handler:
+            handler.flush()
+
+    @classmethod
+    def _drain_loop(cls):
+        """Background thread body: drain the buffer periodically"""
+        while not cls._stop.wait(cls.DRAIN_INTERVAL):
+            try:
+                cls.flush()
+            except Exception as e:
+                print(f"Error writing log records: {e}")
+
+    @staticmethod
+    def _format(record):
+        """Render a queued record into a log line"""
+        timestamp, level, category, fmt, args = record
+        try:
+            message = fmt % args if args else fmt
+        except (TypeError, ValueError):
+            message = f"{fmt} {args!r}"
+        stamp = time.strftime('%H:%M:%S', time.localtime(timestamp))
+        tag = LogCategory.TAGS.get(category)
+        if tag:
+            return f"{stamp} {tag} {message}"
+        level_name = logging.getLevelName(level)
+        return f"{stamp} {level_name} {message}"
+
+    @staticmethod
+    def _parse_categories(categories):
+        """Turn a comma separated list of names into a category mask"""
+        if isinstance(categories, int):
+            return categories
+        mask = 0
+        for name in categories.replace(' ', '').split(','):
+            if name:
+                mask |= LogCategory.NAMES.get(name.upper(), 0)
+        return mask
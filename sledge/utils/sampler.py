@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+from array import array
+from collections import namedtuple
+
+import psutil
+
+FIELDS = (
+    'time',             # time.time() of the sample
+    'rss',              # Bytes resident in this process
+    'cpu',              # CPU percent of this process
+    'renderer_rss',     # Bytes resident in child processes (renderers, GPU, utility)
+    'renderer_cpu',     # CPU percent of child processes
+    'renderer_count',
+    'memory_percent',   # System memory in use
+    'memory_used',      # Bytes, total - available
+    'memory_total',
+    'system_cpu',       # CPU percent across all cores
+)
+
+MetricsSnapshot = namedtuple('MetricsSnapshot', FIELDS)
+
+
+class MetricsRing:
+    """Fixed-size history of snapshots, one array('d') column per field
+
+    Written by the sampler thread, read from anywhere; reads copy out under
+    a lock and never touch the system.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._columns = [array('d', bytes(8 * capacity)) for _ in FIELDS]
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def append(self, snapshot):
+        with self._lock:
+            for column, value in zip(self._columns, snapshot):
+                column[self._next] = value
+            self._next = (self._next + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+
+    def _row(self, position):
+        return MetricsSnapshot(*(column[position] for column in self._columns))
+
+    def latest(self):
+        with self._lock:
+            if not self._count:
+                return None
+            return self._row((self._next - 1) % self.capacity)
+
+    def window(self, count=None):
+        """The last count snapshots (all of them by default), oldest first"""
+        with self._lock:
+            count = self._count if count is None else min(count, self._count)
+            start = self._next - count
+            return [self._row(position % self.capacity) for position in range(start, self._next)]
+
+    def series(self, field, count=None):
+        """One field of the last count snapshots, oldest first"""
+        column = self._columns[FIELDS.index(field)]
+        with self._lock:
+            count = self._count if count is None else min(count, self._count)
+            start = self._next - count
+            return [column[position % self.capacity] for position in range(start, self._next)]
+
+
+class SystemSampler:
+    """Samples process-tree and system resource use on a worker thread
+
+    Every ``interval`` seconds the browser process, its children (the
+    Chromium renderer, GPU and utility processes) and system memory/CPU are
+    read into a MetricsRing. Subscribers are called with each new snapshot
+    on the worker thread; everything else should read latest() or history().
+    """
+
+    def __init__(self, interval=1.0, capacity=600, pid=None):
+        self.interval = interval
+        self.ring = MetricsRing(capacity)
+        self._process = psutil.Process(pid or os.getpid())
+        self._children = {}  # pid -> psutil.Process, kept for cpu_percent deltas
+        self._listeners = []
+        self._thread = None
+        self._wake = threading.Event()
+        self._running = False
+        # First cpu_percent calls only set the baseline
+        self._process.cpu_percent(None)
+        psutil.cpu_percent(None)
+
+    def subscribe(self, listener):
+        """Call listener(snapshot) on the sampler thread after every sample"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def set_interval(self, interval):
+        self.interval = interval
+        self._wake.set()
+
+    def start(self):
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name='sledge-metrics', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def latest(self):
+        """Most recent snapshot, None before the first sample"""
+        return self.ring.latest()
+
+    def history(self, count=None):
+        return self.ring.window(count)
+
+    def _run(self):
+        while self._running:
+            snapshot = self.sample()
+            for listener in list(self._listeners):
+                try:
+                    listener(snapshot)
+                except Exception as e:
+                    print(f"Metrics listener error: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def sample(self):
+        """Take a snapshot now and add it to the ring"""
+        try:
+            with self._process.oneshot():
+                rss = self._process.memory_info().rss
+                cpu = self._process.cpu_percent(None)
+                children = self._process.children(recursive=True)
+        except psutil.Error:
+            rss, cpu, children = 0, 0.0, []
+
+        renderer_rss = 0
+        renderer_cpu = 0.0
+        alive = {}
+        for child in children:
+            process = self._children.get(child.pid, child)
+            try:
+                with process.oneshot():
+                    renderer_rss += process.memory_info().rss
+                    renderer_cpu += process.cpu_percent(None)
+            except psutil.Error:
+                continue
+            alive[child.pid] = process
+        self._children = alive
+
+        memory = psutil.virtual_memory()
+        snapshot = MetricsSnapshot(
+            time.time(), rss, cpu, renderer_rss, renderer_cpu, len(alive),
+            memory.percent, memory.total - memory.available, memory.total,
+            psutil.cpu_percent(None),
+        )
+        self.ring.append(snapshot)
+        return snapshot
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_sampler(interval=1.0):
+    """The process-wide SystemSampler, started on first use"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SystemSampler(interval)
+            _shared.start()
+        return _shared
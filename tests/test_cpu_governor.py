@@ -0,0 +1,22 @@
+from sledge.browser.tabs.governor import CpuGovernor
+from sledge.browser.tabs.registry import TabRegistry
+from sledge.browser.tabs.states import TabState
+
+
+def test_sustained_background_load_is_frozen_once():
+    registry = TabRegistry()
+    for index in range(3):
+        registry.inserted(index, object())
+
+    def freeze(entry):
+        registry.set_state(entry.id, TabState.FROZEN)
+
+    governor = CpuGovernor(registry, freeze, can_freeze=lambda entry: entry.id != 3, budget=30, strikes=2)
+
+    assert governor.sampled({1: 95.0, 2: 50.0, 3: 99.0}) == []
+    assert governor.sampled({1: 90.0, 2: 5.0, 3: 99.0}) == [1]   # 2 dropped back under budget
+    assert governor.sampled({1: 0.0, 2: 60.0, 3: 99.0}) == []
+    assert governor.frozen == {1} and len(governor.log) == 1
+
+    governor.thawed(1, "activated")
+    assert governor.frozen == set() and "thawed tab 0" in governor.log[-1]
@@ -0,0 +1,92 @@
+from sledge.browser.security.filters import NetworkFilter, NetworkFilterEngine, HOST, PATTERN
+
+EASYLIST = """[Adblock Plus 2.0]
+! Title: test list
+||ads.example.com^
+||tracker.net^$third-party
+/banner/*/img^
+-ad-300x250.
+||cdn.site.com/ads/*.js$script,domain=news.com|~sports.news.com
+@@||ads.example.com/allowed^
+||evil.com^$important
+@@||evil.com^
+example.org##.ad-banner
+||video.net^$media,redirect=noopmp3-0.1s
+/promo\\d+\\.gif/
+"""
+
+
+def _engine():
+    return NetworkFilterEngine.from_lines([('easylist', EASYLIST.splitlines())])
+
+
+def test_parse_filter_kinds():
+    """Test classification of filter syntax"""
+    assert NetworkFilter.parse('||ads.example.com^').kind == HOST
+    assert NetworkFilter.parse('||ads.example.com/x').kind == PATTERN
+    assert NetworkFilter.parse('example.org##.ad') is None
+    assert NetworkFilter.parse('! comment') is None
+    assert NetworkFilter.parse('||a.com^$csp=script-src') is None
+    assert NetworkFilter.parse('/banner/*/img^').tokens() == ['banner', 'img']
+
+
+def test_blocking_and_exceptions():
+    """Test host, pattern, option and exception handling"""
+    engine = _engine()
+    assert len(engine) == 9
+
+    assert engine.match('https://ads.example.com/x.js', 'ads.example.com', 'script', 'site.com')
+    assert engine.match('https://sub.ads.example.com/x', 'sub.ads.example.com', 'image', 'site.com')
+    assert not engine.match('https://ads.example.com/', 'ads.example.com', 'mainframe', '')
+    assert not engine.match('https://ads.example.com/allowed', 'ads.example.com', 'image', 'site.com')
+
+    assert engine.match('https://tracker.net/p', 'tracker.net', 'ping', 'site.com')
+    assert not engine.match('https://tracker.net/p', 'tracker.net', 'ping', 'www.tracker.net')
+
+    assert engine.match('https://x.com/banner/1/img?w=300', 'x.com', 'image', 'site.com')
+    assert engine.match('https://x.com/a-ad-300x250.png', 'x.com', 'image', 'site.com')
+    assert engine.match('https://x.com/promo12.gif', 'x.com', 'image', 'site.com')
+
+    url = 'https://cdn.site.com/ads/a.js'
+    assert engine.match(url, 'cdn.site.com', 'script', 'www.news.com')
+    assert not engine.match(url, 'cdn.site.com', 'script', 'sports.news.com')
+    assert not engine.match(url, 'cdn.site.com', 'image', 'www.news.com')
+
+    # $important wins over the exception
+    assert engine.match('https://evil.com/x', 'evil.com', 'script', 'site.com')
+
+
+def test_important_pattern_beats_host_exception():
+    """Test that a token-indexed $important filter isn't hidden by a host match"""
+    engine = NetworkFilterEngine.from_lines([('list', [
+        '||cdn.example.com^',
+        '@@||cdn.example.com^',
+        '/pixel/track^$important',
+    ])])
+
+    assert not engine.match('https://cdn.example.com/lib.js', 'cdn.example.com', 'script', 'site.com')
+    hit = engine.match('https://cdn.example.com/pixel/track?id=1', 'cdn.example.com', 'image', 'site.com')
+    assert hit is not None and hit.text == '/pixel/track^$important'
+
+
+def test_hit_counters_and_binary_cache(tmp_path):
+    """Test per-list counters and the cache round trip"""
+    filters = tmp_path / 'filters'
+    filters.mkdir()
+    (filters / 'easylist.txt').write_text(EASYLIST)
+    cache = tmp_path / 'filters.bin'
+
+    engine = NetworkFilterEngine.load(str(filters), str(cache))
+    assert cache.exists()
+    assert engine.should_block('https://ads.example.com/a', 'ads.example.com', 'image', 'site.com')
+    assert not engine.should_block('https://site.com/', 'site.com', 'image', 'site.com')
+    stats = engine.stats()
+    assert stats['checked'] == 2 and stats['blocked'] == 1
+    assert stats['lists'][0]['hits'] == 1
+    assert stats['lists'][0]['hits_by_type'] == {'image': 1}
+    assert engine.summary()[1] == "  easylist: 1 blocked (image: 1)"
+
+    cached = NetworkFilterEngine.load(str(filters), str(cache))
+    assert len(cached) == len(engine)
+    assert cached.lists[0].hits == 0
+    assert cached.match('https://x.com/banner/1/img?w=300', 'x.com', 'image', 'site.com')
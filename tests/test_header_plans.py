@@ -0,0 +1,23 @@
+from sledge.browser.security.header_plans import HeaderPlanCache
+
+
+class _Settings:
+    revision = 0
+
+
+def test_cache_is_bounded_and_invalidated_by_settings():
+    """Test LRU eviction and settings-driven invalidation"""
+    settings = _Settings()
+    cache = HeaderPlanCache(settings, capacity=2)
+    cache.put('a', ())
+    cache.put('b', ())
+    cache.get('a')
+    cache.put('c', ())
+
+    assert cache.get('b') is None
+    assert cache.get('a') == ()
+    assert len(cache) == 2
+
+    settings.revision += 1
+    assert cache.get('a') is None
+    assert len(cache) == 0
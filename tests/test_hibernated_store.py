@@ -0,0 +1,27 @@
+from sledge.browser.tabs.snapshots import TabSnapshot
+from sledge.browser.tabs.store import HibernatedTabStore
+
+
+def make_snapshot(n):
+    return TabSnapshot(f'https://example.com/{n}', f'Page {n}', history=b'h' * 2000,
+                       scroll=(0.0, float(n)), thumbnail=b't' * 3000, icon=b'i' * 200)
+
+
+def test_group_round_trip(tmp_path):
+    store = HibernatedTabStore(str(tmp_path / 'tabs.db'))
+    store.put_many([(n, make_snapshot(n), 'work') for n in range(1, 51)])
+
+    assert len(store) == 50
+    assert store.index[7].url == 'https://example.com/7'
+    assert store.thumbnail(7) == b't' * 3000
+    assert store.disk_bytes() >= store.payload_bytes() > 10 * store.resident_bytes()
+
+    woken = store.take_many(range(1, 26))
+    assert sorted(woken) == list(range(1, 26))
+    assert woken[3].history == b'h' * 2000 and woken[3].scroll == (0.0, 3.0)
+    assert len(store) == 25 and 3 not in store and store.get(3) is None
+
+    store.discard(30)
+    assert store.take(30) is None and len(store) == 24
+    store.close()
+    assert not (tmp_path / 'tabs.db').exists()
@@ -0,0 +1,78 @@
+import json
+
+from sledge.bench.interceptor_bench import (
+    CorpusEntry, FakeRequestInfo, find_regressions, format_report, load_corpus, run_benchmark,
+)
+from sledge.browser.security.header_plans import HeaderPlanCache
+from sledge.browser.security.rules import RuleEngine
+
+
+class RulesInterceptor:
+    """Same shape as the WebView interceptor, without needing QtWebEngine"""
+
+    def __init__(self):
+        self.rules = RuleEngine.load(directory=None)
+        self.header_plans = HeaderPlanCache()
+
+    def interceptRequest(self, info):
+        self.rules.apply(info, self.header_plans)
+
+
+def test_load_har_and_url_list(tmp_path):
+    """Test reading HAR entries and URL list lines into corpus entries"""
+    har = tmp_path / 'page.har'
+    har.write_text(json.dumps({'log': {
+        'pages': [{'id': 'page_1', 'title': 'https://www.wcofun.net/show'}],
+        'entries': [
+            {'pageref': 'page_1', '_resourceType': 'document',
+             'request': {'url': 'https://www.wcofun.net/show', 'headers': []}},
+            {'pageref': 'page_1', '_resourceType': 'document',
+             'request': {'url': 'https://embed.watchanimesub.net/inc/embed/video.php', 'headers': []}},
+            {'pageref': 'page_1', 'request': {'url': 'https://cdn.example.com/app.js', 'headers': []}},
+            {'pageref': 'page_1', 'request': {'url': 'data:image/png;base64,AAAA', 'headers': []}},
+        ],
+    }}))
+    urls = tmp_path / 'urls.txt'
+    urls.write_text("# corpus\n\nhttps://a.com/v.mp4\nhttps://a.com/x - https://b.com/\n"
+                    "https://a.com/api xhr\n")
+
+    corpus = load_corpus([str(har), str(urls)])
+    assert [entry.resource_type for entry in corpus] == [
+        'mainframe', 'subframe', 'script', 'media', 'subresource', 'xhr']
+    assert corpus[1].first_party == 'https://www.wcofun.net/show'
+    assert corpus[4].first_party == 'https://b.com/'
+
+
+def test_fake_request_info_records_calls():
+    """Test that the fake request records headers, redirects and blocks"""
+    info = FakeRequestInfo('https://a.com/x', 'https://a.com/')
+    assert info.outcome() == 'untouched'
+    info.setHttpHeader(b'Accept', b'*/*')
+    assert info.outcome() == 'headers'
+    info.block(True)
+    assert info.outcome() == 'blocked'
+    info.reset()
+    assert info.outcome() == 'untouched' and info.headers == []
+
+
+def test_run_benchmark_reports_each_class():
+    """Test the report layout and the regression check"""
+    corpus = [
+        CorpusEntry('https://www.wcofun.net/show', 'https://www.wcofun.net/show', 'mainframe'),
+        CorpusEntry('https://cdn.example.com/getvid?evid=abc', 'https://www.wcofun.net/show', 'media'),
+        CorpusEntry('https://other.org/app.js', 'https://other.org/', 'script'),
+    ]
+
+    report = run_benchmark(RulesInterceptor(), corpus, iterations=3, warmup=1)
+    assert set(report['classes']) == {'mainframe', 'media', 'script'}
+    total = report['total']
+    assert total['requests'] == 9
+    assert total['p50_us'] <= total['p99_us']
+    assert sum(total['outcomes'].values()) == 3
+    assert 'alloc_bytes' in report['classes']['media']
+    assert 'total' in format_report(report)
+
+    slower = json.loads(json.dumps(report))
+    slower['total']['p50_us'] = total['p50_us'] / 2
+    assert [name for name, *_ in find_regressions(report, slower, 10)] == ['total']
+    assert find_regressions(report, report, 10) == []
@@ -0,0 +1,61 @@
+import json
+import threading
+
+from sledge.browser.security.metrics import (
+    InterceptorMetrics, bucket_bounds, bucket_index, MAX_NS,
+)
+
+
+def test_buckets_bound_relative_error():
+    """Test that every value lands in a bucket within 1/8 of it"""
+    previous = -1
+    for value in list(range(0, 200)) + [1000, 12345, 10 ** 6, 987654321, MAX_NS]:
+        index = bucket_index(value)
+        low, high = bucket_bounds(index)
+        assert low <= value <= high
+        assert high - low <= low // 8
+        assert index >= previous
+        previous = index
+    assert bucket_index(MAX_NS * 10) == bucket_index(MAX_NS)
+
+
+def test_percentiles_and_branches():
+    """Test the counters and latency percentiles in a snapshot"""
+    metrics = InterceptorMetrics()
+    for _ in range(98):
+        metrics.record(InterceptorMetrics.DEFAULT, 10_000)
+    metrics.record(InterceptorMetrics.CDN, 1_000_000, redirected=True)
+    metrics.record(InterceptorMetrics.BLOCKED, 5_000)
+
+    snap = metrics.snapshot()
+    assert snap['requests'] == 100
+    assert snap['branches'] == {'default': 98, 'cdn': 1, 'wco': 0, 'video': 0, 'blocked': 1}
+    assert snap['redirects'] == 1
+    assert 10 <= snap['latency_us']['p50'] <= 11.3
+    assert 10 <= snap['latency_us']['p99'] <= 11.3
+    assert 1000 <= snap['latency_us']['p99.9'] <= 1125
+    assert snap['latency_us']['max'] == 1000
+    assert sum(count for _, count in snap['histogram_us']) == 100
+    assert json.loads(metrics.to_json())['requests'] == 100
+
+
+def test_threads_record_into_their_own_shards():
+    """Test that per-thread counts add up and reset clears them"""
+    metrics = InterceptorMetrics()
+
+    def work():
+        for _ in range(1000):
+            metrics.record(InterceptorMetrics.VIDEO, 2_000)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(metrics._shards) == 4
+    assert metrics.snapshot()['branches']['video'] == 4000
+    metrics.reset()
+    assert metrics.snapshot()['requests'] == 0
+    metrics.record(InterceptorMetrics.WCO, 1)
+    assert metrics.snapshot()['branches']['wco'] == 1
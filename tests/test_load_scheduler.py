@@ -0,0 +1,87 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from sledge.browser.tabs.loads import LoadPriority, LoadScheduler
+from sledge.browser.tabs.pressure import PressureLevel
+from sledge.browser.tabs.registry import TabRegistry
+
+
+class FakeView(QObject):
+    loadFinished = pyqtSignal(bool)
+
+
+def setup(count, max_in_flight, priorities=None):
+    registry = TabRegistry()
+    views = {}
+    for index in range(count):
+        view = FakeView()
+        views[registry.inserted(index, view)] = view
+    priorities = priorities or {}
+    scheduler = LoadScheduler(registry, lambda tab_id: priorities.get(tab_id, LoadPriority.BACKGROUND),
+                              max_in_flight=max_in_flight)
+    started = []
+
+    def schedule(tab_id):
+        def start():
+            started.append(tab_id)
+            return views[tab_id]
+        scheduler.schedule(tab_id, start)
+    return registry, views, scheduler, started, schedule
+
+
+def test_loads_are_admitted_as_others_finish():
+    registry, views, scheduler, started, schedule = setup(5, 2)
+    for tab_id in registry:
+        schedule(tab_id)
+
+    assert started == [1, 2] and len(scheduler) == 3
+    views[2].loadFinished.emit(True)
+    assert started == [1, 2, 3]
+    views[2].loadFinished.emit(True)  # Later navigations of a finished tab don't count
+    assert started == [1, 2, 3]
+
+
+def test_priority_classes_and_pressure():
+    priorities = {4: LoadPriority.SAME_GROUP}
+    registry, views, scheduler, started, schedule = setup(5, 1, priorities)
+    scheduler.set_pressure(PressureLevel.CRITICAL)
+    for tab_id in registry:
+        schedule(tab_id)
+    assert started == []
+
+    # The current tab never waits
+    priorities[5] = LoadPriority.FOREGROUND
+    scheduler.reprioritize()
+    assert started == [5]
+
+    scheduler.set_pressure(PressureLevel.NONE)
+    views[5].loadFinished.emit(True)
+    assert started == [5, 4]
+
+    scheduler.cancel(1)
+    views[4].loadFinished.emit(True)
+    assert started == [5, 4, 2]
+
+
+def test_a_failing_start_does_not_stall_the_queue():
+    registry, views, scheduler, started, schedule = setup(3, 1)
+
+    def start():
+        raise RuntimeError("wrapped C/C++ object has been deleted")
+    scheduler.schedule(1, start)
+    schedule(2)
+    schedule(3)
+
+    assert started == [2]
+    views[2].loadFinished.emit(True)
+    assert started == [2, 3]
+
+
+def test_cancelling_a_running_load_admits_the_next():
+    registry, views, scheduler, started, schedule = setup(3, 1)
+    for tab_id in registry:
+        schedule(tab_id)
+
+    scheduler.cancel(2)   # Still queued
+    scheduler.cancel(1)   # Running, e.g. its tab was hibernated
+    assert started == [1, 3]
+    assert scheduler.in_flight == [3]
@@ -0,0 +1,42 @@
+from sledge.utils.logger import Logger, LogCategory, LogLevel
+
+
+class _Counting:
+    """Counts how often it gets formatted"""
+    calls = 0
+
+    def __str__(self):
+        _Counting.calls += 1
+        return "value"
+
+
+def test_disabled_category_records_nothing():
+    """Test that disabled log sites neither queue nor format"""
+    Logger.categories = LogCategory.CDN
+    Logger.level = LogLevel.INFO
+    Logger._buffer.clear()
+
+    Logger.info(LogCategory.VIDEO, "[VIDEO] %s", _Counting())
+    Logger.debug(LogCategory.CDN, "[CDN] %s", _Counting())
+
+    assert len(Logger._buffer) == 0
+    assert _Counting.calls == 0
+
+
+def test_enabled_records_are_written(tmp_path):
+    """Test that queued records reach the log file with their tag"""
+    path = tmp_path / 'network.log'
+    Logger.configure(categories='cdn,wco', level='debug', path=str(path))
+    try:
+        Logger.debug(LogCategory.WCO, "[WCO] Processing: %s", "https://www.wcofun.net/")
+        Logger.info(LogCategory.REQUEST, "[REQUEST] %s", "ignored")
+        Logger.error("Failed: %s", "boom")
+    finally:
+        Logger.shutdown()
+        Logger.categories = 0
+        Logger.level = LogLevel.INFO
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 2
+    assert lines[0].endswith("🎬 [WCO] Processing: https://www.wcofun.net/")
+    assert lines[1].endswith("ERROR Failed: boom")
@@ -0,0 +1,43 @@
+from sledge.browser.security.matcher import HostTrie, TokenMatcher
+
+
+def test_host_trie_matches_suffixes_on_label_boundaries():
+    """Test that domains match themselves and subdomains only"""
+    trie = HostTrie()
+    trie.add('google.com', 1)
+    trie.add('cdn.example.net', 2)
+
+    assert trie.match('google.com') == 1
+    assert trie.match('www.google.com') == 1
+    assert trie.match('notgoogle.com') == 0
+    assert trie.match('cdn.example.net') == 2
+    assert trie.match('example.net') == 0
+
+
+def test_host_trie_wildcard_tld():
+    """Test that a wildcard TLD matches the name under any TLD"""
+    trie = HostTrie()
+    trie.add('wcofun.*', 4)
+
+    assert trie.match('wcofun.net') == 4
+    assert trie.match('www.wcofun.org') == 4
+    assert trie.match('wcofun') == 0
+    assert trie.match('example.net') == 0
+
+
+def test_token_matcher_reports_contained_tokens():
+    """Test that overlapping tokens are all reported from one scan"""
+    matcher = TokenMatcher([('getvid', 1), ('getvideo', 2), ('video', 4), ('.ts', 8)])
+
+    assert matcher.match('/api/getvideo?id=1') == 1 | 2 | 4
+    assert matcher.match('/getvid?evid=1') == 1
+    assert matcher.match('/seg/001.ts') == 8
+    assert matcher.match('/index.html') == 0
+
+
+def test_token_matcher_finds_overlapping_tokens():
+    """Test that a match doesn't consume text another token starts in"""
+    matcher = TokenMatcher([('watch', 1), ('chunk', 2)])
+
+    assert matcher.match('/watchunk') == 1 | 2
+    assert matcher.match('/chunk/watch') == 1 | 2
@@ -0,0 +1,31 @@
+from sledge.browser.tabs.pressure import (
+    PressureLevel, cgroup_dir, events_level, parse_flat_keyed, parse_psi, poll_interval,
+)
+
+
+def test_parse_pressure_files():
+    psi = parse_psi("some avg10=1.50 avg60=0.20 avg300=0.00 total=12345\n"
+                    "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n")
+    assert psi['some']['avg10'] == 1.5 and psi['full']['total'] == 0
+
+    events = parse_flat_keyed("low 0\nhigh 12\nmax 0\noom 0\noom_kill 0\n")
+    assert events == {'low': 0, 'high': 12, 'max': 0, 'oom': 0, 'oom_kill': 0}
+
+
+def test_cgroup_dir_only_for_v2_child_groups():
+    assert cgroup_dir("0::/user.slice/app.scope\n", '/sys/fs/cgroup') == '/sys/fs/cgroup/user.slice/app.scope'
+    assert cgroup_dir("0::/\n") is None
+    assert cgroup_dir("4:memory:/docker/abc\n") is None
+
+
+def test_memory_events_levels():
+    before = {'high': 3, 'max': 0, 'oom': 0}
+    assert events_level(before, dict(before)) == PressureLevel.NONE
+    assert events_level(before, {**before, 'high': 4}) == PressureLevel.MODERATE
+    assert events_level(before, {**before, 'high': 4, 'max': 1}) == PressureLevel.CRITICAL
+
+
+def test_polling_speeds_up_near_the_threshold():
+    assert poll_interval(20, 75) == 10_000
+    assert poll_interval(70, 75) == 2_500
+    assert poll_interval(80, 75) == 250
@@ -0,0 +1,25 @@
+import os
+
+from sledge.browser.tabs.renderers import apportion_cpu, apportion_memory, process_cpu, process_memory
+
+
+def test_shared_renderers_are_split_across_their_tabs():
+    pid_tabs = {100: [1], 200: [2, 3, 4], 300: [5]}
+    usage = {100: (90_000, 80_000), 200: (300_000, 250_000)}  # 300 couldn't be read
+
+    assert apportion_memory(pid_tabs, usage) == {1: 90_000, 2: 100_000, 3: 100_000, 4: 100_000}
+
+
+def test_process_memory_reads_own_process():
+    pss, uss = process_memory(os.getpid())
+    assert pss > 0 and uss > 0
+    assert process_memory(2 ** 22 + 12345) is None
+
+
+def test_renderer_cpu_is_split_and_needs_a_baseline():
+    assert apportion_cpu({100: [1, 2], 200: [3]}, {100: 80.0, 200: None}) == {1: 40.0, 2: 40.0}
+
+    processes = {}
+    assert process_cpu(processes, os.getpid()) == 0.0
+    assert process_cpu(processes, os.getpid()) >= 0.0
+    assert process_cpu(processes, 2 ** 22 + 12345) is None and len(processes) == 1
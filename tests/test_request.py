@@ -0,0 +1,54 @@
+from PyQt6.QtCore import QUrl
+
+from sledge.browser.security.request import ParsedRequest, QueryParams, resource_type_name
+
+
+class FakeRequestInfo:
+    """Stands in for QWebEngineUrlRequestInfo"""
+
+    def __init__(self, url, first_party='https://page.net/', resource_type='xhr'):
+        self.url = QUrl(url)
+        self.first_party = QUrl(first_party)
+        self.resource_type = resource_type
+
+    def requestUrl(self):
+        return self.url
+
+    def firstPartyUrl(self):
+        return self.first_party
+
+    def resourceType(self):
+        return self.resource_type
+
+
+class ResourceType:
+    name = 'ResourceTypeMedia'
+
+
+def test_parsed_request_fields():
+    """Test that the URL is split once into the fields the stages use"""
+    info = FakeRequestInfo('HTTPS://Media.Example.com:8443/Path/Video.MP4?Evid=AbC#t=10',
+                           'https://www.page.net/watch', ResourceType())
+    request = ParsedRequest.from_info(info)
+    assert request.scheme == 'https'
+    assert request.host == 'media.example.com'
+    assert request.port == 8443
+    assert request.path == '/path/video.mp4?evid=abc#t=10'
+    assert request.resource_type == 'media'
+    assert request.first_party_host == 'www.page.net'
+    assert request.first_party_url == 'https://www.page.net/watch'
+    assert request.query.get('Evid') == 'AbC'
+    assert resource_type_name('xhr') == 'xhr'
+
+
+def test_query_params_multidict():
+    """Test repeated names, values containing '=' and raw values"""
+    query = QueryParams.from_url('https://a.com/getvid?evid=a%3Db==&t=1&t=2&flag&=x#frag')
+    assert query.get('evid') == 'a%3Db=='
+    assert query.getall('t') == ['1', '2']
+    assert query.get('flag') == ''
+    assert 'flag' in query and 'missing' not in query
+    assert query.get('missing', 'default') == 'default'
+    assert query.to_dict() == {'evid': 'a%3Db==', 't': '1', 'flag': '', '': 'x'}
+    assert len(query) == 5
+    assert not QueryParams.from_url('https://a.com/')
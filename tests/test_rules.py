@@ -0,0 +1,132 @@
+import json
+import pytest
+from PyQt6.QtCore import QUrl
+
+from sledge.browser.security.header_plans import HeaderPlanCache
+from sledge.browser.security.rules import RuleEngine, RuleError
+
+
+class FakeRequestInfo:
+    """Stands in for QWebEngineUrlRequestInfo"""
+
+    def __init__(self, url, first_party='https://page.net/', resource_type='xhr'):
+        self.url = QUrl(url)
+        self.first_party = QUrl(first_party)
+        self.resource_type = resource_type
+        self.headers = {}
+        self.redirected_to = None
+        self.blocked = False
+
+    def requestUrl(self):
+        return self.url
+
+    def firstPartyUrl(self):
+        return self.first_party
+
+    def resourceType(self):
+        return self.resource_type
+
+    def setHttpHeader(self, name, value):
+        self.headers[name] = value
+
+    def redirect(self, url):
+        self.redirected_to = url.toString()
+
+    def block(self, blocked):
+        self.blocked = blocked
+
+
+RULES = [
+    {"id": "base", "action": {"setHeaders": {"Accept": "text/html", "X-Frame-Options": "DENY"}}},
+    {"id": "media-host", "priority": 5,
+     "condition": {"hostSuffix": ["media.*"], "excludedHostSuffix": ["static.media.net"]},
+     "action": {"setHeaders": {"Accept": "*/*"}, "removeHeaders": ["X-Frame-Options"], "tagMedia": True}},
+    {"id": "frames-only", "condition": {"resourceTypes": ["subframe"], "firstPartyHost": ["page.net"]},
+     "action": {"setHeaders": {"X-Frame": "1"}}},
+    {"id": "sign", "priority": 9,
+     "condition": {"hostSuffix": ["media.*"], "pathContains": ["getvid"], "queryParams": {"evid": ""}},
+     "action": {"redirect": {"query": {"t": "{now}", "embed": "{query.embed|neptun}"},
+                             "sign": {"param": "h", "template": "{query.evid}{query.t}salt", "when": "evid"}}}},
+    {"id": "ads", "priority": 9, "condition": {"pathContains": ["/ads/"]}, "action": {"block": True}},
+]
+
+
+def test_headers_follow_priority_and_conditions():
+    """Test that higher priority rules win and conditions narrow the match"""
+    engine = RuleEngine.from_data(RULES)
+    assert [r.id for r in engine.match('cdn.media.org', 'xhr', path='/a.mp4')] == ['base', 'media-host']
+    assert [r.id for r in engine.match('static.media.net', 'xhr')] == ['base']
+    assert [r.id for r in engine.match('example.com', 'subframe', 'www.page.net')] == ['base', 'frames-only']
+    assert [r.id for r in engine.match('example.com', 'subframe', 'other.net')] == ['base']
+
+    info = FakeRequestInfo('https://cdn.media.org/a.mp4')
+    outcome = engine.apply(info, HeaderPlanCache())
+    assert info.headers == {b"Accept": b"*/*", b"X-Frame-Options": b""}
+    assert outcome.media_url == 'https://cdn.media.org/a.mp4'
+
+
+def test_templated_redirect_and_block(monkeypatch):
+    """Test query templates, signing and blocking"""
+    monkeypatch.setattr('time.time', lambda: 1000)
+    engine = RuleEngine.from_data(RULES)
+
+    info = FakeRequestInfo('https://media.net/getvid?evid=7&x=1')
+    outcome = engine.apply(info)
+    assert info.redirected_to == ('https://media.net/getvid?evid=7&x=1&t=1000&embed=neptun'
+                                  '&h=f7b0417f5b3bec6890fb467a16a104d6')
+    assert outcome.redirect_url == info.redirected_to
+
+    info = FakeRequestInfo('https://media.net/getvid?x=1')
+    engine.apply(info)
+    assert info.redirected_to is None
+
+    info = FakeRequestInfo('https://example.com/ads/banner.js')
+    assert engine.apply(info).blocked
+    assert info.blocked
+
+
+def test_later_rules_replace_and_disable_by_id():
+    """Test that user rule files can override or switch off rules"""
+    engine = RuleEngine.from_data(RULES + [
+        {"id": "ads", "enabled": False},
+        {"id": "base", "action": {"setHeaders": {"Accept": "*/*"}}},
+    ])
+    assert [r.id for r in engine.match('example.com', path='/ads/x')] == ['base']
+    base = next(rule for rule in engine.rules if rule.id == 'base')
+    assert base.set_headers == ((b"Accept", b"*/*"),)
+
+
+def test_invalid_rules_are_rejected():
+    """Test that malformed rules raise RuleError"""
+    with pytest.raises(RuleError):
+        RuleEngine.from_data([{"action": {"block": True}}])
+    with pytest.raises(RuleError):
+        RuleEngine.from_data([{"id": "x", "action": {"redirect": {"url": "https://a/{bogus}"}}}])
+
+
+@pytest.mark.parametrize("rule", [
+    {"id": "x", "condition": []},
+    {"id": "x", "condition": {"hostSuffix": "example.com"}},
+    {"id": "x", "action": {"setHeaders": {"Referer": 1}}},
+    {"id": "x", "action": {"redirect": {"sign": {"template": "{url}"}}}},
+    {"id": "x", "priority": "high"},
+])
+def test_schema_errors_are_rule_errors(rule):
+    """Test that wrongly typed fields raise RuleError rather than crashing startup"""
+    with pytest.raises(RuleError):
+        RuleEngine.from_data([rule])
+
+
+def test_rule_errors_name_the_file_and_index(tmp_path):
+    """Test that a broken rule file is reported with its path and rule number"""
+    path = tmp_path / 'broken.json'
+    path.write_text(json.dumps({"rules": [{"id": "ok"}, {"id": "bad", "condition": []}]}))
+    with pytest.raises(RuleError, match=r"broken\.json, rule #1"):
+        RuleEngine.load(directory=str(tmp_path), defaults=None)
+
+
+def test_bundled_rules_load():
+    """Test that the shipped default rules compile"""
+    engine = RuleEngine.load(directory=None)
+    ids = {rule.id for rule in engine.rules}
+    assert {'cdn', 'cdn-getvid', 'wco', 'video-hls'} <= ids
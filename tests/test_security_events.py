@@ -0,0 +1,88 @@
+import asyncio
+import time
+from collections import namedtuple
+
+from sledge.browser.security.events import (
+    EventRing, SecurityEventPipeline, SUSPICIOUS_PATTERNS, PATH_TRAVERSAL, XSS, suspicious_kinds,
+)
+from sledge.browser.security.matcher import TokenMatcher
+
+Request = namedtuple('Request', 'url first_party_host resource_type')
+
+
+class RecordingHandler:
+    """Stands in for DefenseEventHandler"""
+
+    def __init__(self):
+        self.batches = []
+        self.stopped = False
+
+    async def start(self):
+        await asyncio.sleep(3600)
+
+    async def stop(self):
+        self.stopped = True
+
+    async def handle_events(self, events):
+        self.batches.append(events)
+
+
+def test_ring_drops_when_full_and_wraps():
+    """Test the drop counter and reuse of slots after popping"""
+    ring = EventRing(3)
+    assert ring.capacity == 4
+    assert all(ring.push(i) for i in range(4))
+    assert not ring.push(4)
+    assert ring.dropped == 1
+    assert ring.pop_many(3) == [0, 1, 2]
+    assert ring.push(5) and ring.push(6) and ring.push(7)
+    assert not ring.push(8)
+    assert ring.pop_many(10) == [3, 5, 6, 7]
+    assert len(ring) == 0 and ring.dropped == 2
+
+
+def test_suspicious_patterns_match_in_one_pass():
+    """Test that the compiled matcher reports every attack kind present"""
+    matcher = TokenMatcher(SUSPICIOUS_PATTERNS)
+    flags = matcher.match('/a/../b?q=%3cscript%3e')
+    assert flags == PATH_TRAVERSAL | XSS
+    assert suspicious_kinds(flags) == ['path_traversal', 'xss']
+    assert matcher.match('/watch?v=abc') == 0
+
+
+def test_pipeline_batches_events_to_handler():
+    """Test that a burst is delivered in batches and overflow is counted"""
+    handler = RecordingHandler()
+    pipeline = SecurityEventPipeline(lambda: handler, capacity=16, batch_size=8, batch_delay=0.01)
+    request = Request('https://a.com/x/../y', 'page.net', 'xhr')
+
+    # Nothing drains before the worker starts, so the ring fills and then drops
+    for _ in range(20):
+        pipeline.submit('suspicious_request', request, PATH_TRAVERSAL)
+    assert pipeline.dropped == 4
+
+    pipeline.start()
+    pipeline.stop()
+    assert pipeline.stats() == {'submitted': 20, 'dropped': 4, 'delivered': 16, 'failed': 0, 'queued': 0}
+    assert [len(batch) for batch in handler.batches] == [8, 8]
+    kind, data = handler.batches[0][0]
+    assert kind == 'suspicious_request'
+    assert data['url'] == request.url and data['patterns'] == ['path_traversal']
+    assert handler.stopped
+
+
+def test_pipeline_wakes_for_later_events():
+    """Test that events submitted after the worker idles are still delivered"""
+    handler = RecordingHandler()
+    pipeline = SecurityEventPipeline(lambda: handler, batch_delay=0.01)
+    pipeline.start()
+    request = Request('https://a.com/?q=union+select', '', 'mainframe')
+    deadline = time.time() + 2
+    while pipeline._loop is None and time.time() < deadline:
+        time.sleep(0.01)
+    for _ in range(3):
+        pipeline.submit('suspicious_request', request, 0)
+    while pipeline.delivered < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    pipeline.stop()
+    assert pipeline.delivered == 3
@@ -0,0 +1,27 @@
+from sledge.utils.sampler import FIELDS, MetricsRing, MetricsSnapshot, SystemSampler
+
+
+def row(n):
+    return MetricsSnapshot(*[float(n)] * len(FIELDS))
+
+
+def test_ring_keeps_the_last_capacity_snapshots():
+    ring = MetricsRing(4)
+    assert ring.latest() is None and ring.window() == []
+
+    for n in range(1, 7):
+        ring.append(row(n))
+
+    assert len(ring) == 4
+    assert ring.latest().time == 6
+    assert [s.time for s in ring.window()] == [3, 4, 5, 6]
+    assert ring.series('rss', 2) == [5, 6]
+
+
+def test_sampler_reads_own_process_tree():
+    sampler = SystemSampler(capacity=8)
+    snapshot = sampler.sample()
+
+    assert sampler.latest() == snapshot
+    assert snapshot.rss > 0 and 0 < snapshot.memory_used <= snapshot.memory_total
+    assert 0 <= snapshot.memory_percent <= 100
@@ -0,0 +1,71 @@
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QColor, QImage, QPainter
+
+from sledge.browser.tabs.appearance import PLAIN_LOOK, paint_tab_look, tab_look
+from sledge.browser.tabs.groups import TabGroup
+from sledge.browser.tabs.registry import TabRegistry
+from sledge.browser.tabs.states import TabState
+
+
+def make_registry(count):
+    registry = TabRegistry()
+    for index in range(count):
+        registry.inserted(index, object())
+    return registry
+
+
+def test_ungrouped_active_tab_has_the_plain_look():
+    registry = make_registry(1)
+    assert tab_look(registry.entry_at(0), {}, {}, set()) == PLAIN_LOOK
+
+
+def test_representative_carries_group_count():
+    registry = make_registry(3)
+    group = TabGroup('Docs', QColor('#a3be8c'))
+    for tab_id in registry:
+        registry.set_group(tab_id, 'Docs')
+        group.add_tab(tab_id)
+    representatives = {'Docs': registry.id_at(0)}
+
+    first = tab_look(registry.entry_at(0), {'Docs': group}, representatives, {'Docs'})
+    second = tab_look(registry.entry_at(1), {'Docs': group}, representatives, {'Docs'})
+
+    assert first.representative and first.collapsed and first.count == 3
+    assert not second.representative and second.count == 0
+    assert first.color == second.color == '#a3be8c'
+
+
+def test_only_changed_tabs_differ_on_a_500_tab_bar():
+    registry = make_registry(500)
+    groups = {name: TabGroup(name, QColor(color)) for name, color in
+              (('a', '#bf616a'), ('b', '#a3be8c'), ('c', '#5e81ac'))}
+    for tab_id in registry:
+        name = 'abc'[tab_id % 3]
+        registry.set_group(tab_id, name)
+        groups[name].add_tab(tab_id)
+    representatives = {name: group.tabs[0] for name, group in groups.items()}
+
+    def looks():
+        return {entry.id: tab_look(entry, groups, representatives, set(groups))
+                for entry in registry.entries()}
+
+    before = looks()
+    registry.set_state(registry.id_at(250), TabState.HIBERNATED)
+
+    after = looks()
+
+    assert [tab_id for tab_id in after if after[tab_id] != before[tab_id]] == [registry.id_at(250)]
+
+
+def test_paint_draws_group_strip_and_cursor():
+    image = QImage(200, 30, QImage.Format.Format_ARGB32)
+    image.fill(QColor('#2e3440'))
+    look = PLAIN_LOOK._replace(color='#bf616a', cursor=True)
+
+    painter = QPainter(image)
+    paint_tab_look(painter, QRect(0, 0, 200, 30), look)
+    painter.end()
+
+    assert image.pixelColor(2, 15) == QColor('#bf616a')
+    assert image.pixelColor(100, 1) == QColor('#ebcb8b')
+    assert image.pixelColor(100, 15) == QColor('#2e3440')
@@ -0,0 +1,100 @@
+import random
+from datetime import datetime, timedelta
+
+from sledge.browser.tabs.eviction import (
+    EvictionScheduler, GroupAwarePolicy, IndexedHeap, LFUPolicy, LRUPolicy, SizeWeightedPolicy,
+)
+from sledge.browser.tabs.registry import TabRegistry
+from sledge.browser.tabs.states import TabState
+
+
+def make_registry(count, memory=100 << 20):
+    registry = TabRegistry()
+    start = datetime.now() - timedelta(hours=2)
+    for index in range(count):
+        tab_id = registry.inserted(index, f"tab{index}")
+        registry.set_memory(tab_id, memory)
+        registry.entry(tab_id).last_accessed = start + timedelta(minutes=index)
+    return registry
+
+
+def test_indexed_heap_update_and_remove():
+    heap = IndexedHeap()
+    scores = {key: random.random() for key in range(200)}
+    for key, score in scores.items():
+        heap.push(key, score)
+    for key in range(0, 200, 3):
+        scores[key] = random.random()
+        heap.push(key, scores[key])
+    for key in range(1, 200, 5):
+        heap.remove(key)
+        del scores[key]
+
+    popped = [heap.pop() for _ in range(len(heap))]
+    assert popped == sorted((score, key) for key, score in scores.items())
+
+
+def test_lru_evicts_oldest_until_budget_met():
+    registry = make_registry(10)
+    scheduler = EvictionScheduler(registry, LRUPolicy())
+
+    selected = scheduler.select(250 << 20)
+    assert [entry.id for entry in selected] == [1, 2, 3]
+
+
+def test_only_changed_tabs_are_rescored():
+    registry = make_registry(50)
+    scheduler = EvictionScheduler(registry, LRUPolicy())
+    assert scheduler.refresh() == 50
+
+    registry.touch(1)
+    registry.set_state(2, TabState.HIBERNATED)
+    assert scheduler.refresh() == 2
+    assert 2 not in scheduler.heap
+    assert scheduler.select(1)[0].id == 3
+
+
+def test_recently_used_and_protected_tabs_are_skipped():
+    registry = make_registry(5)
+    scheduler = EvictionScheduler(registry, LRUPolicy(), is_evictable=lambda entry: entry.id != 1)
+    registry.touch(2)  # Just used, inside min_idle
+
+    assert [entry.id for entry in scheduler.select(200 << 20)] == [3, 4]
+    assert 1 in scheduler.heap and 2 in scheduler.heap
+
+
+def test_lfu_and_size_weighted_orders():
+    registry = make_registry(3)
+    for _ in range(3):
+        registry.touch(1)
+    registry.touch(2)
+    registry.entry(1).last_accessed = registry.entry(2).last_accessed = datetime.now() - timedelta(hours=1)
+    assert [e.id for e in EvictionScheduler(registry, LFUPolicy()).select(3 << 30)] == [3, 2, 1]
+
+    registry.set_memory(2, 800 << 20)
+    assert EvictionScheduler(registry, SizeWeightedPolicy()).select(1)[0].id == 2
+
+
+def test_group_aware_keeps_current_group_and_evicts_hidden_first():
+    registry = make_registry(6)
+    members = {'work': [1, 2], 'old': [5, 6]}
+    for group, tab_ids in members.items():
+        for tab_id in tab_ids:
+            registry.set_group(tab_id, group)
+    scheduler = EvictionScheduler(registry, GroupAwarePolicy(), group_members=members.get)
+    scheduler.collapsed_groups = {'old'}
+    scheduler.set_current_group('work')
+
+    order = [entry.id for entry in scheduler.select(6 << 30)]
+    assert order == [5, 6, 3, 4, 1, 2]
+
+
+def test_unsampled_tabs_use_an_estimate_and_a_pass_is_capped():
+    registry = make_registry(40, memory=0)
+    scheduler = EvictionScheduler(registry, LRUPolicy(), memory_estimate=lambda: 200 << 20)
+
+    # Nothing sampled yet: 500 MB is three tabs at the estimate, not all forty
+    assert [entry.id for entry in scheduler.select(500 << 20)] == [1, 2, 3]
+
+    scheduler = EvictionScheduler(registry, LRUPolicy(), max_per_pass=5)
+    assert len(scheduler.select(100 << 30)) == 5
@@ -0,0 +1,81 @@
+from sledge.browser.tabs.model import UNGROUPED, TabFilterModel, TabListModel, TabRoles
+from sledge.browser.tabs.registry import TabRegistry
+from sledge.browser.tabs.states import TabState
+
+
+def make_model(count):
+    registry = TabRegistry()
+    for index in range(count):
+        tab_id = registry.inserted(index, object())
+        registry.update(tab_id, url=f'https://example.com/{tab_id}', title=f'Page {tab_id}')
+    model = TabListModel(registry)
+    return registry, model
+
+
+def record(model):
+    events = []
+    model.rowsInserted.connect(lambda parent, first, last: events.append(('insert', first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: events.append(('remove', first, last)))
+    model.rowsMoved.connect(lambda parent, start, end, dest, row: events.append(('move', start, row)))
+    model.dataChanged.connect(lambda first, last, roles: events.append(('changed', first.row(), last.row())))
+    return events
+
+
+def test_rows_follow_the_registry():
+    registry, model = make_model(3)
+    events = record(model)
+
+    registry.inserted(1, object())
+    assert [model.tab_id(row) for row in range(model.rowCount())] == [1, 4, 2, 3]
+
+    registry.removed(0)
+    registry.moved(0, 2)
+
+    assert [model.tab_id(row) for row in range(model.rowCount())] == list(registry)
+    assert events[0] == ('insert', 1, 1)
+    assert ('remove', 0, 0) in events
+    assert events[-1] == ('move', 0, 3)
+
+
+def test_metadata_change_touches_one_row():
+    registry, model = make_model(100)
+    events = record(model)
+
+    registry.set_state(50, TabState.HIBERNATED)
+
+    assert events == [('changed', 49, 49)]
+    assert model.data(model.index(49, TabListModel.STATE)) == "Hibernated"
+    assert model.data(model.index(49, 0), TabRoles.STATE) == TabState.HIBERNATED
+
+
+def test_replacing_a_widget_keeps_the_row():
+    registry, model = make_model(3)
+    events = record(model)
+
+    with registry.replacing(2):
+        registry.removed(1)
+        registry.inserted(1, object())
+
+    assert model.rowCount() == 3
+    assert [event[0] for event in events] == ['changed']
+
+
+def test_filter_by_group_and_text():
+    registry, model = make_model(6)
+    for tab_id in (1, 2, 3):
+        registry.set_group(tab_id, 'Docs')
+    registry.update(5, title='Python docs')
+    proxy = TabFilterModel(model)
+
+    proxy.set_group('Docs')
+    assert proxy.tab_ids() == [1, 2, 3]
+
+    proxy.set_group(UNGROUPED)
+    assert proxy.tab_ids() == [4, 5, 6]
+
+    proxy.set_text('PYTHON')
+    assert proxy.tab_ids() == [5]
+
+    # Dynamic: a tab renamed to match shows up without repopulating
+    registry.update(6, title='More python')
+    assert proxy.tab_ids() == [5, 6]
@@ -0,0 +1,80 @@
+import random
+
+from sledge.browser.tabs.ordering import group_layout, longest_increasing_subsequence, minimal_moves
+from sledge.browser.tabs.registry import TabRegistry
+
+
+def apply(order, moves):
+    order = list(order)
+    for from_index, to_index in moves:
+        order.insert(to_index, order.pop(from_index))
+    return order
+
+
+def test_lis_positions():
+    values = [3, 1, 4, 1, 5, 9, 2, 6]
+    positions = longest_increasing_subsequence(values)
+    picked = [values[p] for p in positions]
+    assert len(picked) == 4
+    assert picked == sorted(set(picked))
+    assert longest_increasing_subsequence([]) == []
+
+
+def test_one_move_for_one_misplaced_tab():
+    assert minimal_moves(['d', 'a', 'b', 'c'], ['a', 'b', 'c', 'd']) == [(0, 3)]
+    assert minimal_moves(['b', 'c', 'd', 'a'], ['a', 'b', 'c', 'd']) == [(3, 0)]
+    assert minimal_moves(list('abc'), list('abc')) == []
+
+
+def test_moves_reach_target_with_the_fewest_moves():
+    rng = random.Random(7)
+    for _ in range(50):
+        target = list(range(60))
+        current = target[:]
+        rng.shuffle(current)
+        moves = minimal_moves(current, target)
+        ranks = [target.index(tab_id) for tab_id in current]
+        assert apply(current, moves) == target
+        assert len(moves) == len(target) - len(longest_increasing_subsequence(ranks))
+
+
+def make_entries(groups):
+    registry = TabRegistry()
+    for index, group in enumerate(groups):
+        tab_id = registry.inserted(index, object())
+        registry.set_group(tab_id, group)
+    return registry
+
+
+def test_collapsed_groups_show_representatives_then_ungrouped():
+    registry = make_entries([None, 'a', 'b', 'a', None, 'b'])
+    order, visible, chosen = group_layout(registry.entries(), {'a', 'b'}, {'b': 6}, current_id=4)
+
+    assert chosen == {'a': 4}   # The current tab is preferred
+    assert visible == [4, 6, 1, 5]
+    assert order == [4, 6, 1, 5, 2, 3]
+
+
+def test_expanded_group_shows_only_its_tabs():
+    registry = make_entries(['a', None, 'b', 'b', 'a'])
+    order, visible, chosen = group_layout(registry.entries(), {'a'}, {'a': 1}, current_id=1)
+
+    assert visible == [3, 4]
+    assert order == [3, 4, 1, 2, 5]
+    assert chosen == {}
+
+
+def test_expanding_a_200_tab_group_takes_the_fewest_moves():
+    registry = make_entries(['big'] * 200 + ['small'] * 100 + [None] * 200)
+    collapsed = {'big', 'small'}
+    representatives = {'big': 1, 'small': 201}
+    order, _, _ = group_layout(registry.entries(), collapsed, representatives)
+    current = order
+
+    order, visible, _ = group_layout(registry.entries(), collapsed - {'big'}, representatives)
+    moves = minimal_moves(current, order)
+
+    assert visible == list(range(1, 201))
+    assert apply(current, moves) == order
+    ranks = [order.index(tab_id) for tab_id in current]
+    assert len(moves) == len(order) - len(longest_increasing_subsequence(ranks))
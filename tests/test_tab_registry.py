@@ -0,0 +1,56 @@
+from sledge.browser.tabs.registry import TabRegistry
+from sledge.browser.tabs.states import TabState
+
+
+def open_tabs(registry, *names):
+    return [registry.inserted(len(registry), name) for name in names]
+
+
+def test_ids_follow_moves_and_removals():
+    registry = TabRegistry()
+    a, b, c, d = open_tabs(registry, 'a', 'b', 'c', 'd')
+
+    registry.moved(0, 3)  # b c d a
+    assert [registry.index_of(tab_id) for tab_id in (a, b, c, d)] == [3, 0, 1, 2]
+    assert registry.id_at(3) == a
+
+    entry = registry.removed(1)  # b d a
+    assert entry.id == c and entry.index == -1
+    assert c not in registry
+    assert registry.index_of(c) == -1
+    assert [registry.index_of(tab_id) for tab_id in (b, d, a)] == [0, 1, 2]
+    assert registry.id_of('c') is None
+
+    e = registry.inserted(0, 'e')  # e b d a
+    assert e not in (a, b, c, d)
+    assert registry.index_of(a) == 3
+    assert list(registry) == [e, b, d, a]
+
+
+def test_replacing_keeps_id_and_metadata():
+    registry = TabRegistry()
+    a, b = open_tabs(registry, 'view', 'other')
+    registry.set_group(a, 'Research')
+    registry.set_state(a, TabState.HIBERNATED)
+
+    with registry.replacing(a):
+        assert registry.removed(0) is None
+        assert registry.inserted(0, 'placeholder') == a
+
+    entry = registry.entry(a)
+    assert entry.widget == 'placeholder' and entry.group == 'Research'
+    assert registry.id_of('placeholder') == a and registry.id_of('view') is None
+    assert registry.state_counts()[TabState.HIBERNATED] == 1
+
+
+def test_state_counts_track_changes():
+    registry = TabRegistry()
+    a, b, c = open_tabs(registry, 'a', 'b', 'c')
+    registry.set_state(b, TabState.SNOOZED)
+    registry.set_state(c, TabState.FROZEN)
+    registry.removed(registry.index_of(c))
+
+    counts = registry.state_counts()
+    assert counts[TabState.ACTIVE] == 1
+    assert counts[TabState.SNOOZED] == 1
+    assert counts[TabState.FROZEN] == 0
@@ -0,0 +1,21 @@
+from PyQt6.QtGui import QColor, QImage
+
+from sledge.browser.tabs.snapshots import TabSnapshot, make_thumbnail
+
+
+def test_thumbnail_is_a_small_jpeg():
+    grab = QImage(1920, 1080, QImage.Format.Format_ARGB32)
+    grab.fill(QColor('#336699'))
+
+    thumbnail = make_thumbnail(grab)
+    image = QImage.fromData(thumbnail, 'JPEG')
+
+    assert (image.width(), image.height()) == (192, 108)
+    assert len(thumbnail) < 8 * 1024
+    assert make_thumbnail(QImage()) == b''
+
+
+def test_snapshot_size_counts_payloads():
+    snapshot = TabSnapshot('https://example.com/', 'Example', history=b'h' * 100,
+                           scroll=(0.0, 640.0), thumbnail=b't' * 50, icon=b'i' * 10)
+    assert snapshot.size() == 100 + 50 + 10 + len('https://example.com/') + len('Example')
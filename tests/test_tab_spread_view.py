@@ -0,0 +1,80 @@
+import os
+
+from PyQt6.QtCore import QEvent, Qt
+from PyQt6.QtGui import QColor, QImage, QKeyEvent
+from PyQt6.QtWidgets import QApplication
+
+from sledge.browser.tabs.model import UNGROUPED, TabListModel, TabRoles
+from sledge.browser.tabs.registry import TabRegistry
+from sledge.browser.tabs.spread_view import TabSpreadView
+
+
+class FakeTabWidget:
+    """The parts of a TabWidget a TabSpreadView uses"""
+
+    def __init__(self, titles):
+        self.registry = TabRegistry()
+        self.groups = {}
+        self.thumbnails = {}
+        for index, title in enumerate(titles):
+            tab_id = self.registry.inserted(index, object())
+            self.registry.update(tab_id, url=f'https://example.com/{tab_id}', title=title)
+        self.tab_model = TabListModel(self.registry, thumbnail_of=self.thumbnails.get)
+
+    def tab_id(self, index):
+        return self.registry.id_at(index)
+
+
+# Widgets need a QApplication, kept alive for the whole module
+_app = None
+
+
+def make_view(titles):
+    global _app
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    _app = QApplication.instance() or QApplication([])
+    tab_widget = FakeTabWidget(titles)
+    return tab_widget, TabSpreadView(tab_widget)
+
+
+def test_group_and_text_filter_the_tiles():
+    tab_widget, view = make_view(['Python docs', 'Mail', 'Qt docs', 'News'])
+    for tab_id in (1, 3):
+        tab_widget.registry.set_group(tab_id, 'Docs')
+
+    view.set_group('Docs')
+    assert view.tab_filter.tab_ids() == [1, 3]
+
+    view.set_text('qt')
+    assert view.tab_filter.tab_ids() == [3]
+
+    view.set_group(UNGROUPED)
+    view.set_text('')
+    assert view.tab_filter.tab_ids() == [2, 4]
+
+
+def test_enter_selects_the_tab_under_the_cursor():
+    tab_widget, view = make_view(['One', 'Two', 'Three'])
+    selected = []
+    view.tab_selected.connect(selected.append)
+
+    view.select_tab(2)
+    view.keyPressEvent(QKeyEvent(QEvent.Type.KeyPress, Qt.Key.Key_Return, Qt.KeyboardModifier.NoModifier))
+
+    assert selected == [2]
+
+
+def test_new_thumbnail_drops_only_that_tiles_pixmap():
+    tab_widget, view = make_view(['One', 'Two'])
+    delegate = view.preview_delegate
+    for tab_id in (1, 2):
+        image = QImage(320, 180, QImage.Format.Format_RGB32)
+        image.fill(QColor('#88c0d0'))
+        tab_widget.thumbnails[tab_id] = image
+        assert not delegate.thumbnail(view.model().index(tab_id - 1, 0)).isNull()
+
+    tab_widget.tab_model.refresh(1, [Qt.ItemDataRole.DecorationRole])
+    assert set(delegate._pixmaps) == {1, 2}
+
+    tab_widget.tab_model.refresh(1, [TabRoles.THUMBNAIL])
+    assert set(delegate._pixmaps) == {2}
@@ -0,0 +1,81 @@
+import os
+
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtWidgets import QApplication, QLabel, QTabWidget
+
+from sledge.browser.tabs.registry import TabRegistry
+from sledge.browser.tabs.swap import swap_tab_widget
+
+
+class RegistryTabWidget(QTabWidget):
+    """A QTabWidget keeping a TabRegistry current, like TabWidget does"""
+
+    def __init__(self):
+        super().__init__()
+        self.registry = TabRegistry()
+
+    def tabInserted(self, index):
+        super().tabInserted(index)
+        self.registry.inserted(index, self.widget(index))
+
+    def tabRemoved(self, index):
+        super().tabRemoved(index)
+        self.registry.removed(index)
+
+
+# Widgets need a QApplication, kept alive for the whole module
+_app = None
+
+
+def make_tabs(titles):
+    global _app
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    _app = QApplication.instance() or QApplication([])
+    tabs = RegistryTabWidget()
+    for title in titles:
+        tabs.addTab(QLabel(title), title)
+    return tabs
+
+
+def test_swapping_the_current_tab_keeps_it_current():
+    tabs = make_tabs(['A', 'B', 'C'])
+    tabs.setCurrentIndex(1)
+    changes = []
+    tabs.currentChanged.connect(changes.append)
+
+    tab_id = swap_tab_widget(tabs, 1, QLabel('B woken'), 'B')
+
+    assert tabs.currentIndex() == 1
+    assert tabs.widget(1).text() == 'B woken'
+    assert changes == []
+    assert tabs.registry.id_at(1) == tab_id and len(tabs.registry) == 3
+
+
+def test_swapping_a_background_tab_leaves_the_current_one():
+    tabs = make_tabs(['A', 'B', 'C'])
+    tabs.setCurrentIndex(2)
+
+    swap_tab_widget(tabs, 0, QLabel('A hibernated'), 'A')
+
+    assert tabs.currentIndex() == 2
+    assert tabs.widget(0).text() == 'A hibernated'
+
+
+def test_swapped_out_widget_and_its_children_are_destroyed():
+    """Test that hibernating or waking a tab frees the widget it replaces"""
+    tabs = make_tabs(['A', 'B'])
+    view = tabs.widget(0)
+    page = QObject(view)   # A web view's page is parented to the view
+    destroyed = []
+    view.destroyed.connect(lambda: destroyed.append('view'))
+    page.destroyed.connect(lambda: destroyed.append('page'))
+
+    placeholder = QLabel('Hibernated')
+    swap_tab_widget(tabs, 0, placeholder, 'A')
+    placeholder.destroyed.connect(lambda: destroyed.append('placeholder'))
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    assert sorted(destroyed) == ['page', 'view']
+
+    swap_tab_widget(tabs, 0, QLabel('Woken'), 'A')
+    QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    assert 'placeholder' in destroyed
@@ -15,7 +15,6 @@ def tab_widget(app):
     widget = TabWidget()
     # Initialize required attributes
     widget.groups = {}
-    widget.tab_groups = {}
     widget.group_representatives = {}
     return widget
 
@@ -29,12 +28,12 @@ def test_tab_groups(tab_widget):
     tab_widget.create_group("test_group", [0, 1])
     
     # Test group creation
-    assert tab_widget.tab_groups[0] == "test_group"
-    assert tab_widget.tab_groups[1] == "test_group"
-    assert 2 not in tab_widget.tab_groups
+    assert tab_widget.group_of(0) == "test_group"
+    assert tab_widget.group_of(1) == "test_group"
+    assert tab_widget.group_of(2) is None
     
     # Test group representative
-    assert tab_widget.group_representatives["test_group"] == 0
+    assert tab_widget.representative_index("test_group") == 0
 
 def test_group_preview(tab_widget, qtbot):
     """Test group preview functionality"""
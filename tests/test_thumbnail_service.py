@@ -0,0 +1,93 @@
+import os
+
+from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtGui import QColor, QImage
+
+from sledge.browser.tabs.thumbnails import ThumbnailCache, ThumbnailService, thumbnail_path
+
+
+class FakeView:
+    """Stands in for a visible QWebEngineView"""
+
+    def __init__(self, url, color='#88c0d0'):
+        self._url = url
+        self.image = QImage(1280, 720, QImage.Format.Format_RGB32)
+        self.image.fill(QColor(color))
+
+    def isVisible(self):
+        return True
+
+    def width(self):
+        return self.image.width()
+
+    def url(self):
+        url = self._url
+        return type('Url', (), {'toString': lambda self: url})()
+
+    def grab(self):
+        image = self.image
+        return type('Grab', (), {'toImage': lambda self: image})()
+
+
+# Results come back to the GUI thread as queued signals, which need an application
+_app = None
+
+
+def app():
+    global _app
+    _app = QCoreApplication.instance() or QCoreApplication([])
+    return _app
+
+
+def settle(service):
+    service.stop()   # Drains the worker's queue
+    QCoreApplication.sendPostedEvents()
+    QCoreApplication.processEvents()
+
+
+def test_cache_evicts_least_recently_used_within_budget():
+    cache = ThumbnailCache(budget=250)
+    cache.put(1, 0, b'a' * 100)
+    cache.put(2, 0, b'b' * 100)
+    assert cache.get(1) == b'a' * 100   # 1 is now the most recent
+
+    assert cache.put(3, 0, b'c' * 100) == [2]
+    assert 2 not in cache and len(cache) == 2
+    assert cache.bytes == 200
+
+
+def test_cache_ignores_other_generations():
+    cache = ThumbnailCache()
+    cache.put(1, 3, b'jpeg')
+    assert cache.get(1, 3) == b'jpeg'
+    assert cache.get(1, 4) is None
+
+
+def test_capture_is_encoded_off_thread_and_saved(tmp_path):
+    app()
+    service = ThumbnailService(directory=str(tmp_path))
+    ready = []
+    service.ready.connect(ready.append)
+
+    assert service.capture(7, FakeView('https://example.com/'))
+    settle(service)
+
+    assert ready == [7]
+    image = service.image(7)
+    assert (image.width(), image.height()) == (192, 108)
+    assert os.path.exists(thumbnail_path(str(tmp_path), 'https://example.com/'))
+
+    # A later session finds it by URL, before any capture
+    restored = ThumbnailService(directory=str(tmp_path))
+    assert restored.thumbnail(1, 'https://example.com/') == service.thumbnail(7)
+
+
+def test_capture_from_before_navigation_is_dropped(tmp_path):
+    app()
+    service = ThumbnailService(directory=str(tmp_path))
+    service.capture(7, FakeView('https://example.com/old'))
+    service.navigated(7)
+    settle(service)
+
+    assert service.thumbnail(7) == b''
+    assert 7 not in service.cache
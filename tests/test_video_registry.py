@@ -0,0 +1,58 @@
+from sledge.browser.security.video_registry import VideoUrlRegistry
+
+
+def test_latest_is_most_recent_per_site():
+    """Test that lookups return the newest URL for the requesting site"""
+    registry = VideoUrlRegistry()
+    registry.add('https://cdn.example.net/a.m3u8', 'https://site.net/watch/1')
+    registry.add('https://cdn.example.net/b.m3u8', 'https://other.net/watch/2')
+    registry.add('https://cdn.example.net/c.mp4', 'https://site.net/watch/1#t=10')
+
+    assert registry.latest('https://site.net/watch/1') == 'https://cdn.example.net/c.mp4'
+    assert registry.latest('https://other.net/watch/2') == 'https://cdn.example.net/b.m3u8'
+    assert registry.latest('https://third.net/watch/3') is None
+    assert registry.latest() == 'https://cdn.example.net/c.mp4'
+
+
+def test_site_first_party_matches_full_page_url():
+    """Test that a URL recorded under the request's site is found from the tab's page URL"""
+    registry = VideoUrlRegistry()
+    registry.add('https://cdn.example.net/getvid?evid=7', 'https://www.wcostream.tv/')
+
+    page = 'https://www.WCOstream.tv/some-show-episode-1?autoplay=1#player'
+    assert registry.latest(page) == 'https://cdn.example.net/getvid?evid=7'
+    assert registry.urls(page) == ['https://cdn.example.net/getvid?evid=7']
+
+
+def test_volatile_params_are_deduplicated():
+    """Test that timestamp/hash refreshes replace the existing entry"""
+    registry = VideoUrlRegistry()
+    page = 'https://site.net/watch/1'
+    registry.add('https://cdn.example.net/getvid?evid=7&t=100&h=abc', page)
+    registry.add('https://cdn.example.net/other.mp4', page)
+    registry.add('https://cdn.example.net/getvid?evid=7&t=200&h=def', page)
+
+    assert len(registry) == 2
+    assert registry.urls(page) == [
+        'https://cdn.example.net/getvid?evid=7&t=200&h=def',
+        'https://cdn.example.net/other.mp4',
+    ]
+
+
+def test_capacity_and_expiry():
+    """Test that the registry stays bounded and drops stale entries"""
+    registry = VideoUrlRegistry(capacity=3, per_page=2)
+    for i in range(4):
+        registry.add(f'https://cdn.example.net/{i}.ts', 'https://a.net/')
+    registry.add('https://cdn.example.net/x.ts', 'https://b.net/')
+
+    assert len(registry) == 3
+    assert registry.urls('https://a.net/') == [
+        'https://cdn.example.net/3.ts',
+        'https://cdn.example.net/2.ts',
+    ]
+
+    registry.ttl = -1
+    assert registry.latest('https://a.net/') is None
+    assert registry.urls('https://a.net/') == []
+    assert len(registry) == 1